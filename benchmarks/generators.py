@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+"""Seeded generators of synthetic human-like and scripted-bot mouse sessions.
+
+A session moves the cursor to each target in turn, presses the button on it
+and clicks. Human sessions follow curved, jittered paths with a minimum-jerk
+speed profile and irregular sampling; bot sessions move in straight lines at a
+constant sampling interval and hit every target exactly.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+_VIEWPORT = (1280, 720)
+_TARGET_MARGIN = 40
+_MIN_TARGET_DISTANCE = 150
+_START_TIME = np.datetime64("2025-02-10T00:00:00.000")
+
+
+def _iso(times_ms: np.ndarray) -> List[str]:
+    _times = _START_TIME + np.round(times_ms).astype("timedelta64[ms]")
+    return [f"{_time}Z" for _time in np.datetime_as_string(_times, unit="ms")]
+
+
+def _generate_targets(rng: np.random.Generator, n_targets: int) -> np.ndarray:
+    _targets = []
+    while len(_targets) < n_targets:
+        _candidate = rng.uniform(
+            [_TARGET_MARGIN, _TARGET_MARGIN],
+            [_VIEWPORT[0] - _TARGET_MARGIN, _VIEWPORT[1] - _TARGET_MARGIN],
+        ).round()
+        if all(
+            np.hypot(*(_candidate - _target)) >= _MIN_TARGET_DISTANCE
+            for _target in _targets
+        ):
+            _targets.append(_candidate)
+    return np.array(_targets)
+
+
+def _human_segment(
+    rng: np.random.Generator, start: np.ndarray, end: np.ndarray, size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Minimum-jerk progress along a cubic Bezier curve, plus hand tremor
+    _tau = np.linspace(0, 1, size + 1)[1:]
+    _progress = 10 * _tau**3 - 15 * _tau**4 + 6 * _tau**5
+    _bend = rng.normal(0, 0.25, size=2) * np.hypot(*(end - start))
+    _control_1 = start + (end - start) / 3 + _bend * [1, -1]
+    _control_2 = start + 2 * (end - start) / 3 + _bend * [-0.5, 0.5]
+    _p = _progress[:, None]
+    _points = (
+        (1 - _p) ** 3 * start
+        + 3 * (1 - _p) ** 2 * _p * _control_1
+        + 3 * (1 - _p) * _p**2 * _control_2
+        + _p**3 * end
+    )
+    _points += rng.normal(0, 1.5, size=_points.shape) * (1 - _p)
+    _points[-1] = end
+    # Browsers coalesce pointer events, so some arrive only a few ms apart
+    _intervals = np.where(
+        rng.random(size) < 0.1,
+        rng.uniform(2, 6, size=size),
+        rng.lognormal(np.log(20), 0.5, size=size),
+    )
+    return _points.round(), _intervals
+
+
+def _bot_segment(
+    start: np.ndarray, end: np.ndarray, size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    _progress = np.linspace(0, 1, size + 1)[1:, None]
+    _points = start + (end - start) * _progress
+    return _points.round(), np.full(size, 16.0)
+
+
+def generate_session(
+    n_movements: int,
+    n_targets: int,
+    kind: str = "human",
+    seed: int = 0,
+    layout_seed: Optional[int] = None,
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Generate one raw session payload and the click actions it was scripted for.
+
+    Args:
+        n_movements: Number of mouse movement events
+        n_targets: Number of click targets
+        kind: `human` or `bot`
+        seed: Random seed, equal seeds give equal sessions
+        layout_seed: Random seed of the target layout. Defaults to `seed`.
+
+    Returns:
+        Tuple of the raw payload (as posted by the browser) and its actions
+    """
+    if kind not in ("human", "bot"):
+        raise ValueError(f"Unknown session kind: {kind}")
+    if n_targets < 1 or n_movements < n_targets:
+        raise ValueError("Need at least one target and one movement per target")
+
+    _rng = np.random.default_rng(seed)
+    _is_human = kind == "human"
+    _targets = _generate_targets(
+        np.random.default_rng(seed if layout_seed is None else layout_seed), n_targets
+    )
+    _sizes = np.full(n_targets, n_movements // n_targets)
+    _sizes[: n_movements % n_targets] += 1
+
+    _position = np.array(_VIEWPORT, dtype=np.float64) / 2
+    _time = 0.0
+    _movements, _clicks, _downs, _ups = [], [], [], []
+    for _target, _size in zip(_targets, _sizes):
+        if _is_human:
+            _points, _intervals = _human_segment(_rng, _position, _target, _size)
+        else:
+            _points, _intervals = _bot_segment(_position, _target, _size)
+        _times = _time + np.cumsum(_intervals)
+        _movements.append((_points, _times))
+        _time = _times[-1]
+
+        # Press, release and click on the target
+        _press_delay, _hold = (
+            (_rng.uniform(60, 160), _rng.uniform(60, 120)) if _is_human else (1, 1)
+        )
+        _offset = _rng.integers(-1, 2, size=2) if _is_human else np.zeros(2)
+        _press = _target + _offset
+        _downs.append((_press, _time + _press_delay))
+        _ups.append((_press, _time + _press_delay + _hold))
+        _clicks.append((_press, _time + _press_delay + _hold + 1))
+        _time += _press_delay + _hold + 1
+        _position = _target
+
+    _points = np.concatenate([_points for _points, _ in _movements])
+    _times = np.concatenate([_times for _, _times in _movements])
+
+    def _events(items) -> List[Dict[str, Any]]:
+        _iso_times = _iso(np.array([_t for _, _t in items]))
+        return [
+            {"x": float(_p[0]), "y": float(_p[1]), "timestamp": _ts}
+            for (_p, _), _ts in zip(items, _iso_times)
+        ]
+
+    _payload = {
+        "project_id": f"benchmark-{kind}",
+        "user_id": f"{kind}-{seed}",
+        "metrics": {
+            "mouse": {
+                "movements": [
+                    {"x": float(_x), "y": float(_y), "timestamp": _ts}
+                    for _x, _y, _ts in zip(_points[:, 0], _points[:, 1], _iso(_times))
+                ],
+                "clicks": _events(_clicks),
+                "mouseDowns": _events(_downs),
+                "mouseUps": _events(_ups),
+            },
+            "keyboard": {
+                "keypresses": [],
+                "keydowns": [],
+                "keyups": [],
+                "specificKeyEvents": [],
+            },
+            "signInButton": {"hoverToClickTime": None, "mouseLeaveCount": 0},
+        },
+    }
+    _actions = [
+        {
+            "id": str(_index),
+            "type": "click",
+            "args": {"location": {"x": float(_x), "y": float(_y)}},
+        }
+        for _index, (_x, _y) in enumerate(_targets)
+    ]
+    return _payload, _actions
+
+
+def generate_sessions(
+    count: int,
+    n_movements: int,
+    n_targets: int,
+    kind: str = "human",
+    seed: int = 0,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Generate sessions that share one set of click targets.
+
+    Args:
+        count: Number of sessions
+        n_movements: Number of mouse movement events per session
+        n_targets: Number of click targets
+        kind: `human` or `bot`
+        seed: Random seed of the first session, the rest use the next seeds
+
+    Returns:
+        Tuple of the raw payloads and the shared actions
+    """
+    _payloads = []
+    _actions: List[Dict[str, Any]] = []
+    for _index in range(count):
+        _payload, _actions = generate_session(
+            n_movements, n_targets, kind=kind, seed=seed + _index, layout_seed=seed
+        )
+        _payloads.append(_payload)
+    return _payloads, _actions
+
+
+__all__ = ["generate_session", "generate_sessions"]
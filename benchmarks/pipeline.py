@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Benchmark `MetricsProcessor` end to end and stage by stage.
+
+Times the scoring pipeline and each of its stages on seeded synthetic human and
+bot sessions, and reports ops/sec, p50/p99 latency and peak traced memory.
+Results can be saved as a JSON baseline and later runs compared against it.
+
+Usage:
+    python -m benchmarks.pipeline [--movements 100 1000 10000] [--targets 2 5 20]
+    python -m benchmarks.pipeline --save benchmarks/baselines/pipeline.json
+    python -m benchmarks.pipeline --compare benchmarks/baselines/pipeline.json
+"""
+
+import sys
+import json
+import time
+import platform
+import logging
+import argparse
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from rt_hb_score import MetricsProcessor
+from rt_hb_score.__version__ import __version__
+from rt_hb_score.preprocessing.feature_engineer import EventTrace
+
+from .generators import generate_sessions
+
+logger = logging.getLogger(__name__)
+
+
+def _build_stages(
+    processor: MetricsProcessor, payloads: List[Dict[str, Any]]
+) -> Dict[str, Callable[[int], Any]]:
+    """Map stage names to callables scoring the session with the given index."""
+    _flattener = processor.preprocessor.flattener
+    _engineer = processor.preprocessor.feature_engineer
+    _analyzer = processor.heuristic_analyzer
+    _mouse = _analyzer.mouse_analyzer
+    _movement_config = _engineer.config.mouse_movement
+    _down_field = _engineer.config.mouse_down_up.down_field
+
+    _flattened = [_flattener(_payload) for _payload in payloads]
+    _alignments = [_engineer._align_clicks(_data) for _data in _flattened]
+    _windows = [
+        np.sort(_alignment.times)
+        if _alignment is not None and _alignment.is_complete
+        else None
+        for _alignment in _alignments
+    ]
+
+    def _trace(i: int) -> EventTrace:
+        """Ingest the movements like `FeatureEngineer`, downsampled if too long."""
+        return _engineer.downsampler(
+            _flattened[i].get(_movement_config.input_field, []),
+            _movement_config.fields,
+            anchors=_flattened[i].get(_down_field, []),
+            windows=_windows[i],
+        )
+
+    _traces = [_trace(_index) for _index in range(len(payloads))]
+    _features = [
+        processor.preprocessor(_payload, keep_alignment=True) for _payload in payloads
+    ]
+
+    return {
+        "end_to_end": lambda i: processor(payloads[i]),
+        "flattener": lambda i: _flattener(payloads[i]),
+        "feature_engineer": lambda i: _engineer(_flattened[i]),
+        "feature_engineer.trace": _trace,
+        "feature_engineer.mouse_movement": lambda i: _engineer.mouse_movement_processor(
+            _traces[i], _flattened[i].get(_movement_config.click_field, [])
+        ),
+        "feature_engineer.checkbox": lambda i: _engineer.checkbox_processor(
+            _flattened[i], trace=_traces[i]
+        ),
+        "feature_engineer.mouse_down_up": lambda i: _engineer.mouse_down_up_processor(
+            _flattened[i], trace=_traces[i]
+        ),
+        "feature_engineer.session": lambda i: _engineer.session_processor(
+            _flattened[i], trace=_traces[i]
+        ),
+        "heuristics": lambda i: _analyzer(_features[i]),
+        "heuristics.args_compare": lambda i: _mouse.args_comparer(_features[i]),
+        "heuristics.velocity": lambda i: _mouse.velocity_analyzer(_features[i]),
+        "heuristics.movement_count": lambda i: _mouse.movement_count_analyzer(
+            _features[i]
+        ),
+        "heuristics.checkbox_path": lambda i: _mouse.checkbox_path_analyzer(
+            _features[i]
+        ),
+    }
+
+
+def _measure(func: Callable[[int], Any], count: int, repeat: int) -> Dict[str, float]:
+    """Time `count` calls `repeat` times, then trace memory of one more round."""
+    _latencies = np.empty(count * repeat)
+    for _round in range(repeat):
+        for _index in range(count):
+            _start = time.perf_counter()
+            func(_index)
+            _latencies[_round * count + _index] = time.perf_counter() - _start
+    _total = _latencies.sum()
+
+    tracemalloc.start()
+    for _index in range(count):
+        func(_index)
+    _, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": round(len(_latencies) / _total, 2),
+        "p50_ms": round(float(np.percentile(_latencies, 50)) * 1e3, 4),
+        "p99_ms": round(float(np.percentile(_latencies, 99)) * 1e3, 4),
+        "peak_memory_kib": round(_peak / 1024, 1),
+    }
+
+
+def run(
+    movements: List[int],
+    targets: List[int],
+    kinds: List[str],
+    sessions: int,
+    repeat: int,
+    seed: int,
+    stages: List[str] = None,
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Run every scenario and return results keyed by scenario, then stage.
+
+    Args:
+        movements: Mouse movements per session of each scenario
+        targets: Click targets per session of each scenario
+        kinds: Session kinds, `human` and/or `bot`
+        sessions: Sessions generated per scenario
+        repeat: Timed rounds over the sessions of each scenario
+        seed: Random seed of the generated sessions
+        stages: Stage names to run. Runs every stage if not given.
+
+    Returns:
+        Nested dictionary of measurements
+    """
+    _results = {}
+    for _kind in kinds:
+        for _n_movements in movements:
+            for _n_targets in targets:
+                _scenario = f"{_kind}-m{_n_movements}-t{_n_targets}"
+                _payloads, _actions = generate_sessions(
+                    sessions, _n_movements, _n_targets, kind=_kind, seed=seed
+                )
+                _processor = MetricsProcessor(config={"actions": _actions})
+                _results[_scenario] = {}
+                for _stage, _func in _build_stages(_processor, _payloads).items():
+                    if stages and _stage not in stages:
+                        continue
+                    _results[_scenario][_stage] = _measure(_func, sessions, repeat)
+                    logger.info(
+                        f"[{_scenario}] {_stage}: "
+                        f"{_results[_scenario][_stage]['ops_per_sec']:,.1f} ops/s, "
+                        f"p50={_results[_scenario][_stage]['p50_ms']:.3f} ms, "
+                        f"p99={_results[_scenario][_stage]['p99_ms']:.3f} ms, "
+                        f"peak={_results[_scenario][_stage]['peak_memory_kib']:,.1f} KiB"
+                    )
+    return _results
+
+
+def compare(
+    baseline: Dict[str, Any],
+    results: Dict[str, Dict[str, Dict[str, float]]],
+    threshold: float,
+) -> int:
+    """Log changes against a baseline and return the number of regressions.
+
+    A regression is a p50 latency or peak memory more than `threshold` (as a
+    fraction) above the baseline.
+    """
+    _regressions = 0
+    for _scenario, _stages in results.items():
+        for _stage, _current in _stages.items():
+            _base = baseline.get("results", {}).get(_scenario, {}).get(_stage)
+            if not _base:
+                logger.warning(f"[{_scenario}] {_stage}: not in baseline")
+                continue
+
+            for _metric in ("p50_ms", "peak_memory_kib"):
+                if not _base[_metric]:
+                    continue
+                _change = _current[_metric] / _base[_metric] - 1
+                if _change > threshold:
+                    _regressions += 1
+                    logger.error(
+                        f"[{_scenario}] {_stage}: {_metric} regressed {_change:+.1%} "
+                        f"({_base[_metric]} -> {_current[_metric]})"
+                    )
+                else:
+                    logger.info(
+                        f"[{_scenario}] {_stage}: {_metric} {_change:+.1%}"
+                    )
+    return _regressions
+
+
+def main() -> None:
+    _parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _parser.add_argument("--movements", type=int, nargs="+", default=[100, 1000, 10000])
+    _parser.add_argument("--targets", type=int, nargs="+", default=[2, 5, 20])
+    _parser.add_argument(
+        "--kinds", nargs="+", choices=["human", "bot"], default=["human", "bot"]
+    )
+    _parser.add_argument("--sessions", type=int, default=20)
+    _parser.add_argument("--repeat", type=int, default=3)
+    _parser.add_argument("--seed", type=int, default=0)
+    _parser.add_argument("--stages", nargs="+", default=None)
+    _parser.add_argument("--save", type=Path, default=None, help="Baseline to write")
+    _parser.add_argument(
+        "--compare", type=Path, default=None, help="Baseline to compare against"
+    )
+    _parser.add_argument("--threshold", type=float, default=0.2)
+    _args = _parser.parse_args()
+
+    _results = run(
+        movements=_args.movements,
+        targets=_args.targets,
+        kinds=_args.kinds,
+        sessions=_args.sessions,
+        repeat=_args.repeat,
+        seed=_args.seed,
+        stages=_args.stages,
+    )
+
+    if _args.save:
+        _baseline = {
+            "environment": {
+                "rt_hb_score": __version__,
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+            },
+            "parameters": {
+                "sessions": _args.sessions,
+                "repeat": _args.repeat,
+                "seed": _args.seed,
+            },
+            "results": _results,
+        }
+        _args.save.parent.mkdir(parents=True, exist_ok=True)
+        _args.save.write_text(json.dumps(_baseline, indent=2, sort_keys=True) + "\n")
+        logger.info(f"Saved baseline to: {_args.save}")
+
+    if _args.compare:
+        _baseline = json.loads(_args.compare.read_text())
+        if compare(_baseline, _results, _args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        stream=sys.stdout,
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    # Per-session pipeline logs would dominate the timings
+    logging.getLogger("rt_hb_score").setLevel(logging.ERROR)
+    main()
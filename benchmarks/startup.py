@@ -0,0 +1,288 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Benchmark the cold-start cost of importing `rt_hb_score` and scoring once.
+
+Every measurement runs in a fresh interpreter. Import cost is read from
+`python -X importtime` (only modules the statement imports on top of the
+interpreter's own startup count); time to first score is measured inside a
+child process that imports `MetricsProcessor`, builds it and scores one
+generated session. Results can be saved as a JSON baseline and later runs
+compared against it.
+
+Usage:
+    python -m benchmarks.startup [--runs 10] [--top 15]
+    python -m benchmarks.startup --save benchmarks/baselines/startup.json
+    python -m benchmarks.startup --compare benchmarks/baselines/startup.json
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import logging
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from rt_hb_score.__version__ import __version__
+
+from .generators import generate_session
+
+logger = logging.getLogger(__name__)
+
+# Scenario name -> statement whose imports are measured
+IMPORT_STATEMENTS = {
+    "package": "import rt_hb_score",
+    "processor": "from rt_hb_score import MetricsProcessor",
+    "frame": (
+        "from rt_hb_score.preprocessing.feature_engineer "
+        "import EventFrameFeatureEngineer"
+    ),
+}
+
+# Run in a fresh interpreter with the payload path and actions as arguments
+_FIRST_SCORE_SCRIPT = """
+import sys, json, time
+_start = time.perf_counter()
+from rt_hb_score import MetricsProcessor
+_imported = time.perf_counter()
+_processor = MetricsProcessor(config={"actions": json.loads(sys.argv[2])})
+_built = time.perf_counter()
+with open(sys.argv[1], "r", encoding="utf-8") as _file:
+    _payload = _file.read()
+_loaded = time.perf_counter()
+_result = _processor(_payload)
+_scored = time.perf_counter()
+assert _result["success"], _result
+print(json.dumps({
+    "import_ms": (_imported - _start) * 1e3,
+    "init_ms": (_built - _imported) * 1e3,
+    "first_score_ms": (_scored - _loaded) * 1e3,
+    "total_ms": (_scored - _start - (_loaded - _built)) * 1e3,
+}))
+"""
+
+
+def _environment() -> Dict[str, str]:
+    """Child environment that resolves `rt_hb_score` like this process does."""
+    _env = dict(os.environ)
+    _env["PYTHONPATH"] = os.pathsep.join(_path for _path in sys.path if _path)
+    return _env
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """Parse `-X importtime` output into (module, depth, self_us, cumulative_us)."""
+    _entries = []
+    for _line in stderr.splitlines():
+        if not _line.startswith("import time:") or "self [us]" in _line:
+            continue
+        _self, _cumulative, _name = _line[len("import time:") :].split("|")
+        _depth = (len(_name) - len(_name.lstrip())) // 2
+        _entries.append((_name.strip(), _depth, int(_self), int(_cumulative)))
+    return _entries
+
+
+def _importtime(statement: str) -> List[Tuple[str, int, int, int]]:
+    _process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        env=_environment(),
+        check=True,
+    )
+    return _parse_importtime(_process.stderr)
+
+
+def measure_imports(
+    statement: str, runs: int, startup_modules: set
+) -> Tuple[List[float], List[Tuple[str, int, int, int]]]:
+    """Return the import cost of `statement` in ms per run, and the last run's entries.
+
+    Only top-level imports absent from a bare interpreter start are counted, so
+    the cost of `site` and friends is excluded.
+    """
+    _costs = []
+    _entries: List[Tuple[str, int, int, int]] = []
+    for _ in range(runs):
+        _entries = [
+            _entry
+            for _entry in _importtime(statement)
+            if not (_entry[1] == 0 and _entry[0] in startup_modules)
+        ]
+        _costs.append(
+            sum(_cumulative for _, _depth, _, _cumulative in _entries if _depth == 0)
+            / 1e3
+        )
+    return _costs, _entries
+
+
+def measure_first_score(
+    runs: int, movements: int, targets: int
+) -> Dict[str, List[float]]:
+    """Time interpreter start, import, build and first score in fresh processes."""
+    _payload, _actions = generate_session(movements, targets, kind="human", seed=0)
+    _phases: Dict[str, List[float]] = {"interpreter_ms": [], "process_ms": []}
+    with tempfile.TemporaryDirectory() as _directory:
+        _path = Path(_directory) / "payload.json"
+        _path.write_text(json.dumps(_payload))
+        for _ in range(runs):
+            _start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", "pass"], check=True)
+            _phases["interpreter_ms"].append((time.perf_counter() - _start) * 1e3)
+
+            _start = time.perf_counter()
+            _process = subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    _FIRST_SCORE_SCRIPT,
+                    str(_path),
+                    json.dumps(_actions),
+                ],
+                capture_output=True,
+                text=True,
+                env=_environment(),
+                check=True,
+            )
+            _phases["process_ms"].append((time.perf_counter() - _start) * 1e3)
+            for _phase, _value in json.loads(_process.stdout).items():
+                _phases.setdefault(_phase, []).append(_value)
+    return _phases
+
+
+def _summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "median_ms": round(statistics.median(values), 2),
+        "min_ms": round(min(values), 2),
+    }
+
+
+def run(runs: int, top: int, movements: int, targets: int) -> Dict[str, Any]:
+    """Run every measurement and return results keyed by group, then metric.
+
+    Args:
+        runs: Fresh interpreters started per measurement
+        top: Number of slowest modules (by self time) to report per statement
+        movements: Mouse movements of the scored session
+        targets: Click targets of the scored session
+
+    Returns:
+        Nested dictionary of measurements
+    """
+    _startup_modules = {
+        _name for _name, _depth, _, _ in _importtime("pass") if _depth == 0
+    }
+
+    _results: Dict[str, Any] = {"import": {}, "first_score": {}, "top_modules": {}}
+    for _scenario, _statement in IMPORT_STATEMENTS.items():
+        _costs, _entries = measure_imports(_statement, runs, _startup_modules)
+        _results["import"][_scenario] = _summarize(_costs)
+        _results["top_modules"][_scenario] = [
+            {"module": _name, "self_ms": round(_self / 1e3, 2)}
+            for _name, _, _self, _ in sorted(_entries, key=lambda _e: -_e[2])[:top]
+        ]
+        logger.info(
+            f"[import] {_scenario}: "
+            f"median={_results['import'][_scenario]['median_ms']:.1f} ms, "
+            f"min={_results['import'][_scenario]['min_ms']:.1f} ms ({_statement})"
+        )
+        for _module in _results["top_modules"][_scenario]:
+            logger.debug(f"    {_module['self_ms']:8.2f} ms  {_module['module']}")
+
+    for _phase, _values in measure_first_score(runs, movements, targets).items():
+        _results["first_score"][_phase] = _summarize(_values)
+        logger.info(
+            f"[first_score] {_phase}: "
+            f"median={_results['first_score'][_phase]['median_ms']:.1f} ms, "
+            f"min={_results['first_score'][_phase]['min_ms']:.1f} ms"
+        )
+    return _results
+
+
+def compare(baseline: Dict[str, Any], results: Dict[str, Any], threshold: float) -> int:
+    """Log changes against a baseline and return the number of regressions.
+
+    A regression is a median time more than `threshold` (as a fraction) above
+    the baseline.
+    """
+    _regressions = 0
+    for _group in ("import", "first_score"):
+        for _metric, _current in results[_group].items():
+            _base = baseline.get("results", {}).get(_group, {}).get(_metric)
+            if not _base:
+                logger.warning(f"[{_group}] {_metric}: not in baseline")
+                continue
+            if not _base["median_ms"]:
+                continue
+
+            _change = _current["median_ms"] / _base["median_ms"] - 1
+            if _change > threshold:
+                _regressions += 1
+                logger.error(
+                    f"[{_group}] {_metric}: median regressed {_change:+.1%} "
+                    f"({_base['median_ms']} -> {_current['median_ms']})"
+                )
+            else:
+                logger.info(f"[{_group}] {_metric}: median {_change:+.1%}")
+    return _regressions
+
+
+def main() -> None:
+    _parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _parser.add_argument("--runs", type=int, default=10)
+    _parser.add_argument("--top", type=int, default=15)
+    _parser.add_argument("--movements", type=int, default=1000)
+    _parser.add_argument("--targets", type=int, default=5)
+    _parser.add_argument("--verbose", action="store_true", help="Log slowest modules")
+    _parser.add_argument("--save", type=Path, default=None, help="Baseline to write")
+    _parser.add_argument(
+        "--compare", type=Path, default=None, help="Baseline to compare against"
+    )
+    _parser.add_argument("--threshold", type=float, default=0.2)
+    _args = _parser.parse_args()
+    if _args.verbose:
+        logger.setLevel(logging.DEBUG)
+
+    _results = run(
+        runs=_args.runs,
+        top=_args.top,
+        movements=_args.movements,
+        targets=_args.targets,
+    )
+
+    if _args.save:
+        _baseline = {
+            "environment": {
+                "rt_hb_score": __version__,
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+            },
+            "parameters": {
+                "runs": _args.runs,
+                "movements": _args.movements,
+                "targets": _args.targets,
+            },
+            "results": _results,
+        }
+        _args.save.parent.mkdir(parents=True, exist_ok=True)
+        _args.save.write_text(json.dumps(_baseline, indent=2, sort_keys=True) + "\n")
+        logger.info(f"Saved baseline to: {_args.save}")
+
+    if _args.compare:
+        _baseline = json.loads(_args.compare.read_text())
+        if compare(_baseline, _results, _args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        stream=sys.stdout,
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    main()
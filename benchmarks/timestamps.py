@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Benchmark `decode_timestamps` against per-item `dateutil` parsing.
+
+Usage:
+    python ./benchmarks/timestamps.py [--size 20000] [--repeat 5]
+"""
+
+import sys
+import time
+import random
+import logging
+import argparse
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from dateutil.parser import parse
+
+from rt_hb_score.preprocessing.timestamps import decode_timestamps
+
+logger = logging.getLogger(__name__)
+
+
+def _generate_timestamps(size: int, seed: int = 0) -> dict:
+    _random = random.Random(seed)
+    _start = datetime(2025, 2, 10, tzinfo=timezone.utc)
+    _offset = timezone(timedelta(hours=5, minutes=30))
+
+    _utc, _offsets, _epoch_ms = [], [], []
+    _ms = 0.0
+    for _ in range(size):
+        _ms += _random.uniform(5, 25)
+        _time = _start + timedelta(milliseconds=round(_ms))
+        _utc.append(_time.isoformat(timespec="milliseconds").replace("+00:00", "Z"))
+        _offsets.append(_time.astimezone(_offset).isoformat(timespec="milliseconds"))
+        _epoch_ms.append(int(_time.timestamp() * 1000))
+
+    return {"iso_z": _utc, "iso_offset": _offsets, "epoch_ms": _epoch_ms}
+
+
+def _dateutil_decode(values: list) -> np.ndarray:
+    return np.array(
+        [
+            float(v) / 1000.0 if isinstance(v, (int, float)) else parse(v).timestamp()
+            for v in values
+        ]
+    )
+
+
+def _best_of(func, values: list, repeat: int) -> float:
+    _best = float("inf")
+    for _ in range(repeat):
+        _start = time.perf_counter()
+        func(values)
+        _best = min(_best, time.perf_counter() - _start)
+    return _best
+
+
+def main() -> None:
+    _parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _parser.add_argument("--size", type=int, default=20000)
+    _parser.add_argument("--repeat", type=int, default=5)
+    _args = _parser.parse_args()
+
+    for _name, _values in _generate_timestamps(_args.size).items():
+        _expected = _dateutil_decode(_values)
+        _decoded = decode_timestamps(_values)
+        if not np.array_equal(_expected, _decoded):
+            logger.error(f"[{_name}]: decoded timestamps differ from dateutil!")
+            sys.exit(1)
+
+        _baseline_time = _best_of(_dateutil_decode, _values, _args.repeat)
+        _decode_time = _best_of(decode_timestamps, _values, _args.repeat)
+        logger.info(
+            f"[{_name}] size={_args.size}: "
+            f"dateutil={_args.size / _baseline_time:,.0f} ts/s, "
+            f"decode_timestamps={_args.size / _decode_time:,.0f} ts/s, "
+            f"speedup={_baseline_time / _decode_time:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        stream=sys.stdout,
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    main()
@@ -33,26 +33,16 @@ if __name__ == "__main__":
     _raw_json_data_path.parent.mkdir(parents=True, exist_ok=True)
     _processed_json_data_path.parent.mkdir(parents=True, exist_ok=True)
 
-    logger.info(f"Reading data from: {_raw_json_data_path}")
-    try:
-        with open(_raw_json_data_path, "r") as f:
-            raw_data = json.load(f)
-    except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in input file: {e}")
-        sys.exit(1)
-    except FileNotFoundError:
-        logger.error(f"Input file not found: {_raw_json_data_path}")
-        sys.exit(1)
-
     logger.info("Processing metrics data...")
     # Process all json files starting with 'iw'
-    raw_files = list(_data_dir_path.glob('raw/iw*.json'))
+    raw_files = sorted(_data_dir_path.glob("raw/iw*.json"))
 
+    loaded_files, raw_payloads = [], []
     for raw_file in raw_files:
         try:
-            print(f"\n{raw_file}")
             with open(raw_file, "r") as f:
-                raw_data = json.load(f)
+                raw_payloads.append(json.load(f))
+            loaded_files.append(raw_file)
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON in file {raw_file}: {e}")
             continue
@@ -60,9 +50,14 @@ if __name__ == "__main__":
             logger.error(f"File not found: {raw_file}")
             continue
 
-        processor = MetricsProcessor(config=argument)
-        results = processor(raw_data)
+    if not raw_payloads:
+        logger.error(f"No input files found in: {_data_dir_path / 'raw'}")
+        sys.exit(1)
 
+    processor = MetricsProcessor(config=argument)
+    batch_results = processor.score_batch(raw_payloads, workers=4)
+    for raw_file, results in zip(loaded_files, batch_results):
+        logger.info(f"{raw_file}: {results.get('analysis')}")
 
     if not results["success"]:
         logger.error(f"Processing failed at {results['stage']}: {results['error']}")
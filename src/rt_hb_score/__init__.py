@@ -1,3 +1,72 @@
-from ._main import MetricsProcessor, MetricsProcessorConfig
+"""Heuristic bot scoring of browser mouse sessions.
 
-__all__ = ["MetricsProcessor", "MetricsProcessorConfig"]
+Public names are imported on first access, so `import rt_hb_score` does not
+load NumPy, pydantic or the pipeline until something is actually used.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ._main import MetricsProcessor
+    from .config import MetricsProcessorConfig
+    from ._async import AsyncMetricsProcessor
+    from ._incremental import IncrementalSessionScorer
+    from ._pool import ProcessorPool
+    from ._corpus import SessionCorpus
+    from ._sweep import SweepResult, ThresholdSweep
+    from ._cache import DiskResultCache, MemoryResultCache, ResultCache
+    from ._instrumentation import Instrumentation, MetricsRegistry, StageEvent
+    from .preprocessing.json_flattener import decode_columnar, encode_columnar
+
+# Public name -> module defining it
+_LAZY_ATTRIBUTES = {
+    "MetricsProcessor": "._main",
+    "MetricsProcessorConfig": ".config",
+    "AsyncMetricsProcessor": "._async",
+    "IncrementalSessionScorer": "._incremental",
+    "ProcessorPool": "._pool",
+    "SessionCorpus": "._corpus",
+    "ThresholdSweep": "._sweep",
+    "SweepResult": "._sweep",
+    "ResultCache": "._cache",
+    "MemoryResultCache": "._cache",
+    "DiskResultCache": "._cache",
+    "Instrumentation": "._instrumentation",
+    "MetricsRegistry": "._instrumentation",
+    "StageEvent": "._instrumentation",
+    "encode_columnar": ".preprocessing.json_flattener",
+    "decode_columnar": ".preprocessing.json_flattener",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        _value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+        globals()[name] = _value
+        return _value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
+
+
+__all__ = [
+    "MetricsProcessor",
+    "MetricsProcessorConfig",
+    "AsyncMetricsProcessor",
+    "IncrementalSessionScorer",
+    "ProcessorPool",
+    "SessionCorpus",
+    "ThresholdSweep",
+    "SweepResult",
+    "ResultCache",
+    "MemoryResultCache",
+    "DiskResultCache",
+    "Instrumentation",
+    "MetricsRegistry",
+    "StageEvent",
+    "encode_columnar",
+    "decode_columnar",
+]
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+"""Command line interface for scoring JSONL payloads.
+
+Reads one JSON payload per line from files (or stdin) and writes one JSON result
+per line, in input order:
+
+    rt-hb-score sessions.jsonl --workers 8 > scores.jsonl
+    cat sessions.jsonl | python -m rt_hb_score - -o scores.jsonl
+
+Archived payloads can be converted once into a memory-mapped `SessionCorpus`,
+which is then re-scored without any JSON decoding:
+
+    rt-hb-score sessions.jsonl --to-corpus corpus/
+    rt-hb-score --corpus corpus/ --config config.json > scores.jsonl
+"""
+
+import sys
+import json
+import logging
+import argparse
+from typing import IO, Iterator, List, Optional
+
+from ._main import MetricsProcessor
+from ._corpus import SessionCorpus
+from .config import MetricsProcessorConfig
+
+logger = logging.getLogger(__name__)
+
+
+def _iter_lines(paths: List[str]) -> Iterator[str]:
+    """Lazily yield non-empty lines from files, `-` meaning stdin."""
+    for path in paths:
+        if path == "-":
+            _file: IO[str] = sys.stdin
+        else:
+            _file = open(path, "r", encoding="utf-8")
+
+        try:
+            for _line in _file:
+                _line = _line.strip()
+                if _line:
+                    yield _line
+        finally:
+            if _file is not sys.stdin:
+                _file.close()
+
+
+def _load_config(path: Optional[str]) -> MetricsProcessorConfig:
+    if not path:
+        return MetricsProcessorConfig()
+
+    with open(path, "r", encoding="utf-8") as _file:
+        return MetricsProcessorConfig(**json.load(_file))
+
+
+def _default(value):
+    """Serialize NumPy scalars left in results."""
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    _parser = argparse.ArgumentParser(
+        prog="rt-hb-score",
+        description="Score JSONL web challenge payloads and stream JSONL results.",
+    )
+    _parser.add_argument(
+        "inputs",
+        nargs="*",
+        default=["-"],
+        help="Input JSONL files, `-` for stdin (default: stdin)",
+    )
+    _parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="Output JSONL file, `-` for stdout (default: stdout)",
+    )
+    _parser.add_argument(
+        "-c",
+        "--config",
+        default=None,
+        help="JSON file with `MetricsProcessorConfig` values (e.g. `actions`)",
+    )
+    _parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count, 1 disables the pool)",
+    )
+    _parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=64,
+        help="Payloads sent to a worker at once (default: 64)",
+    )
+    _parser.add_argument(
+        "--max-inflight",
+        type=int,
+        default=None,
+        help="Maximum chunks in flight (default: 2 x workers)",
+    )
+    _parser.add_argument(
+        "--to-corpus",
+        default=None,
+        metavar="DIR",
+        help="Convert the inputs into a memory-mapped session corpus instead of scoring",
+    )
+    _parser.add_argument(
+        "--corpus",
+        default=None,
+        metavar="DIR",
+        help="Score the sessions of a corpus built by `--to-corpus` instead of inputs",
+    )
+    _parser.add_argument(
+        "--log-level",
+        default="WARNING",
+        help="Logging level written to stderr (default: WARNING)",
+    )
+    return _parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    _args = _build_parser().parse_args(argv)
+    logging.basicConfig(
+        stream=sys.stderr,
+        level=_args.log_level.upper(),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    if _args.chunk_size < 1:
+        logger.error("`--chunk-size` must be at least 1")
+        return 2
+
+    _processor = MetricsProcessor(config=_load_config(_args.config))
+    if _args.to_corpus:
+        _corpus = SessionCorpus.build(
+            _args.to_corpus,
+            _iter_lines(_args.inputs),
+            flattener=_processor.preprocessor.flattener,
+        )
+        logger.info(f"Converted {len(_corpus)} payloads into {_corpus.path}")
+        return 0
+
+    if _args.corpus:
+        _results = _processor.score_corpus(
+            SessionCorpus(_args.corpus),
+            workers=_args.workers,
+            chunk_size=_args.chunk_size,
+            max_inflight=_args.max_inflight,
+        )
+    else:
+        _results = _processor.score_stream(
+            _iter_lines(_args.inputs),
+            workers=_args.workers,
+            chunk_size=_args.chunk_size,
+            max_inflight=_args.max_inflight,
+        )
+
+    _output: IO[str] = (
+        sys.stdout
+        if _args.output == "-"
+        else open(_args.output, "w", encoding="utf-8")
+    )
+    try:
+        for _result in _results:
+            _output.write(json.dumps(_result, default=_default) + "\n")
+    finally:
+        if _output is not sys.stdout:
+            _output.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
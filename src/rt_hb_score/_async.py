@@ -0,0 +1,156 @@
+"""Asyncio interface for scoring payloads off the event loop."""
+
+import asyncio
+import logging
+from itertools import islice
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing_extensions import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from ._main import MetricsProcessor, _init_worker, _score_in_worker
+from .config import MetricsProcessorConfig
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMetricsProcessor:
+    """Runs `MetricsProcessor` scoring on an executor without blocking the loop.
+
+    Scoring uses the same `Preprocessor` and `HeuristicAnalyzer` pipeline as
+    `MetricsProcessor`, so scores are identical. The number of payloads handed
+    to the executor at once is bounded by a semaphore; callers waiting for a slot
+    can be cancelled without ever reaching the executor.
+
+    Usage:
+        async with AsyncMetricsProcessor(config, executor="process") as scorer:
+            result = await scorer.ascore(payload)
+            async for index, result in scorer.ascore_as_completed(payloads):
+                ...
+    """
+
+    def __init__(
+        self,
+        config: Union[MetricsProcessorConfig, Dict[str, Any], None] = None,
+        executor: Union[str, Executor] = "thread",
+        max_workers: Optional[int] = None,
+        max_inflight: Optional[int] = None,
+    ):
+        """Initialize the scorer and its executor.
+
+        Args:
+            config: Configuration for the metrics processing pipeline
+            executor: `"thread"`, `"process"` or an existing executor. An
+                existing executor is not shut down by `close()`.
+            max_workers: Number of executor workers for `"thread"`/`"process"`
+            max_inflight: Maximum number of payloads submitted to the executor
+                at once. Defaults to `max_workers`, or 4 if that is not set.
+        """
+        self.processor = MetricsProcessor(config=config)
+        self.config = self.processor.config
+
+        self._owns_executor = isinstance(executor, str)
+        if executor == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=max_workers)
+            self._score_func = self.processor._score_isolated
+        elif executor == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(self.config,),
+            )
+            self._score_func = _score_in_worker
+        elif isinstance(executor, Executor):
+            self._executor = executor
+            self._score_func = self.processor._score_isolated
+        else:
+            raise ValueError(
+                f"`executor` must be 'thread', 'process' or an Executor, got: {executor!r}"
+            )
+
+        self.max_inflight = max(max_inflight or max_workers or 4, 1)
+        # Created lazily so it binds to the running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def ascore(self, raw_data: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Score one payload on the executor.
+
+        Cancelling the awaiting task releases its in-flight slot. A payload that
+        is already running on a worker still runs to completion there.
+
+        Args:
+            raw_data: Raw payload as JSON string or dictionary
+
+        Returns:
+            Same result dictionary as `MetricsProcessor.score_batch` items
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_inflight)
+
+        async with self._semaphore:
+            _loop = asyncio.get_running_loop()
+            return await _loop.run_in_executor(
+                self._executor, self._score_func, raw_data
+            )
+
+    async def ascore_as_completed(
+        self, payloads: Iterable[Union[str, Dict[str, Any]]]
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Score many payloads, yielding each result as soon as it is ready.
+
+        Payloads are pulled lazily: at most `max_inflight` are scheduled at
+        once and the next one is pulled as each completes, so `payloads` may
+        be an unbounded generator. Leaving the loop early cancels all payloads
+        not yet yielded.
+
+        Args:
+            payloads: Raw payloads as JSON strings or dictionaries
+
+        Yields:
+            Tuples of the payload's input index and its result
+        """
+
+        async def _indexed(index: int, raw_data) -> Tuple[int, Dict[str, Any]]:
+            return index, await self.ascore(raw_data)
+
+        _payloads = enumerate(payloads)
+        _pending = {
+            asyncio.ensure_future(_indexed(_index, _raw_data))
+            for _index, _raw_data in islice(_payloads, self.max_inflight)
+        }
+        try:
+            while _pending:
+                _done, _pending = await asyncio.wait(
+                    _pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                # Refill before yielding, so workers stay busy while the
+                # caller handles the results
+                _pending.update(
+                    asyncio.ensure_future(_indexed(_index, _raw_data))
+                    for _index, _raw_data in islice(_payloads, len(_done))
+                )
+                for _result in sorted(_task.result() for _task in _done):
+                    yield _result
+        finally:
+            for _task in _pending:
+                _task.cancel()
+
+    def close(self) -> None:
+        """Shut down the executor if it was created by this scorer."""
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> "AsyncMetricsProcessor":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+__all__ = ["AsyncMetricsProcessor"]
@@ -0,0 +1,263 @@
+"""Memory-mapped corpus of flattened sessions for offline re-scoring."""
+
+import json
+import shutil
+import logging
+from pathlib import Path
+from typing_extensions import Any, Dict, Iterable, Iterator, Optional, Sequence, Union
+
+import numpy as np
+
+from .preprocessing.feature_engineer import EventTrace
+from .preprocessing.json_flattener import JsonDataFlattener, JsonDataFlattenerConfigPM
+
+logger = logging.getLogger(__name__)
+
+
+_MANIFEST = "manifest.json"
+_ID_FIELDS = ("user_id", "project_id")
+
+
+class _ColumnWriter:
+    """Appends values to a raw temporary file, saved as a 1-D `.npy` on `close`.
+
+    Columns are streamed to disk, so building a corpus never holds more than
+    one session in memory.
+    """
+
+    def __init__(self, path: Path, dtype: Union[str, np.dtype]):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.size = 0
+        self._temporary = path.with_name(path.name + ".tmp")
+        self._file = open(self._temporary, "wb")
+
+    def append(self, values: Any) -> None:
+        _values = np.ascontiguousarray(values, dtype=self.dtype)
+        self._file.write(_values.tobytes())
+        self.size += _values.size
+
+    def close(self) -> None:
+        self._file.close()
+        _header = {
+            "descr": np.lib.format.dtype_to_descr(self.dtype),
+            "fortran_order": False,
+            "shape": (self.size,),
+        }
+        with open(self.path, "wb") as _target, open(self._temporary, "rb") as _source:
+            np.lib.format.write_array_header_1_0(_target, _header)
+            shutil.copyfileobj(_source, _target)
+        self._temporary.unlink()
+
+
+class SessionCorpus:
+    """Archived sessions as memory-mapped `.npy` columns.
+
+    Every event field (movements, clicks and mouse downs by default) is stored
+    as concatenated, per session time-sorted `x`, `y` and `t` (epoch seconds)
+    columns, with an offsets index of `len(corpus) + 1` positions and the
+    source event count of each session:
+
+        manifest.json
+        mouse_movements.x.npy  mouse_movements.y.npy  mouse_movements.t.npy
+        mouse_movements.offsets.npy  mouse_movements.n_events.npy
+        ...
+        user_id.npy  project_id.npy  is_valid.npy
+
+    Ids are stored JSON-encoded, so they are read back as given, e.g. `None`
+    and `""` stay apart.
+
+    Sessions are read as slices of the memory maps, so a pass over the corpus
+    decodes no JSON and only keeps the pages in use resident. Other payload
+    fields (keyboard, sign-in button, mouse ups) are not kept, since feature
+    engineering does not read them.
+
+    Usage:
+        corpus = SessionCorpus.build("corpus/", open("sessions.jsonl"))
+        for result in MetricsProcessor(config).score_corpus(corpus):
+            ...
+    """
+
+    VERSION = 2
+    DEFAULT_FIELDS = ("mouse_movements", "mouse_clicks", "mouse_mouseDowns")
+
+    def __init__(self, path: Union[str, Path]):
+        """Open a corpus built by `build`.
+
+        Args:
+            path: Corpus directory
+
+        Raises:
+            FileNotFoundError: If `path` holds no complete corpus.
+            ValueError: If the corpus has an unsupported version.
+        """
+        self.path = Path(path)
+        with open(self.path / _MANIFEST, "r", encoding="utf-8") as _file:
+            self.manifest = json.load(_file)
+        if self.manifest.get("version") != self.VERSION:
+            raise ValueError(
+                f"Unsupported corpus version: {self.manifest.get('version')}"
+            )
+
+        self.fields = tuple(self.manifest["fields"])
+        self.is_valid = self._load("is_valid")
+        self._ids = {_field: self._load(_field) for _field in _ID_FIELDS}
+        self._columns = {
+            _field: {
+                _column: self._load(f"{_field}.{_column}")
+                for _column in ("x", "y", "t", "offsets", "n_events")
+            }
+            for _field in self.fields
+        }
+
+    def _load(self, name: str) -> np.ndarray:
+        return np.load(self.path / f"{name}.npy", mmap_mode="r")
+
+    def __len__(self) -> int:
+        return len(self.is_valid)
+
+    def __repr__(self) -> str:
+        return f"SessionCorpus(path={str(self.path)!r}, sessions={len(self)})"
+
+    def __iter__(self) -> Iterator[Optional[Dict[str, Any]]]:
+        for _index in range(len(self)):
+            yield self[_index]
+
+    def __getitem__(self, index: int) -> Optional[Dict[str, Any]]:
+        """Return one session like `JsonDataFlattener` output.
+
+        Args:
+            index: Position of the session in the source payloads
+
+        Returns:
+            Flattened session with one `EventTrace` per event field, whose
+            columns are views of the memory maps, or None if the payload failed
+            to flatten or its events failed to decode when the corpus was built
+
+        Raises:
+            IndexError: If `index` is out of range.
+        """
+        index = range(len(self))[index]
+        if not self.is_valid[index]:
+            return None
+
+        _session: Dict[str, Any] = {
+            _field: json.loads(str(_ids[index])) for _field, _ids in self._ids.items()
+        }
+        for _field, _columns in self._columns.items():
+            _start, _stop = _columns["offsets"][index : index + 2]
+            _session[_field] = EventTrace(
+                _columns["x"][_start:_stop],
+                _columns["y"][_start:_stop],
+                _columns["t"][_start:_stop],
+                n_events=_columns["n_events"][index],
+            )
+        return _session
+
+    @classmethod
+    def build(
+        cls,
+        path: Union[str, Path],
+        payloads: Iterable[Union[str, bytes, Dict[str, Any]]],
+        flattener: Optional[JsonDataFlattener] = None,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        event_fields: Optional[Dict[str, str]] = None,
+    ) -> "SessionCorpus":
+        """Convert payloads, e.g. the lines of a JSONL file, into a corpus.
+
+        Payloads are flattened one at a time and their events streamed to disk.
+        Payloads that fail to flatten, or whose events fail to decode, are
+        logged and keep their position as invalid sessions; the manifest counts
+        them as `invalid`. The manifest is written last, so an interrupted
+        build cannot be opened.
+
+        Args:
+            path: Corpus directory, created if needed. Existing corpus files in
+                it are overwritten.
+            payloads: Raw payloads in any format `JsonDataFlattener` reads
+            flattener: Flattener of the payloads. Defaults to one with the
+                `typed` decoder.
+            fields: Flattened event fields to store
+            event_fields: Mapping of `x`, `y` and `timestamp` to the event keys
+
+        Returns:
+            The built corpus
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        (path / _MANIFEST).unlink(missing_ok=True)
+        flattener = flattener or JsonDataFlattener(
+            JsonDataFlattenerConfigPM(decoder="typed")
+        )
+
+        _writers = {
+            _field: {
+                **{
+                    _column: _ColumnWriter(path / f"{_field}.{_column}.npy", np.float64)
+                    for _column in ("x", "y", "t")
+                },
+                "offsets": _ColumnWriter(path / f"{_field}.offsets.npy", np.int64),
+                "n_events": _ColumnWriter(path / f"{_field}.n_events.npy", np.int64),
+            }
+            for _field in fields
+        }
+        _is_valid = _ColumnWriter(path / "is_valid.npy", np.bool_)
+        _ids = {_field: [] for _field in _ID_FIELDS}
+        for _columns in _writers.values():
+            _columns["offsets"].append([0])
+
+        _count = 0
+        _invalid = 0
+        for _payload in payloads:
+            # Decode every field before writing, so a failure leaves no trace
+            try:
+                _flattened = flattener(_payload)
+                if _flattened is not None:
+                    _traces = {
+                        _field: EventTrace.from_events(
+                            _flattened.get(_field), event_fields
+                        )
+                        for _field in _writers
+                    }
+            except Exception as e:
+                logger.error(f"Storing session {_count} as invalid: {e}")
+                _flattened = None
+
+            if _flattened is None:
+                _invalid += 1
+                _traces = {_field: EventTrace.empty() for _field in _writers}
+            _is_valid.append([_flattened is not None])
+            for _field, _values in _ids.items():
+                _values.append(json.dumps((_flattened or {}).get(_field)))
+
+            for _field, _columns in _writers.items():
+                _trace = _traces[_field]
+                _columns["x"].append(_trace.x)
+                _columns["y"].append(_trace.y)
+                _columns["t"].append(_trace.t)
+                _columns["offsets"].append([_columns["t"].size])
+                _columns["n_events"].append([_trace.n_events])
+            _count += 1
+
+        for _columns in _writers.values():
+            for _writer in _columns.values():
+                _writer.close()
+        _is_valid.close()
+        for _field, _values in _ids.items():
+            np.save(path / f"{_field}.npy", np.array(_values, dtype=np.str_))
+
+        with open(path / _MANIFEST, "w", encoding="utf-8") as _file:
+            json.dump(
+                {
+                    "version": cls.VERSION,
+                    "sessions": _count,
+                    "invalid": _invalid,
+                    "fields": list(fields),
+                },
+                _file,
+            )
+        logger.info(f"Built corpus of {_count} sessions ({_invalid} invalid) at {path}")
+        return cls(path)
+
+
+__all__ = ["SessionCorpus"]
@@ -0,0 +1,387 @@
+"""Online session scoring fed one mouse event at a time."""
+
+import math
+import logging
+from typing_extensions import Any, Dict, List, Optional, Tuple, Union
+
+from .config import MetricsProcessorConfig
+from .heuristics import HeuristicAnalyzer
+from .preprocessing.timestamps import decode_timestamp
+
+logger = logging.getLogger(__name__)
+
+
+class _RunningStats:
+    """Welford running mean and population variance; NaN values are skipped."""
+
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def push(self, value: float) -> None:
+        if math.isnan(value):
+            return
+        self.count += 1
+        _delta = value - self.mean
+        self.mean += _delta / self.count
+        self._m2 += _delta * (value - self.mean)
+
+    @property
+    def std(self) -> float:
+        if not self.count:
+            return math.nan
+        return math.sqrt(self._m2 / self.count)
+
+    def copy(self) -> "_RunningStats":
+        _copy = _RunningStats()
+        _copy.count, _copy.mean, _copy._m2 = self.count, self.mean, self._m2
+        return _copy
+
+
+class _SegmentStats:
+    """Running path linearity of the movements between two target clicks.
+
+    Mirrors `CheckboxEventProcessor._calculate_path_linearity` without keeping
+    the points.
+    """
+
+    __slots__ = (
+        "count",
+        "angles",
+        "first",
+        "last",
+        "last_step",
+        "total_length",
+        "turn_sum",
+        "turn_count",
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.angles = _RunningStats()
+        self.first: Optional[Tuple[float, float]] = None
+        self.last: Optional[Tuple[float, float]] = None
+        self.last_step: Optional[Tuple[float, float, float]] = None
+        self.total_length = 0.0
+        self.turn_sum = 0.0
+        self.turn_count = 0
+
+    def push(self, x: float, y: float) -> None:
+        self.count += 1
+        self.angles.push(math.atan2(y, x) * 180 / math.pi)
+        if self.last is None:
+            self.first = self.last = (x, y)
+            return
+
+        _dx, _dy = x - self.last[0], y - self.last[1]
+        _length = math.sqrt(_dx * _dx + _dy * _dy)
+        self.total_length += _length
+        if self.last_step is not None:
+            _prev_dx, _prev_dy, _prev_length = self.last_step
+            _norms = _prev_length * _length
+            if _norms > 0:
+                _cos = (_prev_dx * _dx + _prev_dy * _dy) / _norms
+                self.turn_sum += math.acos(min(1.0, max(-1.0, _cos)))
+                self.turn_count += 1
+        self.last_step = (_dx, _dy, _length)
+        self.last = (x, y)
+
+    def copy(self) -> "_SegmentStats":
+        _copy = _SegmentStats()
+        for _name in self.__slots__:
+            setattr(_copy, _name, getattr(self, _name))
+        _copy.angles = self.angles.copy()
+        return _copy
+
+    def linearity(self) -> Optional[Tuple[float, float, float]]:
+        """Return angle std, straightness and angular consistency.
+
+        Returns `None` when the segment has no pair of non-zero consecutive
+        steps, which invalidates the checkbox features like in batch mode.
+        """
+        if self.count < 5:
+            return 1.0, 1.0, 1.0
+
+        _path_dx = self.last[0] - self.first[0]
+        _path_dy = self.last[1] - self.first[1]
+        _path_length = math.sqrt(_path_dx * _path_dx + _path_dy * _path_dy)
+        if _path_length < 1e-10:
+            return 1, 1, 1
+
+        if not self.turn_count:
+            return None
+
+        _straightness = (
+            _path_length / self.total_length if self.total_length > 1e-10 else 1.0
+        )
+        _angular_consistency = 1 - (self.turn_sum / self.turn_count) / math.pi
+        return self.angles.std, _straightness, _angular_consistency
+
+
+class _TargetMatcher:
+    """Tracks the first click within tolerance of each target location."""
+
+    __slots__ = ("targets", "tolerance", "matches")
+
+    def __init__(self, actions: List[dict], event_type: str, tolerance: float):
+        self.targets = [
+            action["args"]["location"]
+            for action in actions
+            if action.get("type") == event_type
+        ]
+        self.tolerance = tolerance
+        self.matches: List[Optional[Dict[str, Any]]] = [None] * len(self.targets)
+
+    def push(self, click: Dict[str, Any]) -> int:
+        """Match a click against unmatched targets, returning the new match count."""
+        _new_matches = 0
+        for _index, _target in enumerate(self.targets):
+            if self.matches[_index] is None and (
+                abs(click["x"] - _target["x"]) <= self.tolerance
+                and abs(click["y"] - _target["y"]) <= self.tolerance
+            ):
+                self.matches[_index] = click
+                _new_matches += 1
+        return _new_matches
+
+    @property
+    def is_complete(self) -> bool:
+        return all(match is not None for match in self.matches)
+
+
+class IncrementalSessionScorer:
+    """Scores a session incrementally while its mouse events arrive.
+
+    Events are expected in arrival (time) order. Every event updates O(1)
+    running state: Welford mean/variance of velocity and of the movement angle,
+    traveled distance, session time span, mouse-down alignment and target click
+    matches with the path linearity between them. `features()` returns the same
+    feature keys as `FeatureEngineer`, and `score()` runs them through
+    `HeuristicAnalyzer`, so a complete in-order session scores like the batch
+    pipeline. Movements sharing a click's timestamp but arriving after it are
+    only counted in the following click-to-click segment.
+    """
+
+    def __init__(
+        self, config: Union[MetricsProcessorConfig, Dict[str, Any], None] = None
+    ):
+        """Initialize an empty session.
+
+        Args:
+            config: Configuration for the metrics processing pipeline
+        """
+        if isinstance(config, dict):
+            config = MetricsProcessorConfig(**config)
+
+        self.config = config or MetricsProcessorConfig()
+        self.heuristic_analyzer = HeuristicAnalyzer(config=self.config.heuristics)
+
+        _features_config = self.config.preprocessor.feature_engineer
+        self._movement_config = _features_config.mouse_movement
+        self._checkbox_config = _features_config.checkbox
+        _comparer_config = self.config.heuristics.mouse_events.args_comparer
+
+        self._checkbox_targets = _TargetMatcher(
+            self._checkbox_config.actions,
+            self._checkbox_config.type,
+            self._checkbox_config.tolerance,
+        )
+        self._comparer_targets = _TargetMatcher(
+            _comparer_config.actions, _comparer_config.type, _comparer_config.tolerance
+        )
+
+        self.movement_count = 0
+        self.click_count = 0
+        self.traveled_distance = 0.0
+        self.first_time: Optional[float] = None
+        self.last_time: Optional[float] = None
+        self._has_nan = False
+        self._velocity = _RunningStats()
+        self._angle = _RunningStats()
+
+        # Latest movement, the latest one strictly before its timestamp and the
+        # path of every movement at its timestamp
+        self._last_movement: Optional[Tuple[float, float, float]] = None
+        self._previous_movement: Optional[Tuple[float, float, float]] = None
+        self._last_time_path = _SegmentStats()
+
+        self.mouse_down_count = 0
+        self.mouse_down_mismatches = 0
+
+        self._segment: Optional[_SegmentStats] = None
+        self._segments: List[Optional[Tuple[float, float, float]]] = []
+
+    def add_movement(
+        self, x: float, y: float, timestamp: Union[str, int, float]
+    ) -> None:
+        """Add one mouse movement."""
+        x, y, t = float(x), float(y), decode_timestamp(timestamp)
+        self.movement_count += 1
+        self._has_nan = self._has_nan or math.isnan(x) or math.isnan(y)
+        self._angle.push(math.atan2(y, x) * 180 / math.pi)
+        self.first_time = t if self.first_time is None else min(self.first_time, t)
+        self.last_time = t if self.last_time is None else max(self.last_time, t)
+
+        if self._last_movement is not None:
+            _last_x, _last_y, _last_t = self._last_movement
+            _distance = math.sqrt((x - _last_x) ** 2 + (y - _last_y) ** 2)
+            self.traveled_distance += _distance
+            _dt = t - _last_t
+            self._velocity.push(_distance / _dt if _dt != 0 else 0.0)
+            if t != _last_t:
+                self._previous_movement = self._last_movement
+                self._last_time_path = _SegmentStats()
+
+        self._last_movement = (x, y, t)
+        self._last_time_path.push(x, y)
+        if self._segment is not None:
+            self._segment.push(x, y)
+
+    def add_click(self, x: float, y: float, timestamp: Union[str, int, float]) -> None:
+        """Add one mouse click."""
+        t = decode_timestamp(timestamp)
+        _click = {"x": x, "y": y, "timestamp": t}
+        self.click_count += 1
+        self._comparer_targets.push(_click)
+
+        for _ in range(self._checkbox_targets.push(_click)):
+            if self._segment is not None:
+                self._segments.append(self._segment.linearity())
+
+            # Movements at exactly the click time belong to both windows
+            if self._last_movement is not None and self._last_movement[2] == t:
+                self._segment = self._last_time_path.copy()
+            else:
+                self._segment = _SegmentStats()
+
+    def add_mouse_down(
+        self, x: float, y: float, timestamp: Union[str, int, float]
+    ) -> None:
+        """Add one mouse down and check it against the preceding movement."""
+        t = decode_timestamp(timestamp)
+        self.mouse_down_count += 1
+
+        _preceding = self._last_movement
+        if _preceding is not None and _preceding[2] >= t:
+            _preceding = self._previous_movement
+
+        _config = self.config.preprocessor.feature_engineer.mouse_down_up
+        _tolerance = _config.within_tolerance
+        if _preceding is None or not (
+            x - _tolerance <= _preceding[0] <= x + _tolerance
+            and y - _tolerance <= _preceding[1] <= y + _tolerance
+        ):
+            self.mouse_down_mismatches += 1
+
+    def add_event(self, kind: str, event: Dict[str, Any]) -> None:
+        """Add one raw event dict of kind `movement`, `click` or `mouseDown`."""
+        _adders = {
+            "movement": self.add_movement,
+            "click": self.add_click,
+            "mouseDown": self.add_mouse_down,
+        }
+        if kind not in _adders:
+            raise ValueError(f"Unsupported event kind: {kind}")
+        _adders[kind](event["x"], event["y"], event["timestamp"])
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether every target location has been clicked."""
+        return self._comparer_targets.is_complete
+
+    def features(self, assume_complete: bool = False) -> Dict[str, Any]:
+        """Return the current features, keyed like `FeatureEngineer` output.
+
+        Args:
+            assume_complete: Treat target locations not clicked yet as clicked,
+                so a provisional score reflects the behavior seen so far
+                instead of failing the click check.
+
+        Returns:
+            Dictionary of engineered features
+        """
+        _config = self._movement_config
+        _has_enough = self.movement_count >= _config.min_movements_required
+        _has_velocity = _has_enough and not self._has_nan and self._velocity.count
+
+        _features = {
+            _config.velocity_std: self._velocity.std if _has_velocity else 0,
+            _config.velocity_avg: self._velocity.mean if _has_velocity else 0,
+            _config.pixel_per_movement: (
+                self.traveled_distance / self.movement_count
+                if self.movement_count and self.click_count < self.movement_count
+                else 0
+            ),
+            _config.movement_cont: self.movement_count,
+            _config.mouse_angle_std: self._angle.std if _has_enough else 0,
+        }
+
+        _down_config = self.config.preprocessor.feature_engineer.mouse_down_up
+        _features[_down_config.output_field] = (
+            1 if not self.mouse_down_count or self.mouse_down_mismatches else 0.0
+        )
+
+        _session_config = self.config.preprocessor.feature_engineer.session
+        _features[_session_config.output_filed] = (
+            round(self.last_time - self.first_time, 6) if self.movement_count else 0
+        )
+
+        _features.update(self._checkbox_features(assume_complete))
+
+        _clicks = [
+            match
+            if match is not None
+            else {"x": target["x"], "y": target["y"], "timestamp": self.last_time or 0}
+            for match, target in zip(
+                self._comparer_targets.matches, self._comparer_targets.targets
+            )
+            if match is not None or assume_complete
+        ]
+        _features[self.config.heuristics.mouse_events.args_comparer.mouse_clicks] = (
+            _clicks
+        )
+        return _features
+
+    def _checkbox_features(self, assume_complete: bool) -> Dict[str, Any]:
+        _config = self._checkbox_config
+        if not self.click_count:
+            return {}
+
+        _features = {_config.output_validation: False, _config.output_main: []}
+        _is_complete = self._checkbox_targets.is_complete
+        _matched_count = sum(m is not None for m in self._checkbox_targets.matches)
+        if not (_is_complete or assume_complete) or (
+            _is_complete and _matched_count < len(_config.actions)
+        ):
+            return _features
+
+        if any(segment is None for segment in self._segments):
+            return {}
+
+        for _angle_std, _straightness, _angular_consistency in self._segments:
+            _features[_config.output_main].append(
+                {
+                    _config.output_angle_std: _angle_std,
+                    _config.output_straightness: _straightness,
+                    _config.output_angular_consistency: _angular_consistency,
+                }
+            )
+            _features[_config.output_validation] = True
+        return _features
+
+    def score(self, assume_complete: bool = False) -> Dict[str, Any]:
+        """Score the session seen so far with `HeuristicAnalyzer`.
+
+        Args:
+            assume_complete: See `features()`.
+
+        Returns:
+            Heuristic analysis result with the provisional `score`
+        """
+        return self.heuristic_analyzer(self.features(assume_complete))
+
+
+__all__ = ["IncrementalSessionScorer"]
@@ -0,0 +1,383 @@
+"""Opt-in timing hooks, counters and latency histograms for the scoring pipeline."""
+
+import time
+import logging
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Latency histogram bucket upper bounds, in seconds
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+_Labels = Tuple[Tuple[str, str], ...]
+
+
+@dataclass(frozen=True)
+class StageEvent:
+    """Outcome of one call of an instrumented pipeline stage.
+
+    Attributes:
+        stage: Dotted stage name, e.g. `preprocessing.feature_engineer`.
+        duration: Monotonic wall time of the call in seconds.
+        input_size: Size of the stage input: characters of a JSON string, events
+            of a trace, or events across all lists of a payload dictionary.
+        error: Exception message if the stage raised.
+        early_exit: Reason the stage stopped early, for `early_exit` events.
+    """
+
+    stage: str
+    duration: float = 0.0
+    input_size: Optional[int] = None
+    error: Optional[str] = None
+    early_exit: Optional[str] = None
+
+
+class _Histogram:
+    __slots__ = ("bounds", "bucket_counts", "count", "total")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.bucket_counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+
+class MetricsRegistry:
+    """Thread-safe in-process registry of counters and latency histograms."""
+
+    def __init__(self, latency_buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        """Initialize an empty registry.
+
+        Args:
+            latency_buckets: Ascending histogram bucket upper bounds in seconds
+        """
+        self.latency_buckets = tuple(sorted(latency_buckets))
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, _Labels], float] = {}
+        self._histograms: Dict[Tuple[str, _Labels], _Histogram] = {}
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """Add `value` to a counter."""
+        _key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[_key] = self._counters.get(_key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record a value, in seconds, into a latency histogram."""
+        _key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            _histogram = self._histograms.get(_key)
+            if _histogram is None:
+                _histogram = self._histograms[_key] = _Histogram(self.latency_buckets)
+            _histogram.observe(value)
+
+    def reset(self) -> None:
+        """Drop every counter and histogram."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Return a point-in-time copy of every counter and histogram.
+
+        Returns:
+            Dictionary with `counters` and `histograms` lists. Histogram buckets
+            are cumulative and keyed by their upper bound (`+Inf` last).
+        """
+        with self._lock:
+            _counters = [
+                {"name": _name, "labels": dict(_labels), "value": _value}
+                for (_name, _labels), _value in sorted(self._counters.items())
+            ]
+            _histograms = []
+            for (_name, _labels), _histogram in sorted(self._histograms.items()):
+                _cumulative = 0
+                _buckets = {}
+                for _bound, _count in zip(
+                    self.latency_buckets + (float("inf"),), _histogram.bucket_counts
+                ):
+                    _cumulative += _count
+                    _buckets["+Inf" if _bound == float("inf") else _bound] = _cumulative
+                _histograms.append(
+                    {
+                        "name": _name,
+                        "labels": dict(_labels),
+                        "buckets": _buckets,
+                        "count": _histogram.count,
+                        "sum": _histogram.total,
+                    }
+                )
+        return {"counters": _counters, "histograms": _histograms}
+
+    def to_prometheus(self) -> str:
+        """Render the registry in the Prometheus text exposition format."""
+
+        def _format_labels(labels: Dict[str, Any]) -> str:
+            if not labels:
+                return ""
+            _pairs = ",".join(f'{_key}="{_value}"' for _key, _value in labels.items())
+            return "{" + _pairs + "}"
+
+        _snapshot = self.snapshot()
+        _lines = []
+        for _name in sorted({_counter["name"] for _counter in _snapshot["counters"]}):
+            _lines.append(f"# TYPE {_name} counter")
+            for _counter in _snapshot["counters"]:
+                if _counter["name"] == _name:
+                    _lines.append(
+                        f"{_name}{_format_labels(_counter['labels'])} {_counter['value']}"
+                    )
+
+        for _name in sorted(
+            {_histogram["name"] for _histogram in _snapshot["histograms"]}
+        ):
+            _lines.append(f"# TYPE {_name} histogram")
+            for _histogram in _snapshot["histograms"]:
+                if _histogram["name"] != _name:
+                    continue
+                for _bound, _count in _histogram["buckets"].items():
+                    _labels = {**_histogram["labels"], "le": _bound}
+                    _lines.append(f"{_name}_bucket{_format_labels(_labels)} {_count}")
+                _labels = _format_labels(_histogram["labels"])
+                _lines.append(f"{_name}_sum{_labels} {_histogram['sum']}")
+                _lines.append(f"{_name}_count{_labels} {_histogram['count']}")
+        return "\n".join(_lines) + "\n"
+
+
+def _count_events(data: Dict[str, Any]) -> int:
+    """Count items of every list in a (nested) payload dictionary."""
+    return sum(
+        len(_item)
+        if isinstance(_item, list)
+        else _count_events(_item) if isinstance(_item, dict) else 0
+        for _item in data.values()
+    )
+
+
+def _input_size(args: tuple) -> Optional[int]:
+    """Measure the first positional argument of a stage call."""
+    if not args:
+        return None
+    _value = args[0]
+    if isinstance(_value, (str, bytes)):
+        return len(_value)
+    if isinstance(_value, dict):
+        return _count_events(_value)
+    try:
+        return len(_value)
+    except TypeError:
+        return None
+
+
+class _TimedStage:
+    """Callable proxy timing every call of a wrapped pipeline component."""
+
+    __slots__ = ("_target", "_stage", "_instrumentation")
+
+    def __init__(self, target: Any, stage: str, instrumentation: "Instrumentation"):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_stage", stage)
+        object.__setattr__(self, "_instrumentation", instrumentation)
+
+    def __call__(self, *args, **kwargs):
+        _start = time.perf_counter()
+        try:
+            _result = self._target(*args, **kwargs)
+        except Exception as e:
+            self._instrumentation.record(
+                StageEvent(
+                    stage=self._stage,
+                    duration=time.perf_counter() - _start,
+                    input_size=_input_size(args),
+                    error=str(e),
+                )
+            )
+            raise
+
+        self._instrumentation.record(
+            StageEvent(
+                stage=self._stage,
+                duration=time.perf_counter() - _start,
+                input_size=_input_size(args),
+            )
+        )
+        return _result
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._target, name, value)
+
+
+class Instrumentation:
+    """Collects stage timings, input sizes and early exits of a `MetricsProcessor`.
+
+    Pass an instance as `MetricsProcessor(config, instrumentation=...)`. Every
+    pipeline stage and sub-processor is then timed with `time.perf_counter`;
+    each `StageEvent` is recorded into `registry` and passed to every hook.
+    Processors built without instrumentation are not wrapped at all.
+
+    Registry metrics:
+        - `rt_hb_score_stage_calls_total{stage}`
+        - `rt_hb_score_stage_errors_total{stage}`
+        - `rt_hb_score_stage_input_size_total{stage}`
+        - `rt_hb_score_stage_seconds{stage}` (histogram)
+        - `rt_hb_score_early_exits_total{stage,reason}`
+    """
+
+    # Attribute paths of the wrapped components, relative to `MetricsProcessor`
+    STAGES: Tuple[Tuple[str, str], ...] = (
+        ("preprocessor.flattener", "preprocessing.flattener"),
+        (
+            "preprocessor.feature_engineer.mouse_movement_processor",
+            "preprocessing.feature_engineer.mouse_movement",
+        ),
+        (
+            "preprocessor.feature_engineer.checkbox_processor",
+            "preprocessing.feature_engineer.checkbox",
+        ),
+        (
+            "preprocessor.feature_engineer.mouse_down_up_processor",
+            "preprocessing.feature_engineer.mouse_down_up",
+        ),
+        (
+            "preprocessor.feature_engineer.session_processor",
+            "preprocessing.feature_engineer.session",
+        ),
+        (
+            "preprocessor.feature_engineer.gate_features",
+            "preprocessing.gate_features",
+        ),
+        ("preprocessor.feature_engineer", "preprocessing.feature_engineer"),
+        # Bound into the preprocessor before attaching, so wrapped there
+        ("preprocessor.gate", "preprocessing.gate"),
+        ("preprocessor", "preprocessing"),
+        (
+            "heuristic_analyzer.mouse_analyzer.velocity_analyzer",
+            "heuristics.mouse_events.velocity",
+        ),
+        (
+            "heuristic_analyzer.mouse_analyzer.movement_count_analyzer",
+            "heuristics.mouse_events.movement_count",
+        ),
+        (
+            "heuristic_analyzer.mouse_analyzer.checkbox_path_analyzer",
+            "heuristics.mouse_events.checkbox_path",
+        ),
+        (
+            "heuristic_analyzer.mouse_analyzer.args_comparer",
+            "heuristics.mouse_events.args_compare",
+        ),
+        ("heuristic_analyzer.mouse_analyzer", "heuristics.mouse_events"),
+        ("heuristic_analyzer", "heuristics"),
+        ("_process", "pipeline"),
+    )
+
+    def __init__(
+        self,
+        hooks: Optional[List[Callable[[StageEvent], None]]] = None,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """Initialize the instrumentation.
+
+        Args:
+            hooks: Callables receiving every `StageEvent`. Exceptions raised by a
+                hook are logged and ignored.
+            registry: Registry to record into. A new one is created if not given.
+        """
+        self.hooks: List[Callable[[StageEvent], None]] = list(hooks or [])
+        self.registry = registry or MetricsRegistry()
+
+    def add_hook(self, hook: Callable[[StageEvent], None]) -> None:
+        """Register a callable receiving every `StageEvent`."""
+        self.hooks.append(hook)
+
+    def attach(self, processor: Any) -> None:
+        """Wrap the stages of a `MetricsProcessor` to report into this instance.
+
+        Stages that are not set, such as the gate without early exits, are
+        skipped.
+
+        Args:
+            processor: Processor to instrument
+        """
+        for _path, _stage in self.STAGES:
+            _owner_path, _, _attribute = _path.rpartition(".")
+            _owner = processor
+            for _name in filter(None, _owner_path.split(".")):
+                _owner = getattr(_owner, _name)
+            _component = getattr(_owner, _attribute)
+            if _component is None:
+                continue
+            if isinstance(_component, _TimedStage):
+                _component = _component._target
+            if hasattr(_component, "instrumentation"):
+                _component.instrumentation = self
+            setattr(_owner, _attribute, _TimedStage(_component, _stage, self))
+        processor.instrumentation = self
+
+    def record(self, event: StageEvent) -> None:
+        """Record an event into the registry and pass it to every hook."""
+        if event.early_exit is not None:
+            self.registry.increment(
+                "rt_hb_score_early_exits_total",
+                stage=event.stage,
+                reason=event.early_exit,
+            )
+        else:
+            self.registry.increment("rt_hb_score_stage_calls_total", stage=event.stage)
+            self.registry.observe(
+                "rt_hb_score_stage_seconds", event.duration, stage=event.stage
+            )
+            if event.input_size is not None:
+                self.registry.increment(
+                    "rt_hb_score_stage_input_size_total",
+                    event.input_size,
+                    stage=event.stage,
+                )
+            if event.error is not None:
+                self.registry.increment(
+                    "rt_hb_score_stage_errors_total", stage=event.stage
+                )
+
+        for _hook in self.hooks:
+            try:
+                _hook(event)
+            except Exception as e:
+                logger.error(f"Error in instrumentation hook: {str(e)}")
+
+    def early_exit(self, stage: str, reason: str) -> None:
+        """Record that `stage` stopped early for `reason`."""
+        self.record(StageEvent(stage=stage, early_exit=reason))
+
+
+__all__ = [
+    "DEFAULT_LATENCY_BUCKETS",
+    "Instrumentation",
+    "MetricsRegistry",
+    "StageEvent",
+]
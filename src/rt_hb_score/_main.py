@@ -1,54 +1,435 @@
+import os
 import logging
-from typing_extensions import Dict, Any, Union
+from collections import deque
+from itertools import islice
+from concurrent import futures
+from typing_extensions import (
+    Callable,
+    Dict,
+    Any,
+    Union,
+    List,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+)
 
 from .config import MetricsProcessorConfig
+from ._cache import ResultCache, canonical_digest, raw_payload_digest
+from ._corpus import SessionCorpus
+from ._instrumentation import Instrumentation, StageEvent
+from .__version__ import __version__
 from .preprocessing import Preprocessor
 from .heuristics import HeuristicAnalyzer
 
 logger = logging.getLogger(__name__)
 
 
+# Per-process scorer, built once by `_init_worker` when a pool worker starts.
+_worker_processor: Optional["MetricsProcessor"] = None
+# Stage events of the chunk being scored, if the parent is instrumented
+_worker_events: Optional[List[StageEvent]] = None
+
+_ChunkResults = Tuple[List[Dict[str, Any]], List[StageEvent]]
+# Applied by the parent to the results of a chunk, e.g. to merge cache hits
+_Merge = Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+
+
+def _init_worker(config: MetricsProcessorConfig, is_instrumented: bool = False) -> None:
+    global _worker_processor, _worker_events
+    instrumentation = None
+    if is_instrumented:
+        _worker_events = []
+        instrumentation = Instrumentation(hooks=[_worker_events.append])
+    _worker_processor = MetricsProcessor(config=config, instrumentation=instrumentation)
+
+
+def _worker_output(results: List[Dict[str, Any]]) -> _ChunkResults:
+    """Pair chunk results with the stage events recorded while scoring them."""
+    if _worker_events is None:
+        return results, []
+    events = list(_worker_events)
+    _worker_events.clear()
+    return results, events
+
+
+def _score_in_worker(raw_data: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return _worker_processor._score_isolated(raw_data)
+
+
+def _score_chunk_in_worker(chunk: List[Union[str, Dict[str, Any]]]) -> _ChunkResults:
+    return _worker_output(
+        [_worker_processor._score_isolated(raw_data) for raw_data in chunk]
+    )
+
+
+# Per-process corpora, opened by the first chunk of each corpus a worker scores.
+_worker_corpora: Dict[str, SessionCorpus] = {}
+
+
+def _score_corpus_chunk_in_worker(path: str, start: int, stop: int) -> _ChunkResults:
+    corpus = _worker_corpora.get(path)
+    if corpus is None:
+        corpus = _worker_corpora[path] = SessionCorpus(path)
+    return _worker_output(
+        [
+            _worker_processor._score_flattened_isolated(corpus[index])
+            for index in range(start, stop)
+        ]
+    )
 
 
 class MetricsProcessor:
-    def __init__(self, config: Union[MetricsProcessorConfig,Dict[str,Any],None] = None):
+    def __init__(
+        self,
+        config: Union[MetricsProcessorConfig, Dict[str, Any], None] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        cache: Optional[ResultCache] = None,
+    ):
+        """Initialize the scoring pipeline.
+
+        Args:
+            config: Pipeline configuration, as a model or a dictionary
+            instrumentation: Opt-in stage timings, counters and hooks. Without
+                it the pipeline stages are not wrapped at all.
+            cache: Opt-in result cache. Results are keyed by the payload digest
+                and a fingerprint of the effective config and package version;
+                a hit skips the whole pipeline.
+        """
         if isinstance(config, dict):
             config = MetricsProcessorConfig(**config)
 
         self.config = config or MetricsProcessorConfig()
 
-        self.preprocessor = Preprocessor(config=self.config.preprocessor)
         self.heuristic_analyzer = HeuristicAnalyzer(config=self.config.heuristics)
+        # Sessions the heuristic gates decide skip feature engineering
+        self.preprocessor = Preprocessor(
+            config=self.config.preprocessor,
+            gate=(
+                self.heuristic_analyzer.gate
+                if self.config.heuristics.mouse_events.early_exit
+                else None
+            ),
+        )
+
+        self.cache = cache
+        self.config_fingerprint = canonical_digest(
+            [__version__, self.config.model_dump(mode="json")]
+        )
+
+        self.instrumentation: Optional[Instrumentation] = None
+        if instrumentation is not None:
+            instrumentation.attach(self)
 
     def __call__(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        if self.cache is None:
+            return self._process(raw_data)
+
+        key = self.cache_key(raw_data)
+        result = self._cached(key)
+        if result is not None:
+            return result
+
+        result = self._process(raw_data)
+        self.cache.set(key, result)
+        return result
+
+    def cache_key(self, raw_data: Union[str, bytes, Dict[str, Any]]) -> str:
+        """Return the result cache key of a payload under this config."""
+        return raw_payload_digest(raw_data) + self.config_fingerprint
+
+    def _cached(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached result, recording hits as pipeline early exits."""
+        result = self.cache.get(key)
+        if result is not None and self.instrumentation is not None:
+            self.instrumentation.early_exit("pipeline", "cache_hit")
+        return result
+
+    def score_flattened(self, flattened_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Score an already flattened payload, e.g. a `SessionCorpus` session.
+
+        The result cache is not used, as there is no raw payload to key it by.
+
+        Args:
+            flattened_data: `JsonDataFlattener` output, None for a payload that
+                failed to flatten
+
+        Returns:
+            Result like `__call__` returns
+        """
+        try:
+            logger.info("Preprocessing flattened data...")
+            processed_features = (
+                None
+                if flattened_data is None
+                else self.preprocessor.process_flattened(
+                    flattened_data, keep_alignment=True
+                )
+            )
+            return self._analyze(processed_features)
+
+        except Exception as e:
+            logger.error(f"Error in metrics processing: {str(e)}", exc_info=True)
+            raise
+
+    def _process(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
             # Step 1: Preprocess the data
             logger.info("Preprocessing raw data...")
-            processed_features = self.preprocessor(raw_data)
+            processed_features = self.preprocessor(raw_data, keep_alignment=True)
+            return self._analyze(processed_features)
 
-            logger.info("Preprocessing raw data...")
+        except Exception as e:
+            logger.error(f"Error in metrics processing: {str(e)}", exc_info=True)
+            raise
 
-            if processed_features is None:
-                logger.error("Preprocessing failed")
-                return {
-                    "success": False,
-                    "error": "Preprocessing failed",
-                    "stage": "preprocessing",
-                }
+    def _analyze(self, processed_features: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run the heuristics on preprocessed features and build the result."""
+        if processed_features is None:
+            logger.error("Preprocessing failed")
+            if self.instrumentation is not None:
+                self.instrumentation.early_exit("pipeline", "preprocessing_failed")
+            return {
+                "success": False,
+                "error": "Preprocessing failed",
+                "stage": "preprocessing",
+            }
+
+        # Step 2: Run heuristic analysis
+        logger.info("Running heuristic analysis...")
+        analysis_results = self.heuristic_analyzer(processed_features)
+
+        result = {
+            "success": True,
+            "project_id": processed_features["project_id"],
+            "user_id": processed_features["user_id"],
+            "analysis": analysis_results,
+        }
+        downsampling = self.config.preprocessor.feature_engineer.downsampling
+        if processed_features.get(downsampling.output_field):
+            result["downsampled"] = True
+            if self.instrumentation is not None:
+                self.instrumentation.registry.increment(
+                    "rt_hb_score_downsampled_total"
+                )
+        return result
+
+    def score_batch(
+        self,
+        payloads: Iterable[Union[str, Dict[str, Any]]],
+        workers: Optional[int] = None,
+        chunksize: int = 1,
+    ) -> List[Dict[str, Any]]:
+        """Score many payloads, spreading them across a process pool.
+
+        Every worker process builds its own `MetricsProcessor` once from this
+        processor's validated config. This processor's result cache is checked
+        before payloads are sent to the workers and filled with their results,
+        and the stage events of the workers are recorded into its
+        instrumentation. A failing payload does not affect the others; it gets
+        an unsuccessful result with `success`, `stage` and `error` keys like
+        `__call__` returns for preprocessing failures.
+
+        Args:
+            payloads: Raw payloads as JSON strings or dictionaries
+            workers: Number of worker processes. Defaults to the CPU count;
+                `1` scores in the current process without a pool.
+            chunksize: Number of payloads sent to a worker at once
+
+        Returns:
+            List of results in the same order as `payloads`
+        """
+        payloads = list(payloads)
+        workers = min(workers or os.cpu_count() or 1, len(payloads))
+        if workers <= 1:
+            return [self._score_isolated(raw_data) for raw_data in payloads]
+
+        return list(
+            self.score_stream(
+                payloads,
+                workers=workers,
+                chunk_size=chunksize,
+                max_inflight=len(payloads),
+            )
+        )
+
+    def score_stream(
+        self,
+        payloads: Iterable[Union[str, Dict[str, Any]]],
+        workers: Optional[int] = None,
+        chunk_size: int = 64,
+        max_inflight: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily score a stream of payloads through a bounded process pool.
+
+        Payloads are pulled from `payloads` only as fast as results are consumed,
+        so arbitrarily long inputs are scored in bounded memory. Results are
+        yielded in input order, with failures isolated and the cache and
+        instrumentation used as in `score_batch`.
+
+        Args:
+            payloads: Raw payloads as JSON strings or dictionaries
+            workers: Number of worker processes. Defaults to the CPU count;
+                `1` scores in the current process without a pool.
+            chunk_size: Number of payloads sent to a worker at once
+            max_inflight: Maximum number of chunks submitted but not yet
+                yielded. Defaults to twice the number of workers.
+
+        Yields:
+            One result per payload, in input order
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1:
+            for raw_data in payloads:
+                yield self._score_isolated(raw_data)
+            return
+
+        payloads = iter(payloads)
+        chunks = iter(lambda: list(islice(payloads, chunk_size)), [])
+        yield from self._stream_chunks(
+            _score_chunk_in_worker,
+            (self._split_cached(chunk) for chunk in chunks),
+            workers=workers,
+            max_inflight=max_inflight,
+        )
+
+    def score_corpus(
+        self,
+        corpus: SessionCorpus,
+        workers: Optional[int] = None,
+        chunk_size: int = 256,
+        max_inflight: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily score every session of a memory-mapped corpus.
+
+        Workers open the corpus themselves and are sent index ranges only, so
+        no session data is pickled. Results are yielded in corpus order, with
+        failures isolated and instrumentation used as in `score_batch`. The
+        result cache is not used, as in `score_flattened`.
+
+        Args:
+            corpus: Sessions to score
+            workers: Number of worker processes. Defaults to the CPU count;
+                `1` scores in the current process without a pool.
+            chunk_size: Number of sessions sent to a worker at once
+            max_inflight: Maximum number of chunks submitted but not yet
+                yielded. Defaults to twice the number of workers.
 
-            # Step 2: Run heuristic analysis
-            logger.info("Running heuristic analysis...")
-            analysis_results = self.heuristic_analyzer(processed_features)
+        Yields:
+            One result per session, in corpus order
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1:
+            for flattened_data in corpus:
+                yield self._score_flattened_isolated(flattened_data)
+            return
 
+        yield from self._stream_chunks(
+            _score_corpus_chunk_in_worker,
+            (
+                ((str(corpus.path), start, min(start + chunk_size, len(corpus))), None)
+                for start in range(0, len(corpus), chunk_size)
+            ),
+            workers=workers,
+            max_inflight=max_inflight,
+        )
+
+    def _split_cached(
+        self, chunk: List[Union[str, Dict[str, Any]]]
+    ) -> Tuple[tuple, Optional[_Merge]]:
+        """Leave the cached payloads of a chunk out of what is sent to a worker.
+
+        Returns:
+            Worker arguments holding the payloads missing from the cache, and a
+            function merging their results with the cached ones, in chunk
+            order, that caches the new results like `__call__` does
+        """
+        if self.cache is None:
+            return (chunk,), None
+
+        keys = [self.cache_key(raw_data) for raw_data in chunk]
+        hits = [self._cached(key) for key in keys]
+
+        def merge(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            results = iter(results)
+            merged = []
+            for key, hit in zip(keys, hits):
+                if hit is None:
+                    hit = next(results)
+                    # Exceptions isolated by `_score_isolated` are not cached
+                    if hit.get("stage") != "processing":
+                        self.cache.set(key, hit)
+                merged.append(hit)
+            return merged
+
+        misses = [raw_data for raw_data, hit in zip(chunk, hits) if hit is None]
+        return (misses,), merge
+
+    def _stream_chunks(
+        self,
+        function: Callable[..., _ChunkResults],
+        chunks: Iterable[Tuple[tuple, Optional[_Merge]]],
+        workers: int,
+        max_inflight: Optional[int],
+    ) -> Iterator[Dict[str, Any]]:
+        """Run `function(*args)` in a bounded process pool, yielding in order.
+
+        Each chunk is the worker arguments and an optional function applied
+        to the worker results. The stage events of the workers are recorded
+        into this processor's instrumentation.
+        """
+        max_inflight = max(max_inflight or 2 * workers, 1)
+        pending = deque()
+        with futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.config, self.instrumentation is not None),
+        ) as executor:
+            try:
+                for args, merge in chunks:
+                    pending.append((executor.submit(function, *args), merge))
+                    if len(pending) >= max_inflight:
+                        yield from self._chunk_results(*pending.popleft())
+
+                while pending:
+                    yield from self._chunk_results(*pending.popleft())
+            finally:
+                for future, _ in pending:
+                    future.cancel()
+
+    def _chunk_results(
+        self, future: futures.Future, merge: Optional[_Merge]
+    ) -> List[Dict[str, Any]]:
+        """Collect the results of a worker chunk and record its stage events."""
+        results, events = future.result()
+        if self.instrumentation is not None:
+            for event in events:
+                self.instrumentation.record(event)
+        return results if merge is None else merge(results)
+
+    def _score_flattened_isolated(
+        self, flattened_data: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Score a single flattened payload, turning exceptions into a failed result."""
+        try:
+            return self.score_flattened(flattened_data)
+        except Exception as e:
             return {
-                "success": True,
-                "project_id": processed_features["project_id"],
-                "user_id": processed_features["user_id"],
-                "analysis": analysis_results,
+                "success": False,
+                "error": str(e),
+                "stage": "processing",
             }
 
+    def _score_isolated(self, raw_data: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Score a single payload, turning exceptions into a failed result."""
+        try:
+            return self(raw_data)
         except Exception as e:
-            logger.error(f"Error in metrics processing: {str(e)}", exc_info=True)
-            raise
+            return {
+                "success": False,
+                "error": str(e),
+                "stage": "processing",
+            }
 
 
@@ -0,0 +1,155 @@
+"""Thread-safe LRU pool of scoring pipelines keyed by their challenge actions."""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing_extensions import Any, Dict, List, Optional, Union
+
+from ._main import MetricsProcessor
+from ._cache import ResultCache, canonical_digest
+from ._instrumentation import Instrumentation
+from .config import MetricsProcessorConfig
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint_actions(actions: List[Dict[str, Any]]) -> str:
+    """Return a stable fingerprint of an actions list.
+
+    Equal lists give equal fingerprints regardless of dictionary key order.
+
+    Args:
+        actions: Challenge actions, as in `MetricsProcessorConfig.actions`
+
+    Returns:
+        Hex digest of the canonical JSON form of `actions`
+    """
+    return canonical_digest(actions)
+
+
+class ProcessorPool:
+    """Hands out ready `MetricsProcessor`s for challenge action sets.
+
+    Every challenge round clicks different targets, so it needs its own
+    processor, and building one validates the whole `MetricsProcessorConfig`.
+    The pool builds one processor per distinct actions fingerprint from a shared
+    base config, via `MetricsProcessorConfig.with_actions`, and keeps the
+    `maxsize` most recently used ones.
+
+    Lookups are thread-safe. Processors are built outside the lock, so a slow
+    build does not block lookups of other action sets; if two threads build the
+    same one at once, the first to finish is kept.
+
+    Usage:
+        pool = ProcessorPool(config, maxsize=256)
+        result = pool(payload, actions)
+    """
+
+    def __init__(
+        self,
+        config: Union[MetricsProcessorConfig, Dict[str, Any], None] = None,
+        maxsize: int = 128,
+        instrumentation: Optional[Instrumentation] = None,
+        cache: Optional[ResultCache] = None,
+    ):
+        """Initialize an empty pool.
+
+        Args:
+            config: Base configuration of every processor, its `actions` are
+                replaced per action set
+            maxsize: Maximum number of processors kept
+            instrumentation: Attached to every processor built. Pool hits,
+                misses and evictions are counted in its registry as
+                `rt_hb_score_processor_pool_total{result}`.
+            cache: Result cache shared by every processor built. Keys include
+                the config fingerprint, so action sets never share entries.
+        """
+        if maxsize < 1:
+            raise ValueError(f"`maxsize` must be at least 1, got: {maxsize}")
+        if isinstance(config, dict):
+            config = MetricsProcessorConfig(**config)
+
+        self.config = config or MetricsProcessorConfig()
+        self.maxsize = maxsize
+        self.instrumentation = instrumentation
+        self.cache = cache
+        self._processors: "OrderedDict[str, MetricsProcessor]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __call__(
+        self, raw_data: Union[str, Dict[str, Any]], actions: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Score a payload with the processor of its challenge actions."""
+        return self.get(actions)(raw_data)
+
+    def __len__(self) -> int:
+        return len(self._processors)
+
+    def get(self, actions: List[Dict[str, Any]]) -> MetricsProcessor:
+        """Return the processor of an actions list, building it if needed.
+
+        Args:
+            actions: Challenge actions of the session
+
+        Returns:
+            Processor configured with `actions`
+        """
+        _key = fingerprint_actions(actions)
+        with self._lock:
+            _processor = self._processors.get(_key)
+            if _processor is not None:
+                self._processors.move_to_end(_key)
+                self.hits += 1
+        if _processor is not None:
+            self._count("hit")
+            return _processor
+
+        logger.debug(f"Building processor for actions: {_key}")
+        _built = MetricsProcessor(
+            config=self.config.with_actions(actions),
+            instrumentation=self.instrumentation,
+            cache=self.cache,
+        )
+
+        _evicted = 0
+        with self._lock:
+            self.misses += 1
+            _processor = self._processors.setdefault(_key, _built)
+            self._processors.move_to_end(_key)
+            while len(self._processors) > self.maxsize:
+                self._processors.popitem(last=False)
+                _evicted += 1
+            self.evictions += _evicted
+
+        self._count("miss")
+        if _evicted:
+            self._count("eviction", _evicted)
+        return _processor
+
+    def clear(self) -> None:
+        """Drop every processor, statistics are kept."""
+        with self._lock:
+            self._processors.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and eviction counts and the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._processors),
+                "maxsize": self.maxsize,
+            }
+
+    def _count(self, result: str, value: int = 1) -> None:
+        if self.instrumentation is not None:
+            self.instrumentation.registry.increment(
+                "rt_hb_score_processor_pool_total", value, result=result
+            )
+
+
+__all__ = ["ProcessorPool", "fingerprint_actions"]
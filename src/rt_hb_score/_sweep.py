@@ -0,0 +1,288 @@
+"""Heuristic config sweeps over features engineered once per session."""
+
+import logging
+from itertools import product
+from typing_extensions import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from ._cache import canonical_digest
+from ._corpus import SessionCorpus
+from .config import MetricsProcessorConfig
+from .heuristics import HeuristicAnalyzer, HeuristicConfig
+from .preprocessing import Preprocessor
+
+logger = logging.getLogger(__name__)
+
+
+def _text_settings(value: Any) -> Any:
+    """Keep the non-numeric leaves of a dumped config, which name features."""
+    if isinstance(value, dict):
+        return {key: _text_settings(item) for key, item in value.items()}
+    if isinstance(value, str):
+        return value
+    return None
+
+
+class SweepResult:
+    """Final scores of every session under every swept config.
+
+    Attributes:
+        variants: Overrides of each variant, keyed by dotted config path.
+        configs: Heuristic config of each variant.
+        scores: Scores as a variants x sessions array, NaN for sessions whose
+            features could not be engineered.
+    """
+
+    QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+    def __init__(
+        self,
+        variants: List[Dict[str, Any]],
+        configs: List[HeuristicConfig],
+        scores: np.ndarray,
+    ):
+        self.variants = variants
+        self.configs = configs
+        self.scores = scores
+
+    def __len__(self) -> int:
+        return len(self.variants)
+
+    def __repr__(self) -> str:
+        return f"SweepResult(variants={len(self)}, sessions={self.scores.shape[1]})"
+
+    def summary(
+        self, bins: int = 10, threshold: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Describe the score distribution of each variant.
+
+        Args:
+            bins: Number of equal-width histogram bins over `[0, 1]`
+            threshold: If given, also report the share of sessions scoring
+                below it, i.e. classified as bots
+
+        Returns:
+            One dictionary per variant with its `overrides`, the session
+            `count`, `mean`, `std`, `min`, `max`, `quantiles` and `histogram`
+            counts, NaN scores excluded
+        """
+        edges = np.linspace(0.0, 1.0, bins + 1)
+        summaries = []
+        for overrides, scores in zip(self.variants, self.scores):
+            scores = scores[~np.isnan(scores)]
+            has_scores = len(scores) > 0
+            summary = {
+                "overrides": overrides,
+                "count": len(scores),
+                "mean": float(scores.mean()) if has_scores else np.nan,
+                "std": float(scores.std()) if has_scores else np.nan,
+                "min": float(scores.min()) if has_scores else np.nan,
+                "max": float(scores.max()) if has_scores else np.nan,
+                "quantiles": {
+                    q: float(value)
+                    for q, value in zip(
+                        self.QUANTILES,
+                        np.quantile(scores, self.QUANTILES)
+                        if has_scores
+                        else np.full(len(self.QUANTILES), np.nan),
+                    )
+                },
+                "histogram": np.histogram(scores, bins=edges)[0].tolist(),
+            }
+            if threshold is not None:
+                summary["bot_rate"] = (
+                    float(np.mean(scores < threshold)) if has_scores else np.nan
+                )
+            summaries.append(summary)
+        return summaries
+
+
+class ThresholdSweep:
+    """Evaluates many heuristic configs against cached session features.
+
+    Features are engineered once per session with the preprocessing config,
+    then every variant is scored across all sessions at once with
+    `HeuristicAnalyzer.score_array`. The feature columns only depend on the
+    click comparison config and the feature names, so they are built once and
+    shared by every variant that only changes thresholds or weights.
+
+    Sessions are not gated during feature engineering: a variant may lower
+    `mouse_movements_very_low` and score sessions the base config would decide
+    early.
+
+    Usage:
+        sweep = ThresholdSweep.from_payloads(payloads, config)
+        result = sweep.run(sweep.grid({
+            "mouse_events.velocity.min_velocity_variation": [400, 500, 600],
+            "mouse_events.movement_count.max_pixel_count": [15, 17, 19],
+        }))
+        for summary in result.summary(threshold=0.5):
+            ...
+    """
+
+    def __init__(
+        self,
+        features_list: Sequence[Optional[Dict[str, Any]]],
+        config: Union[MetricsProcessorConfig, Dict[str, Any], None] = None,
+    ):
+        """Initialize the sweep from engineered features.
+
+        Args:
+            features_list: `Preprocessor` output of each session, None for
+                sessions that failed preprocessing
+            config: Base configuration, variants override its `heuristics`
+        """
+        if isinstance(config, dict):
+            config = MetricsProcessorConfig(**config)
+
+        self.config = config or MetricsProcessorConfig()
+        self.features_list = list(features_list)
+        self.is_valid = np.array(
+            [features is not None for features in self.features_list], dtype=bool
+        )
+        self._valid_features = [
+            features for features in self.features_list if features is not None
+        ]
+        self._columns: Dict[str, Dict[str, np.ndarray]] = {}
+
+    @classmethod
+    def from_payloads(
+        cls,
+        payloads: Iterable[Union[str, bytes, Dict[str, Any]]],
+        config: Union[MetricsProcessorConfig, Dict[str, Any], None] = None,
+    ) -> "ThresholdSweep":
+        """Engineer the features of raw payloads and cache them for sweeping.
+
+        Args:
+            payloads: Raw payloads in any format `MetricsProcessor` accepts
+            config: Base configuration
+
+        Returns:
+            Sweep over the payloads, in input order
+        """
+        if isinstance(config, dict):
+            config = MetricsProcessorConfig(**config)
+        config = config or MetricsProcessorConfig()
+
+        preprocessor = Preprocessor(config=config.preprocessor)
+        return cls(
+            [preprocessor(payload, keep_alignment=True) for payload in payloads],
+            config,
+        )
+
+    @classmethod
+    def from_corpus(
+        cls,
+        corpus: SessionCorpus,
+        config: Union[MetricsProcessorConfig, Dict[str, Any], None] = None,
+    ) -> "ThresholdSweep":
+        """Engineer the features of a session corpus and cache them for sweeping.
+
+        Args:
+            corpus: Sessions to sweep over
+            config: Base configuration
+
+        Returns:
+            Sweep over the corpus sessions, in corpus order
+        """
+        if isinstance(config, dict):
+            config = MetricsProcessorConfig(**config)
+        config = config or MetricsProcessorConfig()
+
+        preprocessor = Preprocessor(config=config.preprocessor)
+        return cls(
+            [
+                None
+                if session is None
+                else preprocessor.process_flattened(session, keep_alignment=True)
+                for session in corpus
+            ],
+            config,
+        )
+
+    def __len__(self) -> int:
+        return len(self.features_list)
+
+    @staticmethod
+    def grid(values: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+        """Build every combination of candidate values.
+
+        Args:
+            values: Candidate values keyed by dotted path into `HeuristicConfig`,
+                e.g. `mouse_events.velocity.min_velocity_variation`
+
+        Returns:
+            One overrides dictionary per combination
+        """
+        paths = list(values)
+        return [
+            dict(zip(paths, combination))
+            for combination in product(*(values[path] for path in paths))
+        ]
+
+    def variant(self, overrides: Dict[str, Any]) -> HeuristicConfig:
+        """Return the base heuristic config with `overrides` applied and validated.
+
+        Args:
+            overrides: Values keyed by dotted path into `HeuristicConfig`
+
+        Returns:
+            Heuristic config of the variant
+
+        Raises:
+            KeyError: If a path does not name a config field.
+            pydantic.ValidationError: If a value is invalid.
+        """
+        data = self.config.heuristics.model_dump()
+        for path, value in overrides.items():
+            *parents, name = path.split(".")
+            node = data
+            for parent in parents:
+                node = node.get(parent) if isinstance(node, dict) else None
+            if not isinstance(node, dict) or name not in node:
+                raise KeyError(f"Unknown heuristic config field: {path}")
+            node[name] = value
+        return HeuristicConfig.model_validate(data)
+
+    def run(self, variants: Iterable[Dict[str, Any]]) -> SweepResult:
+        """Score every session under every variant.
+
+        Args:
+            variants: Overrides of each variant, e.g. from `grid`. An empty
+                dictionary is the base config.
+
+        Returns:
+            Scores of all variants
+        """
+        variants = list(variants)
+        configs = [self.variant(overrides) for overrides in variants]
+        scores = np.full((len(variants), len(self)), np.nan)
+        for row, config in enumerate(configs):
+            analyzer = HeuristicAnalyzer(config=config)
+            if len(self._valid_features):
+                scores[row, self.is_valid] = analyzer.score_array(
+                    self._columns_for(analyzer)
+                )
+        return SweepResult(variants, configs, scores)
+
+    def _columns_for(self, analyzer: HeuristicAnalyzer) -> Dict[str, np.ndarray]:
+        """Return the feature columns of a variant, built once per column layout."""
+        mouse_config = analyzer.config.mouse_events
+        key = canonical_digest(
+            [
+                mouse_config.args_comparer.model_dump(mode="json"),
+                _text_settings(mouse_config.model_dump(mode="json")),
+            ]
+        )
+        columns = self._columns.get(key)
+        if columns is None:
+            logger.debug(f"Building feature columns of layout: {key}")
+            columns = analyzer.mouse_analyzer.columns_from_features(
+                self._valid_features
+            )
+            self._columns[key] = columns
+        return columns
+
+
+__all__ = ["SweepResult", "ThresholdSweep"]
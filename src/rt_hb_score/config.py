@@ -1,8 +1,26 @@
-from typing_extensions import Self
-from pydantic import BaseModel, Field, model_validator
+from typing_extensions import Any, Self, Sequence
+from pydantic import BaseModel, Field, TypeAdapter, model_validator
 from .preprocessing import PreprocessorConfig
 from .heuristics import HeuristicConfig
 
+_ACTIONS_ADAPTER = TypeAdapter(list[dict])
+
+# Sub-config fields that hold a copy of `MetricsProcessorConfig.actions`
+_ACTIONS_PATHS = (
+    ("heuristics", "mouse_events", "args_comparer", "actions"),
+    ("preprocessor", "feature_engineer", "checkbox", "actions"),
+)
+
+
+def _replace(model: BaseModel, path: Sequence[str], value: Any) -> BaseModel:
+    """Copy the models along `path` with the field at its end set to `value`."""
+    _name, *_rest = path
+    return model.model_copy(
+        update={
+            _name: _replace(getattr(model, _name), _rest, value) if _rest else value
+        }
+    )
+
 
 class MetricsProcessorConfig(BaseModel):
     """Configuration for metrics processing pipeline."""
@@ -25,10 +43,33 @@ class MetricsProcessorConfig(BaseModel):
     
     @model_validator(mode="after")
     def validate_after(self) -> Self:
-        actions = self.model_dump()["actions"]
+        # Each sub-config gets its own copy, without dumping the whole config
+        actions = self.model_dump(include={"actions"})["actions"]
         self.heuristics.mouse_events.args_comparer.actions = actions
         self.preprocessor.feature_engineer.checkbox.actions = actions
         return self
 
+    def with_actions(self, actions: list[dict]) -> Self:
+        """Return a copy of the config for other challenge actions.
+
+        Only `actions` is validated. Sub-configs holding a copy of it are
+        copied; every other sub-config is shared with this config instead of
+        being validated again.
+
+        Args:
+            actions: Challenge actions
+
+        Returns:
+            Config equal to one built with `actions`
+        """
+        config = self.model_copy(
+            update={"actions": _ACTIONS_ADAPTER.validate_python(actions)}
+        )
+        for path in _ACTIONS_PATHS:
+            config = _replace(
+                config, path, _ACTIONS_ADAPTER.dump_python(config.actions)
+            )
+        return config
+
 
 __all__ = ["MetricsProcessorConfig"]
@@ -1,7 +1,10 @@
 """Main module for heuristic analysis."""
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
+import numpy as np
+
+from .._instrumentation import Instrumentation
 from .config import HeuristicConfig
 from .mouse_events import MouseEventAnalyzer
 
@@ -20,6 +23,7 @@ class HeuristicAnalyzer:
         """
         self.config = config or HeuristicConfig()
         self.mouse_analyzer = MouseEventAnalyzer(config=self.config.mouse_events)
+        self.instrumentation: Optional[Instrumentation] = None
 
     def __call__(self, features: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze features to detect bot-like behavior.
@@ -39,11 +43,20 @@ class HeuristicAnalyzer:
 
         except Exception as e:
             logger.error(f"Error in heuristic analysis: {str(e)}", exc_info=True)
+            if self.instrumentation is not None:
+                self.instrumentation.early_exit("heuristics", "error")
             return {
                 "score": 0.0,
                 "error": str(e),
             }
 
+    def gate(self, features: Dict[str, Any]) -> Optional[str]:
+        """Return why a session is decided from its gate features, or None.
+
+        See `MouseEventAnalyzer.gate`.
+        """
+        return self.mouse_analyzer.gate(features)
+
     def _calculate_final_score(self, scores: Dict[str, Dict[str, float]]) -> float:
         """Calculate weighted average score.
 
@@ -70,3 +83,59 @@ class HeuristicAnalyzer:
         logger.debug(f"Final botness score: {weighted_sum / total_weight}.\nMetrics:")
 
         return weighted_sum / total_weight
+
+    def analyze_batch(self, features_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Analyze features of many sessions at once.
+
+        Args:
+            features_list: Engineered features, one dictionary per session
+
+        Returns:
+            Detection results in the same order, like `__call__` output
+        """
+        try:
+            columns = self.mouse_analyzer.columns_from_features(features_list)
+            final_scores = self.score_array(columns)
+            return [{"score": float(score)} for score in final_scores]
+
+        except Exception as e:
+            logger.error(f"Error in batch heuristic analysis: {str(e)}", exc_info=True)
+            return [self(features) for features in features_list]
+
+    def score_array(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Calculate final scores of many sessions from feature columns.
+
+        Args:
+            columns: Feature arrays, see `MouseEventAnalyzer.columns_from_features`
+
+        Returns:
+            Array of final scores, one per session
+        """
+        mouse_scores = self.mouse_analyzer.score_array(columns)
+        return np.round(1 - self._calculate_final_score_array(mouse_scores), 5)
+
+    def _calculate_final_score_array(
+        self, scores: Dict[str, Dict[str, np.ndarray]]
+    ) -> np.ndarray:
+        """Calculate weighted average scores as matrix operations.
+
+        Args:
+            scores: Dictionary containing score and weight arrays, NaN scores
+                mark entries that do not apply to a session
+
+        Returns:
+            Final weighted scores
+        """
+        score_matrix = np.vstack([entry["score"] for entry in scores.values()])
+        weight_matrix = np.vstack([entry["weight"] for entry in scores.values()])
+
+        is_present = ~np.isnan(score_matrix)
+        score_matrix = np.where(is_present, score_matrix, 0.0)
+        weight_matrix = np.where(
+            is_present, np.where(score_matrix == 0, 0.5, weight_matrix), 0.0
+        )
+
+        weighted_sum = (score_matrix * weight_matrix).sum(axis=0)
+        total_weight = weight_matrix.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(total_weight == 0, 0.0, weighted_sum / total_weight)
@@ -4,6 +4,8 @@ import math
 from typing import Any
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 
 logger = logging.getLogger(__name__)
 
@@ -105,3 +107,76 @@ class BaseHeuristicCheck(ABC):
             float: Score value clamped between 0.0 and 1.0.
         """
         return max(0.0, min(1.0, score))
+
+    def scoring_function_array(
+        self,
+        values,
+        min_value,
+        max_value,
+        min_score=0.40,
+        max_score=0.40,
+        min_of_min=0.3,
+        max_of_max=1.5,
+    ) -> np.ndarray:
+        """
+        Array version of `scoring_function`, scoring many values at once.
+
+        Takes the same thresholds as `scoring_function`. NaN values score 0, like
+        values `scoring_function` cannot place below or above the range.
+
+        Args:
+            values : array-like
+                The input values to be scored
+
+        Returns:
+            np.ndarray
+                Normalized scores between 0 and 1
+        """
+
+        values = np.asarray(values, dtype=np.float64)
+        with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+            below_scores = min_score + (1 - min_score) * self.inverse_scaling_array(
+                values, min_of_min * min_value, min_value, 0.05, 1, 0.1
+            )
+            above_scores = max_score + (1 - max_score) * self.inverse_scaling_array(
+                values, max_value, max_of_max * max_value, 0.95, 0.05, 0.1
+            )  # min and max changed to inverse `inverse_scaling`
+
+        return np.where(
+            values < min_value,
+            np.minimum(1, below_scores),
+            np.where(values > max_value, np.minimum(1, above_scores), 0.0),
+        )
+
+    def inverse_scaling_array(
+        self, values, min_input, max_input, min_value, max_value, rate=1.0
+    ) -> np.ndarray:
+        """
+        Array version of `inverse_scaling`.
+
+        Args:
+            - values: Input values to scale.
+            - min_input, max_input, min_value, max_value, rate: As in `inverse_scaling`.
+
+        Returns:
+            - Scaled outputs between min_value and max_value.
+        """
+
+        normalized = (np.asarray(values, dtype=np.float64) - min_input) / (
+            max_input - min_input
+        )
+        scaled = np.exp(-rate * normalized)
+        scaled = (scaled - math.exp(-rate)) / (1 - math.exp(-rate))
+        return min_value + scaled * (max_value - min_value)
+
+    def clamp_score_zero_to_one_array(self, scores) -> np.ndarray:
+        """
+        Array version of `clamp_score_zero_to_one`.
+
+        Args:
+            scores (array-like): Input score values to be clamped.
+
+        Returns:
+            np.ndarray: Score values clamped between 0.0 and 1.0.
+        """
+        return np.clip(np.asarray(scores, dtype=np.float64), 0.0, 1.0)
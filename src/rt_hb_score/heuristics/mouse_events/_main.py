@@ -1,8 +1,11 @@
 """Mouse event analysis module."""
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
+import numpy as np
+
+from ..._instrumentation import Instrumentation
 from .config import MouseEventConfig
 from .velocity import VelocityAnalyzer
 from .movement_count import MovementCountAnalyzer
@@ -27,18 +30,18 @@ class MouseEventAnalyzer:
             config=self.config.checkbox_path
         )
         self.args_comparer = ArgCompare(config=self.config.args_comparer)
+        self.instrumentation: Optional[Instrumentation] = None
 
     def __call__(self, features: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze mouse features for bot detection."""
         try:
-            arg_score = self.args_comparer(features)
-            if arg_score == 0:
-                logger.warning("Bot did not clicked to all given locations")
-                return {
-                    "bot_behavior": {"score": 1.0, "weight": 1.0},
-                }
-            if features[self.config.mouse_movement_count] < self.config.mouse_movements_very_low:
-                logger.warning("Bot did not move enough")
+            # Sessions gated by the preprocessor were already checked and counted
+            reason = features.get(self.config.gate_reason)
+            if reason is None:
+                reason = self.gate(features)
+                if reason is not None and self.instrumentation is not None:
+                    self.instrumentation.early_exit("heuristics.mouse_events", reason)
+            if reason is not None:
                 return {
                     "bot_behavior": {"score": 1.0, "weight": 1.0},
                 }
@@ -92,6 +95,185 @@ class MouseEventAnalyzer:
 
         except Exception as e:
             logger.error(f"Error in checking mouse event analysis: {str(e)}")
+            if self.instrumentation is not None:
+                self.instrumentation.early_exit("heuristics.mouse_events", "error")
             return {
                 "error_score": {"score": 1.0, "weight": 1.0},
             }
+
+    def gate(self, features: Dict[str, Any]) -> Optional[str]:
+        """Check the gates that decide a session without the other features.
+
+        The gates only read the clicks, their alignment and the movement count,
+        so they can run on `FeatureEngineer.gate_features` output before the
+        rest of the features is engineered.
+
+        Args:
+            features: Engineered features, or gate features
+
+        Returns:
+            Reason the session is scored as a bot, or None if no gate applies
+        """
+        if self.args_comparer(features) == 0:
+            logger.warning("Bot did not clicked to all given locations")
+            return "missed_click_targets"
+        if features[self.config.mouse_movement_count] < self.config.mouse_movements_very_low:
+            logger.warning("Bot did not move enough")
+            return "too_few_movements"
+        return None
+
+    def columns_from_features(
+        self, features_list: List[Dict[str, Any]]
+    ) -> Dict[str, np.ndarray]:
+        """Collect per-session features into the columns used by `score_array`.
+
+        Scalar features get the same defaults as the per-session analyzers and
+        `ArgCompare` is run per session, except for sessions the preprocessor
+        already gated, which are marked as missing their targets so they stay
+        gated. `between_path` pairs of all sessions are
+        flattened into pair columns with the owning session index.
+
+        Args:
+            features_list: Engineered features, one dictionary per session
+
+        Returns:
+            Dictionary of feature arrays
+        """
+        sequence_config = self.config.checkbox_path.checkbox_sequence
+        scalar_defaults = {
+            self.config.velocity_std: 0.0,
+            self.config.velocity_avg: 0.0,
+            self.config.distance_count: 0.0,
+            self.config.overall_session_angle_std: 0.0,
+            self.config.mouse_down_check: 1,
+        }
+        columns = {
+            key: np.array(
+                [
+                    np.nan if _value is None else float(_value)
+                    for _value in (
+                        features.get(key, default) for features in features_list
+                    )
+                ],
+                dtype=np.float64,
+            )
+            for key, default in scalar_defaults.items()
+        }
+        columns[self.config.mouse_movement_count] = np.array(
+            [
+                float(features.get(self.config.mouse_movement_count, np.nan))
+                for features in features_list
+            ],
+            dtype=np.float64,
+        )
+        columns[self.config.session_time] = np.array(
+            [
+                float(features.get(self.config.session_time) or 0)
+                for features in features_list
+            ],
+            dtype=np.float64,
+        )
+        columns[self.config.args_compare_score] = np.array(
+            [
+                0.0
+                if features.get(self.config.gate_reason) is not None
+                or self.args_comparer(features) == 0
+                else 1.0
+                for features in features_list
+            ]
+        )
+        columns[sequence_config.input_validation] = np.array(
+            [bool(features.get(sequence_config.input_validation)) for features in features_list],
+            dtype=bool,
+        )
+
+        pair_keys = (
+            sequence_config.input_angle_std,
+            sequence_config.input_straightness,
+            sequence_config.input_angular_consistency,
+        )
+        pairs = [
+            (_index, pair)
+            for _index, features in enumerate(features_list)
+            if features.get(sequence_config.input_validation)
+            for pair in features.get(sequence_config.input_main) or []
+        ]
+        for key in pair_keys:
+            columns[key] = np.array(
+                [
+                    np.nan if pair.get(key) is None else float(pair.get(key))
+                    for _, pair in pairs
+                ],
+                dtype=np.float64,
+            )
+        columns[sequence_config.input_pair_session] = np.array(
+            [_index for _index, _ in pairs], dtype=np.intp
+        )
+        return columns
+
+    def score_array(
+        self, columns: Dict[str, np.ndarray]
+    ) -> Dict[str, Dict[str, np.ndarray]]:
+        """Analyze mouse features of many sessions at once.
+
+        Args:
+            columns: Feature arrays, see `columns_from_features`
+
+        Returns:
+            Dictionary keyed like `__call__` output with `score` and `weight`
+            arrays. A NaN score means the entry does not apply to that session.
+        """
+        movement_count = np.asarray(
+            columns[self.config.mouse_movement_count], dtype=np.float64
+        )
+        is_error = np.isnan(movement_count)
+        is_gated = ~is_error & (
+            (np.asarray(columns[self.config.args_compare_score]) == 0)
+            | (movement_count < self.config.mouse_movements_very_low)
+        )
+        is_scored = ~(is_error | is_gated)
+
+        velocity_score = self.velocity_analyzer.score_array(columns)
+        movement_count_score = self.movement_count_analyzer.score_array(columns)
+        checkbox_path_score = self.checkbox_path_analyzer.score_array(columns)
+
+        def _entry(score, weight, present=is_scored):
+            return {
+                "score": np.where(present, score, np.nan),
+                "weight": np.full(len(movement_count), float(weight)),
+            }
+
+        mouse_down_getter = np.asarray(
+            columns[self.config.mouse_down_check], dtype=np.float64
+        )
+        return {
+            "bot_behavior": _entry(1.0, 1.0, present=is_gated),
+            "error_score": _entry(1.0, 1.0, present=is_error),
+            self.config.velocity_std: _entry(
+                velocity_score[self.config.velocity_std],
+                self.config.velocity_std_weight,
+            ),
+            self.config.velocity_avg: _entry(
+                velocity_score[self.config.velocity_avg],
+                self.config.velocity_avg_weight,
+            ),
+            self.config.distance_count: _entry(
+                movement_count_score[self.config.distance_count],
+                self.config.distance_weight,
+            ),
+            self.config.mouse_movement_count: _entry(
+                movement_count_score[self.config.mouse_movement_count],
+                self.config.movement_count_weight,
+            ),
+            self.config.checkbox_path_score: _entry(
+                checkbox_path_score[self.config.checkbox_path_score],
+                self.config.checkbox_path_weight,
+            ),
+            self.config.overall_session_angle_std: _entry(
+                movement_count_score[self.config.overall_session_angle_std],
+                self.config.overall_session_angle_std_weight,
+            ),
+            self.config.mouse_down_check: _entry(
+                1.0, 1.0, present=is_scored & (mouse_down_getter > 0)
+            ),
+        }
@@ -3,6 +3,8 @@
 import logging
 from typing import Dict, Any, Optional
 
+import numpy as np
+
 from .config import CheckboxPathConfig
 from .._base import BaseHeuristicCheck
 from .checkbox_sequence import CheckboxPathSequence
@@ -44,3 +46,21 @@ class CheckboxPathAnalyzer(BaseHeuristicCheck):
                 self.config.checkbox_sequence.output_field: 1,
                 self.config.session_time.session_time: 1
             }
+
+    def score_array(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Analyze checkbox interaction features of many sessions at once.
+
+        Args:
+            columns: Feature arrays keyed like the per-session features
+
+        Returns:
+            Dictionary of score arrays keyed like `__call__` output
+        """
+        return {
+            self.config.checkbox_sequence.output_field: self.checkbox_sequence.score_array(
+                columns
+            ),
+            self.config.session_time.session_time: self.session_time.score_array(
+                columns
+            ),
+        }
@@ -3,6 +3,8 @@
 import logging
 from typing import Dict, Any, Optional
 
+import numpy as np
+
 from .config import CheckboxSequenceConfig
 from .._base import BaseHeuristicCheck
 
@@ -64,6 +66,107 @@ class CheckboxPathSequence(BaseHeuristicCheck):
             logger.error(f"Error in check path analysis: {str(e)}")
             return 0.0
 
+    def score_array(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Score checkbox paths of many sessions at once.
+
+        `between_path` pairs of all sessions are flattened into the
+        `input_angle_std`, `input_straightness` and `input_angular_consistency`
+        columns, with the owning session index in `input_pair_session`. NaN pair
+        values are treated like missing ones.
+
+        Args:
+            columns: Feature arrays keyed like the per-session features
+
+        Returns:
+            Array of checkbox path scores, one per session
+        """
+        is_valid = np.asarray(columns[self.config.input_validation], dtype=bool)
+        angle_std = np.asarray(columns[self.config.input_angle_std], dtype=np.float64)
+        straightness = np.asarray(
+            columns[self.config.input_straightness], dtype=np.float64
+        )
+        angular_consistency = np.asarray(
+            columns[self.config.input_angular_consistency], dtype=np.float64
+        )
+        pair_session = np.asarray(columns[self.config.input_pair_session], dtype=np.intp)
+
+        is_analyzed = ~(
+            (straightness == self.config.bot_straightness)
+            | (angle_std == self.config.bot_angle_std)
+            | (angular_consistency == self.config.bot_angular_consistency)
+            | np.isnan(angle_std)
+            | np.isnan(straightness)
+            | np.isnan(angular_consistency)
+        )
+
+        pair_scores = (
+            (self.config.weight_angle_std * self._analyze_angle_std_array(angle_std))
+            + (
+                self.config.weight_straightness
+                * self._analyze_straightness_array(straightness)
+            )
+            + (
+                self.config.weight_angular_consistency
+                * self._analyze_angular_consistency_array(angular_consistency)
+            )
+        )
+
+        session_count = len(is_valid)
+        max_suspicion_scores = np.zeros(session_count)
+        np.maximum.at(
+            max_suspicion_scores, pair_session[is_analyzed], pair_scores[is_analyzed]
+        )
+        pairs_analyzed = np.bincount(
+            pair_session[is_analyzed], minlength=session_count
+        )
+
+        return np.where(
+            is_valid & (pairs_analyzed > 0),
+            np.minimum(1.0, max_suspicion_scores),
+            1.0,
+        )
+
+    def _analyze_angle_std_array(self, angle_std: np.ndarray) -> np.ndarray:
+        score = self.scoring_function_array(
+            values=angle_std,
+            min_value=self.config.min_angle_std,
+            max_value=self.config.max_angle_std,
+            min_score=0.9,
+            max_score=0.7,
+            min_of_min=0.91,
+            max_of_max=1.18,
+        )
+
+        return self.clamp_score_zero_to_one_array(score)
+
+    def _analyze_straightness_array(self, straightness: np.ndarray) -> np.ndarray:
+        score = self.scoring_function_array(
+            values=straightness,
+            min_value=self.config.min_straightness,
+            max_value=self.config.max_straightness,
+            min_score=0.6,
+            max_score=0.9,
+            min_of_min=0.8211,
+            max_of_max=1.00922431,
+        )
+
+        return self.clamp_score_zero_to_one_array(score)
+
+    def _analyze_angular_consistency_array(
+        self, angular_consistency: np.ndarray
+    ) -> np.ndarray:
+        score = self.scoring_function_array(
+            values=angular_consistency,
+            min_value=self.config.min_angular_consistency,
+            max_value=self.config.max_angular_consistency,
+            min_score=0.8,
+            max_score=0.5,
+            min_of_min=0.9472,
+            max_of_max=1.02239035,
+        )
+
+        return self.clamp_score_zero_to_one_array(score)
+
     def _analyze_angle_std(self, angle_consistency_value: float) -> float:
         score = self.scoring_function(
             value=angle_consistency_value,
@@ -10,6 +10,10 @@ class CheckboxSequenceConfig(BaseModel):
     input_angle_std: str = Field(default="angle_std")
     input_angular_consistency: str = Field(default="angular_consistency")
     input_straightness: str = Field(default="straightness")
+    input_pair_session: str = Field(
+        default="between_path_session",
+        description="Column of session indices of `between_path` pairs in batch scoring",
+    )
     output_field: str = Field(default="checkbox_path_score")
 
     min_angular_consistency: float = Field(default=0.84455)
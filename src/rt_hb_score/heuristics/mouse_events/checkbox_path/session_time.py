@@ -3,6 +3,8 @@
 import logging
 from typing import Dict, Any, Optional
 
+import numpy as np
+
 from .config import SessionTimeConfig
 from .._base import BaseHeuristicCheck
 
@@ -32,3 +34,15 @@ class SessionTimeAnalyze(BaseHeuristicCheck):
         except Exception as e:
             logger.error(f"Error in check path analysis: {str(e)}", exc_info=True)
             return 1.0
+
+    def score_array(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Score session times of many sessions at once."""
+        return self.scoring_function_array(
+            values=columns[self.config.session_time],
+            min_value=self.config.min_session_time,
+            max_value=self.config.max_session_time,
+            min_score=0.8,
+            max_score=0.5,
+            min_of_min=0.65,
+            max_of_max=1.04,
+        )
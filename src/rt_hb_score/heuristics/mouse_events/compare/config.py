@@ -11,6 +11,13 @@ class ArgCompareConfig(BaseModel):
     mouse_clicks: str = Field(
         default="mouse_clicks", description="Key for mouse clicks"
     )
+    click_alignment: str = Field(
+        default="click_alignment",
+        description=(
+            "Key for the click alignment from feature engineering, used instead "
+            "of matching the clicks again if it has the same targets"
+        ),
+    )
     actions: list[dict] = Field(
         default=[
             {"id": "1", "type": "click", "args": {"location": {"x": 100, "y": 200}}},
@@ -24,6 +24,8 @@ class MouseEventConfig(BaseModel):
     session_time: str = Field(default="session_time")
     checkbox_path_score: str = Field(default="checkbox_path_score")
     mouse_down_check: str = Field(default="mouse_down_up_features")
+    args_compare_score: str = Field(default="args_compare_score")
+    gate_reason: str = Field(default="gate_reason")
 
     velocity: VelocityConfig = Field(
         default_factory=VelocityConfig, description="Velocity analysis configuration"
@@ -51,3 +53,11 @@ class MouseEventConfig(BaseModel):
     overall_session_angle_std_weight: float = Field(default=1)
 
     mouse_movements_very_low:int = Field(default=50)
+    early_exit: bool = Field(
+        default=False,
+        description=(
+            "Check the click and movement count gates before feature engineering "
+            "and skip it for sessions they decide. Opt-in, as decided sessions "
+            "then only get the gate features."
+        ),
+    )
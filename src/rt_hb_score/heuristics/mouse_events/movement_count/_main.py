@@ -3,6 +3,8 @@
 import logging
 from typing import Dict, Any, Optional
 
+import numpy as np
+
 from .._base import BaseHeuristicCheck
 
 from .config import MovementCountConfig
@@ -73,3 +75,57 @@ class MovementCountAnalyzer(BaseHeuristicCheck):
                 self.config.pixel_per_movement: 1,
                 self.config.mouse_movement_count: 1,
             }
+
+    def score_array(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Score movement count features of many sessions at once.
+
+        Args:
+            columns: Feature arrays keyed like the per-session features
+
+        Returns:
+            Dictionary of score arrays keyed like `__call__` output
+        """
+        pixel_count = columns[self.config.pixel_per_movement]
+        movement_count = columns[self.config.mouse_movement_count]
+        mouse_angle_std = columns[self.config.mouse_angle_std]
+        is_too_low = (
+            (pixel_count < self.config.min_pixel_count_too_low)
+            | (movement_count < self.config.min_movement_count_too_low)
+            | (mouse_angle_std < self.config.min_total_angle_std_too_low)
+        )
+
+        score_pixel = self.scoring_function_array(
+            values=pixel_count,
+            min_value=self.config.min_pixel_count,
+            max_value=self.config.max_pixel_count,
+            min_score=0.7,
+            max_score=0.7,
+            min_of_min=0.74,
+            max_of_max=1.0674,
+        )
+        score_movement = self.scoring_function_array(
+            values=movement_count,
+            min_value=self.config.min_movement_count,
+            max_value=self.config.max_movement_count,
+            min_score=0.6,
+            max_score=0.9,
+            min_of_min=0.8,
+            max_of_max=1.06,
+        )
+        score_angle_std = self.scoring_function_array(
+            values=mouse_angle_std,
+            min_value=self.config.min_total_angle_std,
+            max_value=self.config.max_total_angle_std,
+            min_score=0.6,
+            max_score=0.9,
+            min_of_min=0.856,
+            max_of_max=1.063,
+        )
+
+        return {
+            self.config.pixel_per_movement: np.where(is_too_low, 1.0, score_pixel),
+            self.config.mouse_movement_count: np.where(
+                is_too_low, 1.0, score_movement
+            ),
+            self.config.mouse_angle_std: np.where(is_too_low, 1.0, score_angle_std),
+        }
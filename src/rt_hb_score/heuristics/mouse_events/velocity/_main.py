@@ -4,6 +4,8 @@ import logging
 
 from typing import Dict, Any, Optional
 
+import numpy as np
+
 from .._base import BaseHeuristicCheck
 from .config import VelocityConfig
 
@@ -60,3 +62,44 @@ class VelocityAnalyzer(BaseHeuristicCheck):
     def __init__(self, config: Optional[VelocityConfig] = None):
         """Initialize velocity analyzer."""
         self.config = config or VelocityConfig()
+
+    def score_array(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Score velocity features of many sessions at once.
+
+        Args:
+            columns: Feature arrays keyed like the per-session features
+
+        Returns:
+            Dictionary of score arrays keyed like `__call__` output
+        """
+        stddev_velocity = columns[self.config.velocity_std]
+        avg_velocity = columns[self.config.velocity_avg]
+
+        stddev_score = np.round(
+            self.scoring_function_array(
+                values=stddev_velocity,
+                min_value=self.config.min_velocity_variation,
+                max_value=self.config.max_velocity_variation,
+                min_score=0.9,
+                max_score=0.9,
+                min_of_min=0.9,
+                max_of_max=1.001,
+            ),
+            5,
+        )
+        avg_score = np.round(
+            self.scoring_function_array(
+                values=avg_velocity,
+                min_value=self.config.min_velocity_avg,
+                max_value=self.config.max_velocity_avg,
+                min_score=0.8,
+                max_score=0.8,
+                min_of_min=0.8988,
+                max_of_max=1.097,
+            ),
+            5,
+        )
+        return {
+            self.config.velocity_std: stddev_score,
+            self.config.velocity_avg: avg_score,
+        }
@@ -1,2 +1,3 @@
 from ._main import Preprocessor
 from .config import PreprocessorConfig
+from .timestamps import decode_timestamps
@@ -1,10 +1,11 @@
 """Main preprocessing module combining flattening and feature engineering."""
 
 import logging
-from typing import Dict, Any, Optional, Union
+from typing import Callable, Dict, Any, Optional, Union
 
 from .json_flattener import JsonDataFlattener
 from .feature_engineer import FeatureEngineer
+from .._instrumentation import Instrumentation
 from .config import PreprocessorConfig
 
 logger = logging.getLogger(__name__)
@@ -13,23 +14,38 @@ logger = logging.getLogger(__name__)
 class Preprocessor:
     """Main preprocessing class that handles data flattening and feature engineering."""
 
-    def __init__(self, config: Optional[PreprocessorConfig] = None):
+    def __init__(
+        self,
+        config: Optional[PreprocessorConfig] = None,
+        gate: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+    ):
         """Initialize the preprocessor with configurations.
 
         Args:
             config: Configuration for preprocessing pipeline
+            gate: Returns the reason a session is already decided from its
+                `FeatureEngineer.gate_features`, or None. Decided sessions skip
+                feature engineering and get only the gate features, with the
+                reason under `gate_reason_field`.
         """
         self.config = config or PreprocessorConfig()
 
         # Initialize sub-processors
         self.flattener = JsonDataFlattener(config=self.config.flattener)
         self.feature_engineer = FeatureEngineer(config=self.config.feature_engineer)
+        self.gate = gate
+        self.instrumentation: Optional[Instrumentation] = None
 
-    def __call__(self, data: Union[str, Dict]) -> Optional[Dict[str, Any]]:
+    def __call__(
+        self, data: Union[str, Dict], keep_alignment: bool = False
+    ) -> Optional[Dict[str, Any]]:
         """Process input data through flattening and feature engineering.
 
         Args:
             data: Input data either as JSON string or dictionary
+            keep_alignment: Keep the `ClickAlignment` of the clicks under
+                `output_click_alignment`, for `HeuristicAnalyzer` to reuse. It
+                is not JSON serializable, so it is dropped by default.
 
         Returns:
             Dictionary containing engineered features or None if processing fails
@@ -40,18 +56,87 @@ class Preprocessor:
 
             if flattened_data is None:
                 logger.error("Failed to flatten input data")
+                if self.instrumentation is not None:
+                    self.instrumentation.early_exit("preprocessing", "flatten_failed")
                 return None
 
-            # Step 2: Engineer features
-            features = self.feature_engineer(flattened_data)
+            return self.process_flattened(flattened_data, keep_alignment)
+
+        except Exception as e:
+            logger.error(f"Error during preprocessing: {str(e)}", exc_info=True)
+            if self.instrumentation is not None:
+                self.instrumentation.early_exit("preprocessing", "error")
+            return None
+
+    def process_flattened(
+        self, flattened_data: Dict[str, Any], keep_alignment: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Engineer features of an already flattened payload.
+
+        Args:
+            flattened_data: `JsonDataFlattener` output, or a `SessionCorpus`
+                session
+            keep_alignment: Keep the `ClickAlignment` of the clicks, see
+                `__call__`
+
+        Returns:
+            Dictionary containing engineered features or None if processing fails
+        """
+        try:
+            # Step 2: Check the gates on cheap features
+            alignment = None
+            if self.gate is not None:
+                gate_features = self.feature_engineer.gate_features(flattened_data)
+                reason = self._gate_reason(gate_features)
+                if reason is not None:
+                    if self.instrumentation is not None:
+                        self.instrumentation.early_exit("preprocessing", reason)
+                    gate_features[
+                        self.config.feature_engineer.gate_reason_field
+                    ] = reason
+                    return self._output(gate_features, flattened_data, keep_alignment)
+                alignment = gate_features[
+                    self.config.feature_engineer.checkbox.output_click_alignment
+                ]
+
+            # Step 3: Engineer features
+            features = self.feature_engineer(flattened_data, alignment=alignment)
 
             if not features:
                 logger.error("Failed to engineer features")
+                if self.instrumentation is not None:
+                    self.instrumentation.early_exit("preprocessing", "no_features")
                 return None
-            features["user_id"] = flattened_data["user_id"]
-            features["project_id"] = flattened_data["project_id"]
-            return features
+            return self._output(features, flattened_data, keep_alignment)
 
         except Exception as e:
             logger.error(f"Error during preprocessing: {str(e)}", exc_info=True)
+            if self.instrumentation is not None:
+                self.instrumentation.early_exit("preprocessing", "error")
+            return None
+
+    def _output(
+        self,
+        features: Dict[str, Any],
+        flattened_data: Dict[str, Any],
+        keep_alignment: bool,
+    ) -> Dict[str, Any]:
+        """Add the session ids to the features, dropping the click alignment."""
+        if not keep_alignment:
+            features.pop(
+                self.config.feature_engineer.checkbox.output_click_alignment, None
+            )
+        features["user_id"] = flattened_data["user_id"]
+        features["project_id"] = flattened_data["project_id"]
+        return features
+
+    def _gate_reason(self, gate_features: Dict[str, Any]) -> Optional[str]:
+        """Return why the gate decides the session, None if it does not or fails."""
+        try:
+            reason = self.gate(gate_features)
+        except Exception as e:
+            logger.warning(f"Error checking gates, engineering features: {str(e)}")
             return None
+        if reason is not None:
+            logger.info(f"Skipping feature engineering: {reason}")
+        return reason
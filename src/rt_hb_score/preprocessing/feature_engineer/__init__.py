@@ -1,3 +1,22 @@
 # -*- coding: utf-8 -*-
 
+from importlib import import_module
+
 from ._main import FeatureEngineer
+from ._trace import EventTrace, PathStatistics, TraceStatistics
+from ._downsample import TraceDownsampler
+
+# Imported on first access, `_frame` pulls in `pandas`
+_LAZY_ATTRIBUTES = {"EventFrameFeatureEngineer": "._frame"}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        _value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+        globals()[name] = _value
+        return _value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
@@ -0,0 +1,426 @@
+"""Bounded-memory downsampling of oversized mouse movement traces."""
+
+import logging
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from ..timestamps import decode_parseable_timestamps
+from ._trace import EventTrace, PathStatistics, TraceStatistics
+from .config import DownsamplingConfig
+
+logger = logging.getLogger(__name__)
+
+
+class _Moments:
+    """Running count, mean and variance, merged chunk by chunk (Chan et al.)."""
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, values: np.ndarray) -> None:
+        count = len(values)
+        if not count:
+            return
+        mean = float(np.mean(values))
+        m2 = float(np.sum((values - mean) ** 2))
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / self.count)) if self.count else float("nan")
+
+
+class _PathAccumulator:
+    """Running `PathStatistics` of one time window."""
+
+    __slots__ = (
+        "size",
+        "angles",
+        "first",
+        "last",
+        "length",
+        "turning_sum",
+        "turning_count",
+    )
+
+    def __init__(self):
+        self.size = 0
+        self.angles = _Moments()
+        self.first = (float("nan"), float("nan"))
+        self.last = (float("nan"), float("nan"))
+        self.length = 0.0
+        self.turning_sum = 0.0
+        self.turning_count = 0
+
+    def freeze(self) -> PathStatistics:
+        return PathStatistics(
+            size=self.size,
+            angle_std=self.angles.std,
+            first=self.first,
+            last=self.last,
+            length=self.length,
+            turning_sum=self.turning_sum,
+            turning_count=self.turning_count,
+        )
+
+
+class _TraceReducer:
+    """Decimates a time-sorted event stream fed in chunks.
+
+    Events are bucketed by time or traveled distance and the first event of
+    every bucket is kept. Buckets start out empty-width, so every event is
+    kept, and double in width whenever more than `max_events` are kept. The
+    event right before each anchor time and the last event are always kept.
+    Statistics of every event, overall and per window, are accumulated on the
+    way.
+    """
+
+    def __init__(
+        self,
+        max_events: int,
+        method: str,
+        anchors: np.ndarray,
+        windows: Optional[np.ndarray] = None,
+    ):
+        self.max_events = max_events
+        self.is_distance = method == "distance"
+        self.anchors = anchors
+        self.windows = windows
+        self.width = 0.0
+        self.is_dropped = False
+
+        self._resolved = 0
+        self._offset = 0
+        self._origin = 0.0
+        self._traveled = 0.0
+        self._key_floor = 0.0
+        self._bucket = -np.inf
+        # Last two events of the stream, for steps and turns across chunks
+        self._tail = (
+            np.empty(0, dtype=np.int64),
+            np.empty(0),
+            np.empty(0),
+            np.empty(0),
+        )
+
+        self._index = np.empty(0, dtype=np.int64)
+        self._x = np.empty(0)
+        self._y = np.empty(0)
+        self._t = np.empty(0)
+        self._key = np.empty(0)
+        self._forced: List[tuple] = []
+
+        self._has_nan = False
+        self._distance = 0.0
+        self._velocities = _Moments()
+        self._angles = _Moments()
+        self._paths = [
+            _PathAccumulator()
+            for _ in range(0 if windows is None else len(windows) - 1)
+        ]
+
+    def is_ordered(self, t: np.ndarray) -> bool:
+        """Whether `t` continues the stream in time order."""
+        tail_t = self._tail[3]
+        if len(tail_t) and not t[0] >= tail_t[-1]:
+            return False
+        return bool(np.all(t[1:] >= t[:-1]))
+
+    def add(self, x: np.ndarray, y: np.ndarray, t: np.ndarray) -> None:
+        """Feed the next time-sorted events of the stream."""
+        if not len(t):
+            return
+
+        index = np.arange(self._offset, self._offset + len(t))
+        if not self._offset:
+            self._origin = t[0]
+        self._offset += len(t)
+        self._has_nan |= bool(
+            np.isnan(x).any() or np.isnan(y).any() or np.isnan(t).any()
+        )
+        angles = np.arctan2(y, x) * 180 / np.pi
+        self._angles.add(angles[~np.isnan(angles)])
+
+        # The chunk preceded by the tail, so steps and turns span chunk bounds
+        n_tail = len(self._tail[0])
+        path_i, path_x, path_y, path_t = (
+            np.concatenate((tail, column))
+            for tail, column in zip(self._tail, (index, x, y, t))
+        )
+        self._tail = (path_i[-2:], path_x[-2:], path_y[-2:], path_t[-2:])
+
+        dx = np.diff(path_x)
+        dy = np.diff(path_y)
+        segments = np.sqrt(dx**2 + dy**2)
+        # Steps ending at a new event
+        steps = segments[max(n_tail - 1, 0) :]
+        dt = np.diff(path_t)[max(n_tail - 1, 0) :]
+        self._velocities.add(
+            np.divide(steps, dt, out=np.zeros_like(steps), where=dt != 0)
+        )
+        self._distance += float(np.sum(steps))
+
+        if self.is_distance:
+            traveled = self._traveled + np.cumsum(np.nan_to_num(steps))
+            self._traveled = traveled[-1] if len(traveled) else self._traveled
+            keys = traveled if len(traveled) == len(t) else np.r_[0.0, traveled]
+        else:
+            keys = t - self._origin
+        # NaN keys would never share a bucket, carry the last valid key instead
+        keys = np.fmax.accumulate(np.concatenate(([self._key_floor], keys)))[1:]
+        self._key_floor = keys[-1]
+
+        if self._paths:
+            self._add_paths(n_tail, path_t, angles, dx, dy, segments, x, y)
+        self._force_anchors(path_i, path_x, path_y, path_t)
+        self._keep(index, x, y, t, keys)
+
+    def _add_paths(
+        self,
+        n_tail: int,
+        path_t: np.ndarray,
+        angles: np.ndarray,
+        dx: np.ndarray,
+        dy: np.ndarray,
+        segments: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+    ) -> None:
+        # Position of every new event in the path, which starts with the tail
+        position = np.arange(n_tail, len(path_t))
+        dot_products = dx[:-1] * dx[1:] + dy[:-1] * dy[1:]
+        norms = segments[:-1] * segments[1:]
+        for accumulator, start, end in zip(
+            self._paths, self.windows[:-1], self.windows[1:]
+        ):
+            in_window = (path_t >= start) & (path_t <= end)
+            is_new = in_window[n_tail:]
+            if not is_new.any():
+                continue
+
+            window_x, window_y = x[is_new], y[is_new]
+            if not accumulator.size:
+                accumulator.first = (float(window_x[0]), float(window_y[0]))
+            accumulator.last = (float(window_x[-1]), float(window_y[-1]))
+            accumulator.size += len(window_x)
+            window_angles = angles[is_new]
+            accumulator.angles.add(window_angles[~np.isnan(window_angles)])
+
+            # Segment `j - 1` ends at event `j`, the turn before it at `j - 1`
+            ends = position[is_new & (position >= 1)]
+            ends = ends[in_window[ends - 1]]
+            accumulator.length += float(np.sum(segments[ends - 1]))
+            turns = ends[ends >= 2]
+            turns = turns[in_window[turns - 2]]
+            has_norm = norms[turns - 2] > 0
+            cos_angles = np.clip(
+                dot_products[turns - 2][has_norm] / norms[turns - 2][has_norm], -1, 1
+            )
+            accumulator.turning_sum += float(np.sum(np.arccos(cos_angles)))
+            accumulator.turning_count += int(np.count_nonzero(has_norm))
+
+    def _force_anchors(
+        self, index: np.ndarray, x: np.ndarray, y: np.ndarray, t: np.ndarray
+    ) -> None:
+        # Anchors up to the last time seen have their preceding event in `t`
+        resolved = np.searchsorted(self.anchors, t[-1], side="right")
+        pending = self.anchors[self._resolved : resolved]
+        self._resolved = resolved
+        if not len(pending):
+            return
+
+        preceding = np.searchsorted(t, pending, side="left") - 1
+        preceding = np.unique(preceding[preceding >= 0])
+        self._forced.append(
+            (index[preceding], x[preceding], y[preceding], t[preceding])
+        )
+
+    def _keep(
+        self,
+        index: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+        t: np.ndarray,
+        keys: np.ndarray,
+    ) -> None:
+        if self.width:
+            buckets = np.floor(keys / self.width)
+            is_first = np.diff(buckets, prepend=self._bucket) != 0
+            self.is_dropped |= not is_first.all()
+            if is_first.any():
+                self._bucket = buckets[is_first][-1]
+            index, x, y, t, keys = (
+                column[is_first] for column in (index, x, y, t, keys)
+            )
+
+        self._index = np.concatenate((self._index, index))
+        self._x = np.concatenate((self._x, x))
+        self._y = np.concatenate((self._y, y))
+        self._t = np.concatenate((self._t, t))
+        self._key = np.concatenate((self._key, keys))
+
+        while len(self._key) > self.max_events:
+            self.is_dropped = True
+            span = self._key[-1] - self._key[0]
+            self.width = max(self.width * 2, span / (self.max_events // 2)) or 1e-9
+            buckets = np.floor(self._key / self.width)
+            is_first = np.diff(buckets, prepend=-np.inf) != 0
+            self._bucket = buckets[is_first][-1]
+            self._index, self._x, self._y, self._t, self._key = (
+                column[is_first]
+                for column in (self._index, self._x, self._y, self._t, self._key)
+            )
+
+    def finish(self, n_events: int) -> EventTrace:
+        """Return the kept events, with the statistics if any were dropped."""
+        # The last event is always kept, for the session time
+        self._forced.append(tuple(column[-1:] for column in self._tail))
+        index, first = np.unique(
+            np.concatenate([self._index, *(forced[0] for forced in self._forced)]),
+            return_index=True,
+        )
+        x, y, t = (
+            np.concatenate([kept, *(forced[column] for forced in self._forced)])[first]
+            for column, kept in enumerate((self._x, self._y, self._t), start=1)
+        )
+        if not self.is_dropped:
+            return EventTrace(x, y, t, n_events=n_events)
+
+        statistics = TraceStatistics(
+            size=self._offset,
+            has_nan=self._has_nan,
+            velocity_mean=self._velocities.mean
+            if self._velocities.count
+            else float("nan"),
+            velocity_std=self._velocities.std,
+            angle_std=self._angles.std,
+            distance=self._distance,
+            windows=self.windows,
+            paths=tuple(accumulator.freeze() for accumulator in self._paths),
+        )
+        logger.info(
+            f"Downsampled mouse movements from {statistics.size} to {len(t)} points"
+        )
+        return EventTrace(x, y, t, n_events=n_events, statistics=statistics)
+
+
+class TraceDownsampler:
+    """Caps the number of mouse movements processed point by point.
+
+    Traces of up to `max_events` movements are built as usual. Longer ones are
+    decoded `chunk_size` movements at a time and decimated on the fly, so
+    memory stays bounded by the chunk and the cap rather than the trace length.
+    `time` decimation keeps the first movement of every equal time bucket,
+    `distance` decimation the first of every equal stretch of traveled
+    distance. The first and last movements and the last movement before every
+    anchor event (e.g. mouse downs) are always kept.
+
+    The downsampled trace keeps `n_events` of the source and carries
+    `TraceStatistics` of every movement, overall and within each window
+    between consecutive `windows` bounds (e.g. click times). Features built
+    from them (velocity mean and std, angle std, pixel per movement and the
+    path linearity of each window) are exact up to float rounding, as are the
+    session time and mouse down mismatches, which only need the kept points.
+
+    Movements not in time order are decoded in full and sorted before being
+    decimated, which bounds the cost of the processors but not of decoding.
+    """
+
+    def __init__(self, config: Optional[DownsamplingConfig] = None):
+        """Initialize the downsampler."""
+        self.config = config or DownsamplingConfig()
+
+    def __call__(
+        self,
+        events: Union[List[Dict], EventTrace, None],
+        fields: Optional[Dict[str, str]] = None,
+        anchors: Optional[List[Dict]] = None,
+        windows: Optional[np.ndarray] = None,
+    ) -> EventTrace:
+        """Build the trace of mouse movements, downsampled if too long.
+
+        Args:
+            events: Raw movement dicts, or a prebuilt trace
+            fields: Mapping of `x`, `y` and `timestamp` to the event keys
+            anchors: Events whose preceding movement is always kept
+            windows: Ascending epoch seconds bounding the windows whose path
+                statistics are kept
+
+        Returns:
+            Time-sorted trace, `is_downsampled` if movements were dropped
+        """
+        max_events = self.config.max_events
+        if max_events is None or len(events or []) <= max_events:
+            return EventTrace.from_events(events, fields)
+
+        reducer = _TraceReducer(
+            max_events,
+            self.config.method,
+            anchors=np.sort(EventTrace.from_events(anchors).t),
+            windows=windows,
+        )
+        if isinstance(events, EventTrace):
+            return self._reduce_trace(events, reducer)
+
+        fields = fields or {"x": "x", "y": "y", "timestamp": "timestamp"}
+        chunk_size = self.config.chunk_size
+        for start in range(0, len(events), chunk_size):
+            chunk = [e for e in events[start : start + chunk_size] if e is not None]
+            if not chunk:
+                continue
+
+            t, is_parsed = decode_parseable_timestamps(
+                [e.get(fields["timestamp"]) for e in chunk]
+            )
+            if not is_parsed.all():
+                chunk = [e for e, ok in zip(chunk, is_parsed) if ok]
+                if not chunk:
+                    continue
+            if not reducer.is_ordered(t):
+                logger.warning(
+                    "Mouse movements are not in time order, sorting before downsampling"
+                )
+                reducer = _TraceReducer(
+                    max_events, self.config.method, reducer.anchors, windows
+                )
+                return self._reduce_trace(
+                    EventTrace.from_events(events, fields), reducer
+                )
+
+            reducer.add(
+                np.fromiter(
+                    (e.get(fields["x"]) for e in chunk),
+                    dtype=np.float64,
+                    count=len(chunk),
+                ),
+                np.fromiter(
+                    (e.get(fields["y"]) for e in chunk),
+                    dtype=np.float64,
+                    count=len(chunk),
+                ),
+                t,
+            )
+        return reducer.finish(n_events=len(events))
+
+    def _reduce_trace(self, trace: EventTrace, reducer: _TraceReducer) -> EventTrace:
+        """Downsample a prebuilt trace."""
+        if trace.is_downsampled or len(trace) <= reducer.max_events:
+            return trace
+
+        chunk_size = self.config.chunk_size
+        for start in range(0, len(trace), chunk_size):
+            end = start + chunk_size
+            reducer.add(trace.x[start:end], trace.y[start:end], trace.t[start:end])
+        return reducer.finish(n_events=trace.n_events)
+
+
+__all__ = ["TraceDownsampler"]
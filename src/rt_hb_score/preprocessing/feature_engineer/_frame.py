@@ -0,0 +1,487 @@
+"""Batch feature engineering over a long-format event table of many sessions."""
+
+import logging
+from math import pi
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..targets import TargetIndex
+from ..timestamps import decode_timestamps
+from ._trace import EventTrace
+from .config import FeatureEngineerConfig
+
+logger = logging.getLogger(__name__)
+
+
+def _search_by_session(
+    codes: np.ndarray,
+    t: np.ndarray,
+    query_codes: np.ndarray,
+    query_t: np.ndarray,
+    side: str = "left",
+) -> np.ndarray:
+    """`np.searchsorted` of many `(session, time)` queries at once.
+
+    Events must be sorted by session code, then time. Returns global event
+    indices, so a query lands inside the block of events of its own session.
+    """
+    # Complex numbers compare by real part (session), then imaginary part (time)
+    keys = np.empty(len(t), dtype=np.complex128)
+    keys.real = codes
+    # Unknown times sort last within their session, like in `np.argsort`
+    keys.imag = np.where(np.isnan(t), np.inf, t)
+
+    queries = np.empty(len(query_t), dtype=np.complex128)
+    queries.real = query_codes
+    queries.imag = query_t
+    return np.searchsorted(keys, queries, side=side)
+
+
+class EventFrameFeatureEngineer:
+    """Computes per-session features from a long-format event table.
+
+    The table has one row per event with session, kind, x, y and timestamp
+    columns (see `EventFrameConfig`); event kinds are the payload field names,
+    e.g. `mouse_movements`, `mouse_clicks` and `mouse_mouseDowns`. All sessions
+    are processed together in vectorized and `groupby` passes instead of one
+    `FeatureEngineer` call per session.
+    """
+
+    def __init__(self, config: Optional[FeatureEngineerConfig] = None):
+        """Initialize the batch feature engineer.
+
+        Args:
+            config: Configuration for feature engineering. If None, uses defaults.
+        """
+        self.config = config or FeatureEngineerConfig()
+
+    def __call__(self, events: pd.DataFrame) -> pd.DataFrame:
+        """Engineer features of every session in the event table.
+
+        Features match the `FeatureEngineer` output of each session's payload,
+        up to floating point summation order. Sessions without clicks get
+        `is_valid` False and an empty `between_path`.
+
+        Args:
+            events: Long-format event table
+
+        Returns:
+            DataFrame of features with one row per session, indexed by session
+        """
+        frame_config = self.config.frame
+        movement_config = self.config.mouse_movement
+
+        codes, sessions = pd.factorize(events[frame_config.session_field], sort=True)
+        session_count = len(sessions)
+        kinds = events[frame_config.kind_field].to_numpy()
+        x = events[frame_config.x_field].to_numpy(dtype=np.float64)
+        y = events[frame_config.y_field].to_numpy(dtype=np.float64)
+        t = self._decode_times(events[frame_config.t_field])
+
+        is_movement = kinds == movement_config.input_field
+        order = np.lexsort((t[is_movement], codes[is_movement]))
+        movements = {
+            "code": codes[is_movement][order],
+            "x": x[is_movement][order],
+            "y": y[is_movement][order],
+            "t": t[is_movement][order],
+        }
+        counts = np.bincount(movements["code"], minlength=session_count)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+        is_click = kinds == movement_config.click_field
+        click_counts = np.bincount(codes[is_click], minlength=session_count)
+
+        features = pd.DataFrame(
+            index=pd.Index(sessions, name=frame_config.session_field)
+        )
+        for key, column in self._movement_features(
+            movements, counts, starts, click_counts
+        ).items():
+            features[key] = column
+
+        is_down = kinds == self.config.mouse_down_up.down_field
+        for key, column in self._mouse_down_features(
+            movements,
+            starts,
+            codes[is_down],
+            x[is_down],
+            y[is_down],
+            t[is_down],
+            session_count,
+        ).items():
+            features[key] = column
+
+        for key, column in self._checkbox_features(
+            movements, starts, codes[is_click], x[is_click], y[is_click], t[is_click],
+            session_count,
+        ).items():
+            features[key] = column
+
+        last = np.maximum(starts + counts - 1, 0)
+        session_time = (
+            movements["t"][last] - movements["t"][starts] if len(movements["t"]) else 0
+        )
+        features[self.config.session.output_filed] = np.where(
+            counts > 0, np.round(session_time, 6), 0
+        )
+
+        click_field = movement_config.click_field
+        click_lists: List[List[Dict[str, Any]]] = [[] for _ in range(session_count)]
+        click_timestamps = events[frame_config.t_field].to_numpy()[is_click]
+        for code, click_x, click_y, timestamp in zip(
+            codes[is_click], x[is_click], y[is_click], click_timestamps
+        ):
+            click_lists[code].append({"x": click_x, "y": click_y, "timestamp": timestamp})
+        features[click_field] = click_lists
+        return features
+
+    def frame_from_payloads(
+        self,
+        data_list: Iterable[Dict[str, List[Dict]]],
+        session_ids: Optional[Iterable[Any]] = None,
+    ) -> pd.DataFrame:
+        """Build the long-format event table from flattened session payloads.
+
+        Args:
+            data_list: Flattened payloads, as given to `FeatureEngineer`
+            session_ids: Session id of each payload. Defaults to its position.
+
+        Returns:
+            Long-format event table
+        """
+        frame_config = self.config.frame
+        fields = self.config.mouse_movement.fields
+        kinds = (
+            self.config.mouse_movement.input_field,
+            self.config.mouse_movement.click_field,
+            self.config.mouse_down_up.down_field,
+        )
+
+        data_list = list(data_list)
+        session_ids = (
+            range(len(data_list)) if session_ids is None else list(session_ids)
+        )
+        rows = []
+        for session_id, data in zip(session_ids, data_list):
+            for kind in kinds:
+                events = data.get(kind) or []
+                if isinstance(events, EventTrace):
+                    rows.extend(
+                        (session_id, kind, x, y, t)
+                        for x, y, t in zip(events.x, events.y, events.t)
+                    )
+                    continue
+
+                rows.extend(
+                    (
+                        session_id,
+                        kind,
+                        event.get(fields["x"]),
+                        event.get(fields["y"]),
+                        event.get(fields["timestamp"]),
+                    )
+                    for event in events
+                    if event is not None
+                )
+        return pd.DataFrame(
+            rows,
+            columns=[
+                frame_config.session_field,
+                frame_config.kind_field,
+                frame_config.x_field,
+                frame_config.y_field,
+                frame_config.t_field,
+            ],
+        )
+
+    def _decode_times(self, column: pd.Series) -> np.ndarray:
+        """Convert a timestamp column into float64 epoch seconds."""
+        if isinstance(column.dtype, pd.DatetimeTZDtype):
+            column = column.dt.tz_convert("UTC").dt.tz_localize(None)
+        if pd.api.types.is_datetime64_dtype(column.dtype):
+            return column.to_numpy(dtype="datetime64[us]").astype(np.int64) / 1e6
+        if pd.api.types.is_numeric_dtype(column.dtype):
+            return decode_timestamps(column.to_numpy(dtype=np.float64))
+        return decode_timestamps(column.tolist())
+
+    def _movement_features(
+        self,
+        movements: Dict[str, np.ndarray],
+        counts: np.ndarray,
+        starts: np.ndarray,
+        click_counts: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        """Velocity, distance, count and angle features of all sessions."""
+        movement_config = self.config.mouse_movement
+        code, x, y, t = movements["code"], movements["x"], movements["y"], movements["t"]
+
+        is_first = np.ones(len(code), dtype=bool)
+        is_first[1:] = code[1:] != code[:-1]
+        dx = np.where(is_first, np.nan, np.diff(x, prepend=np.nan))
+        dy = np.where(is_first, np.nan, np.diff(y, prepend=np.nan))
+        dt = np.where(is_first, np.nan, np.diff(t, prepend=np.nan))
+        distances = np.sqrt(dx**2 + dy**2)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            velocities = np.where(dt != 0, distances / dt, 0.0)
+        velocities[is_first] = np.nan
+
+        per_movement = pd.DataFrame(
+            {
+                "code": code,
+                "velocity": velocities,
+                "distance": np.where(is_first, 0.0, distances),
+                "angle": np.arctan2(y, x) * 180 / np.pi,
+            }
+        )
+        by_session = per_movement.groupby("code", sort=True)
+        grouped = pd.DataFrame(
+            {
+                "velocity_std": by_session["velocity"].std(ddof=0),
+                "velocity_avg": by_session["velocity"].mean(),
+                "distance": by_session["distance"].sum(),
+                "angle_std": by_session["angle"].std(ddof=0),
+            }
+        ).reindex(range(len(counts)))
+
+        has_nan_xy = np.zeros(len(counts), dtype=bool)
+        np.logical_or.at(has_nan_xy, code, np.isnan(x) | np.isnan(y))
+        has_nan_t = np.zeros(len(counts), dtype=bool)
+        np.logical_or.at(has_nan_t, code, np.isnan(t))
+
+        has_angles = counts >= movement_config.min_movements_required
+        has_velocities = has_angles & ~has_nan_xy & ~has_nan_t
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pixel_per_movement = np.where(
+                has_nan_xy, np.nan, grouped["distance"].to_numpy() / counts
+            )
+
+        return {
+            movement_config.velocity_std: np.where(
+                has_velocities, grouped["velocity_std"].to_numpy(), 0
+            ),
+            movement_config.velocity_avg: np.where(
+                has_velocities, grouped["velocity_avg"].to_numpy(), 0
+            ),
+            movement_config.pixel_per_movement: np.where(
+                (counts == 0) | (click_counts >= counts), 0, pixel_per_movement
+            ),
+            movement_config.movement_cont: counts,
+            movement_config.mouse_angle_std: np.where(
+                has_angles, grouped["angle_std"].to_numpy(), 0
+            ),
+        }
+
+    def _mouse_down_features(
+        self,
+        movements: Dict[str, np.ndarray],
+        starts: np.ndarray,
+        down_codes: np.ndarray,
+        down_x: np.ndarray,
+        down_y: np.ndarray,
+        down_t: np.ndarray,
+        session_count: int,
+    ) -> Dict[str, Any]:
+        """Check every mouse down against the last movement before it."""
+        down_config = self.config.mouse_down_up
+        order = np.lexsort((down_t, down_codes))
+        down_codes, down_x, down_y, down_t = (
+            down_codes[order],
+            down_x[order],
+            down_y[order],
+            down_t[order],
+        )
+
+        preceding = (
+            _search_by_session(
+                movements["code"], movements["t"], down_codes, down_t, side="left"
+            )
+            - 1
+        )
+        has_preceding = preceding >= starts[down_codes]
+        preceding = np.maximum(preceding, 0)
+        if len(movements["t"]):
+            tolerance = down_config.within_tolerance
+            is_within = (
+                (np.abs(movements["x"][preceding] - down_x) <= tolerance)
+                & (np.abs(movements["y"][preceding] - down_y) <= tolerance)
+            )
+        else:
+            is_within = np.zeros(len(down_t), dtype=bool)
+        mismatches = ~(has_preceding & is_within)
+
+        down_counts = np.bincount(down_codes, minlength=session_count)
+        mismatch_counts = np.bincount(
+            down_codes, weights=mismatches, minlength=session_count
+        )
+        return {
+            down_config.output_field: np.where(
+                (down_counts == 0) | (mismatch_counts > 0), 1.0, 0.0
+            ),
+            down_config.mismatch_field: [
+                session_mismatches.tolist()
+                for session_mismatches in np.split(
+                    mismatches, np.cumsum(down_counts)[:-1]
+                )
+            ],
+        }
+
+    def _checkbox_features(
+        self,
+        movements: Dict[str, np.ndarray],
+        starts: np.ndarray,
+        click_codes: np.ndarray,
+        click_x: np.ndarray,
+        click_y: np.ndarray,
+        click_t: np.ndarray,
+        session_count: int,
+    ) -> Dict[str, Any]:
+        """Path linearity between the clicks on each target of all sessions."""
+        checkbox_config = self.config.checkbox
+        targets = TargetIndex.from_config(checkbox_config)
+        target_count = len(targets)
+        is_valid = np.zeros(session_count, dtype=bool)
+        between_path: List[List[Dict[str, float]]] = [[] for _ in range(session_count)]
+        if target_count < 2 or target_count < len(checkbox_config.actions):
+            return {
+                checkbox_config.output_validation: is_valid,
+                checkbox_config.output_main: between_path,
+            }
+
+        # First click on each target, in time order
+        order = np.lexsort((click_t, click_codes))
+        click_codes, click_x, click_y, click_t = (
+            click_codes[order],
+            click_x[order],
+            click_y[order],
+            click_t[order],
+        )
+        is_on_target = targets.within(click_x, click_y)
+        first_hits = (
+            pd.DataFrame(
+                np.where(is_on_target, np.arange(len(click_t))[:, None], np.nan)
+            )
+            .groupby(click_codes, sort=True)
+            .min()
+            .reindex(range(session_count))
+            .to_numpy()
+        )
+        has_all_targets = ~np.isnan(first_hits).any(axis=1)
+
+        # Windows between consecutive matched click times
+        sessions = np.flatnonzero(has_all_targets)
+        matched_times = np.sort(
+            click_t[first_hits[sessions].astype(np.intp)], axis=1
+        )
+        window_codes = np.repeat(sessions, target_count - 1)
+        window_starts = matched_times[:, :-1].ravel()
+        window_ends = matched_times[:, 1:].ravel()
+        lo = _search_by_session(
+            movements["code"], movements["t"], window_codes, window_starts, "left"
+        )
+        hi = _search_by_session(
+            movements["code"], movements["t"], window_codes, window_ends, "right"
+        )
+        linearity, has_error = self._window_linearity(movements, lo, hi)
+
+        # A failing window drops the checkbox features of its whole session
+        session_errors = np.zeros(session_count, dtype=bool)
+        np.logical_or.at(session_errors, window_codes, has_error)
+        is_valid[sessions] = True
+        is_valid &= ~session_errors
+
+        keys = (
+            checkbox_config.output_angle_std,
+            checkbox_config.output_straightness,
+            checkbox_config.output_angular_consistency,
+        )
+        for code, values in zip(window_codes, linearity.tolist()):
+            if is_valid[code]:
+                between_path[code].append(dict(zip(keys, values)))
+        return {
+            checkbox_config.output_validation: is_valid,
+            checkbox_config.output_main: between_path,
+        }
+
+    def _window_linearity(
+        self, movements: Dict[str, np.ndarray], lo: np.ndarray, hi: np.ndarray
+    ):
+        """Angle std, straightness and angular consistency of many windows.
+
+        Returns:
+            Tuple of a `(windows, 3)` array and a mask of windows whose path has
+            no pair of consecutive non-zero segments.
+        """
+        window_count = len(lo)
+        lengths = np.maximum(hi - lo, 0)
+        linearity = np.ones((window_count, 3))
+        has_error = np.zeros(window_count, dtype=bool)
+
+        # Gather the movements of every window back to back
+        window_ids = np.repeat(np.arange(window_count), lengths)
+        offsets = np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths
+        )
+        indices = np.repeat(lo, lengths) + offsets
+        x = movements["x"][indices]
+        y = movements["y"][indices]
+
+        dx = np.where(offsets >= 1, np.diff(x, prepend=np.nan), np.nan)
+        dy = np.where(offsets >= 1, np.diff(y, prepend=np.nan), np.nan)
+        segment_lengths = np.sqrt(dx * dx + dy * dy)
+        previous_dx = np.concatenate([[np.nan], dx[:-1]])
+        previous_dy = np.concatenate([[np.nan], dy[:-1]])
+        previous_lengths = np.concatenate([[np.nan], segment_lengths[:-1]])
+        norms = np.where(offsets >= 2, segment_lengths * previous_lengths, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cos_angles = np.clip((dx * previous_dx + dy * previous_dy) / norms, -1, 1)
+        turning_angles = np.where(norms > 0, np.arccos(cos_angles), np.nan)
+
+        by_window = pd.DataFrame(
+            {
+                "window": window_ids,
+                "angle": np.arctan2(y, x) * 180 / np.pi,
+                "segment_length": np.where(offsets >= 1, segment_lengths, 0.0),
+                "turning_angle": turning_angles,
+            }
+        ).groupby("window", sort=True)
+        grouped = pd.DataFrame(
+            {
+                "angle_std": by_window["angle"].std(ddof=0),
+                "total_segment_length": by_window["segment_length"].sum(),
+                "turning_angle": by_window["turning_angle"].mean(),
+                "turning_count": by_window["turning_angle"].count(),
+            }
+        ).reindex(range(window_count))
+
+        first = np.minimum(lo, max(len(movements["x"]) - 1, 0))
+        last = np.maximum(hi - 1, 0)
+        if len(movements["x"]):
+            path_length = np.sqrt(
+                (movements["x"][last] - movements["x"][first]) ** 2
+                + (movements["y"][last] - movements["y"][first]) ** 2
+            )
+        else:
+            path_length = np.zeros(window_count)
+
+        # Short or closed paths keep the default (1, 1, 1)
+        is_path = (lengths >= 5) & ~(path_length < 1e-10)
+        has_error = is_path & (grouped["turning_count"].to_numpy() == 0)
+        is_measured = is_path & ~has_error
+
+        total_segment_length = grouped["total_segment_length"].to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            straightness = np.where(
+                total_segment_length > 1e-10, path_length / total_segment_length, 1.0
+            )
+        linearity[is_measured, 0] = grouped["angle_std"].to_numpy()[is_measured]
+        linearity[is_measured, 1] = straightness[is_measured]
+        linearity[is_measured, 2] = (
+            1 - grouped["turning_angle"].to_numpy() / pi
+        )[is_measured]
+        return linearity, has_error
+
+
+__all__ = ["EventFrameFeatureEngineer"]
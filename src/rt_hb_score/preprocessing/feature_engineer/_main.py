@@ -1,13 +1,23 @@
 """Feature engineering module for processing mouse and keyboard events."""
 
 import logging
-from typing import Dict, List, Any, Optional
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
+
+import numpy as np
 
 from .mouse_events import MouseMovementProcessor
 from .mouse_events import MouseDownUpProcessor
 from .keyboard_events import KeyboardEventsProcessor
 from .checkboxes import CheckboxEventProcessor, SessionProcessor
 from .config import FeatureEngineerConfig
+from ._downsample import TraceDownsampler
+from ._trace import EventTrace
+from ..targets import ClickAlignment
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from ._frame import EventFrameFeatureEngineer
 
 logger = logging.getLogger(__name__)
 
@@ -32,20 +42,43 @@ class FeatureEngineer:
         # self.keyboard_processor = KeyboardEventsProcessor(config=self.config.keyboard)
         self.checkbox_processor = CheckboxEventProcessor(config=self.config.checkbox)
         self.session_processor = SessionProcessor(config=self.config.session)
+        self.downsampler = TraceDownsampler(config=self.config.downsampling)
+        self._frame_engineer: Optional["EventFrameFeatureEngineer"] = None
 
-    def __call__(self, data: Dict[str, List[Dict]]) -> Dict[str, Any]:
+    def __call__(
+        self,
+        data: Dict[str, List[Dict]],
+        alignment: Optional[ClickAlignment] = None,
+    ) -> Dict[str, Any]:
         """Process input data and engineer features.
 
         Args:
             data: Dictionary containing mouse and keyboard event data
+            alignment: Prebuilt alignment of the clicks to the targets, e.g.
+                from `gate_features`. Computed from `data` if not given.
 
         Returns:
             Dictionary containing engineered features
         """
         try:
+            if alignment is None:
+                logger.debug("Aligning `clicks` to targets")
+                alignment = self._align_clicks(data)
+            logger.debug("Building `mouse movements` trace")
+            trace = self.downsampler(
+                data.get(self.config.mouse_movement.input_field, []),
+                self.config.mouse_movement.fields,
+                anchors=data.get(self.config.mouse_down_up.down_field, []),
+                windows=(
+                    np.sort(alignment.times)
+                    if alignment is not None and alignment.is_complete
+                    else None
+                ),
+            )
+
             logger.debug("Processing `mouse movements`")
             mouse_movement_results = self.mouse_movement_processor(
-                data.get(self.config.mouse_movement.input_field, []),
+                trace,
                 data.get(self.config.mouse_movement.click_field, []),
             )
             # keyboard_data = {
@@ -55,11 +88,13 @@ class FeatureEngineer:
             # logger.debug("Processing `keyboard` data")
             # # keyboard_results = self.keyboard_processor(keyboard_data)
             logger.debug("Processing `clicks`")
-            checkbox_results = self.checkbox_processor(data)
+            checkbox_results = self.checkbox_processor(
+                data, trace=trace, alignment=alignment
+            )
             logger.debug("Processing `down` features")
-            mouse_down_up_results = self.mouse_down_up_processor(data)
+            mouse_down_up_results = self.mouse_down_up_processor(data, trace=trace)
             logger.debug("Processing `session time`")
-            session_results = self.session_processor(data)
+            session_results = self.session_processor(data, trace=trace)
             return {
                 **mouse_movement_results,
                 **mouse_down_up_results,
@@ -70,8 +105,71 @@ class FeatureEngineer:
                         self.config.mouse_movement.click_field, []
                     )
                 },
+                self.config.checkbox.output_click_alignment: alignment,
+                self.config.downsampling.output_field: trace.is_downsampled,
             }
 
         except Exception as e:
             logger.error(f"Error processing features: {str(e)}", exc_info=True)
             return {}
+
+    def gate_features(self, data: Dict[str, List[Dict]]) -> Dict[str, Any]:
+        """Compute the cheap features read by the heuristic gates.
+
+        Args:
+            data: Dictionary containing mouse event data
+
+        Returns:
+            Clicks, their alignment to the targets and the movement count, under
+            the same keys as in `__call__` output
+        """
+        movements = data.get(self.config.mouse_movement.input_field) or []
+        return {
+            self.config.mouse_movement.click_field: data.get(
+                self.config.mouse_movement.click_field, []
+            ),
+            self.config.checkbox.output_click_alignment: self._align_clicks(data),
+            self.config.mouse_movement.movement_cont: (
+                movements.n_events
+                if isinstance(movements, EventTrace)
+                else len(movements)
+            ),
+        }
+
+    def _align_clicks(self, data: Dict[str, List[Dict]]) -> Optional[ClickAlignment]:
+        """Match the clicks to the targets once, for features and heuristics.
+
+        Args:
+            data: Dictionary containing click data
+
+        Returns:
+            Alignment of the clicks, or None if they cannot be aligned
+        """
+        try:
+            return self.checkbox_processor.targets.align(
+                data.get(self.config.checkbox.input_field, [])
+            )
+        except Exception as e:
+            logger.warning(f"Error aligning click events: {str(e)}")
+            return None
+
+    @property
+    def frame_engineer(self) -> "EventFrameFeatureEngineer":
+        """Long-format engineer, built on first use since it imports `pandas`."""
+        if self._frame_engineer is None:
+            from ._frame import EventFrameFeatureEngineer
+
+            self._frame_engineer = EventFrameFeatureEngineer(config=self.config)
+        return self._frame_engineer
+
+    def process_frame(self, events: "pd.DataFrame") -> "pd.DataFrame":
+        """Engineer features of many sessions from a long-format event table.
+
+        Args:
+            events: Table with one row per event of every session, see
+                `EventFrameFeatureEngineer`
+
+        Returns:
+            DataFrame of features with one row per session
+        """
+        return self.frame_engineer(events)
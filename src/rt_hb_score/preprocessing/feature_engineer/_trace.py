@@ -0,0 +1,220 @@
+"""Columnar, time-sorted event trace shared by feature processors."""
+
+import logging
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from ..timestamps import decode_parseable_timestamps
+
+logger = logging.getLogger(__name__)
+
+
+_DEFAULT_FIELDS = {"x": "x", "y": "y", "timestamp": "timestamp"}
+
+
+class PathStatistics(NamedTuple):
+    """Statistics of the events within one time window of a trace.
+
+    Attributes:
+        size: Number of events in the window.
+        angle_std: Standard deviation of the event angles in degrees, NaN
+            angles excluded.
+        first: Coordinates of the first event.
+        last: Coordinates of the last event.
+        length: Summed length of the segments between consecutive events.
+        turning_sum: Summed turning angle, in radians, between consecutive
+            non-zero segments.
+        turning_count: Number of those turning angles.
+    """
+
+    size: int
+    angle_std: float
+    first: Tuple[float, float]
+    last: Tuple[float, float]
+    length: float
+    turning_sum: float
+    turning_count: int
+
+
+class TraceStatistics(NamedTuple):
+    """Statistics of every event of a trace, kept when it is downsampled.
+
+    Attributes:
+        size: Number of events with a value, like `len` of the full trace.
+        has_nan: Whether a coordinate or timestamp is NaN.
+        velocity_mean: Mean velocity between consecutive events.
+        velocity_std: Standard deviation of those velocities.
+        angle_std: Standard deviation of the event angles in degrees, NaN
+            angles excluded.
+        distance: Traveled distance.
+        windows: Ascending window bounds in epoch seconds, or `None`.
+        paths: Statistics of each `[windows[i], windows[i + 1]]` window, both
+            ends inclusive like `EventTrace.window_bounds`.
+    """
+
+    size: int
+    has_nan: bool
+    velocity_mean: float
+    velocity_std: float
+    angle_std: float
+    distance: float
+    windows: Optional[np.ndarray] = None
+    paths: Tuple[PathStatistics, ...] = ()
+
+
+class EventTrace:
+    """Immutable columnar view of mouse events sorted by time.
+
+    Timestamps are parsed exactly once and events are sorted once (stable), so
+    every processor can share the same contiguous `x`, `y` and `t` arrays
+    instead of re-sorting and re-parsing the raw event dicts.
+
+    Attributes:
+        x: X coordinates as float64 array.
+        y: Y coordinates as float64 array.
+        t: Timestamps as float64 epoch seconds, ascending.
+        n_events: Number of events in the source list, including `None` entries.
+        statistics: Statistics of the full trace if this one is downsampled,
+            else `None`.
+    """
+
+    __slots__ = ("x", "y", "t", "n_events", "statistics")
+
+    def __init__(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        t: np.ndarray,
+        n_events: Optional[int] = None,
+        statistics: Optional[TraceStatistics] = None,
+    ):
+        x = np.ascontiguousarray(x, dtype=np.float64)
+        y = np.ascontiguousarray(y, dtype=np.float64)
+        t = np.ascontiguousarray(t, dtype=np.float64)
+        if not (x.shape == y.shape == t.shape) or x.ndim != 1:
+            raise ValueError("`x`, `y` and `t` must be 1-D arrays of equal length")
+
+        for _column in (x, y, t):
+            _column.flags.writeable = False
+
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+        object.__setattr__(self, "t", t)
+        object.__setattr__(
+            self, "n_events", len(t) if n_events is None else int(n_events)
+        )
+        object.__setattr__(self, "statistics", statistics)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(size={len(self)}, n_events={self.n_events}, "
+            f"is_downsampled={self.is_downsampled})"
+        )
+
+    @property
+    def is_downsampled(self) -> bool:
+        """Whether the trace holds a subset of the source events."""
+        return self.statistics is not None
+
+    @property
+    def size(self) -> int:
+        """Number of events with a value in the source, before downsampling."""
+        return len(self) if self.statistics is None else self.statistics.size
+
+    def window_bounds(
+        self, start: np.ndarray, end: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the index range of events within each `[start, end]` time window.
+
+        Both ends are inclusive. Events of window `i` are `x[lo[i]:hi[i]]` etc.,
+        which are views into the trace; an inverted window gives `lo >= hi`.
+
+        Args:
+            start: Window start times in epoch seconds.
+            end: Window end times in epoch seconds.
+
+        Returns:
+            Tuple of `lo` and `hi` index arrays.
+        """
+        lo = np.searchsorted(self.t, start, side="left")
+        hi = np.searchsorted(self.t, end, side="right")
+        return lo, hi
+
+    @classmethod
+    def from_events(
+        cls,
+        events: Union[List[Dict], "EventTrace", None],
+        fields: Optional[Dict[str, str]] = None,
+    ) -> "EventTrace":
+        """Build a trace from a list of `{x, y, timestamp}` event dicts.
+
+        Args:
+            events: Raw event dicts. `None` entries are skipped but still counted
+                in `n_events`. A trace, e.g. from the typed flattener decoder,
+                is returned as is.
+            fields: Mapping of `x`, `y` and `timestamp` to the event keys.
+
+        Returns:
+            Time-sorted trace of the events.
+        """
+        if isinstance(events, cls):
+            return events
+
+        events = events or []
+        fields = fields or _DEFAULT_FIELDS
+        valid_events = [e for e in events if e is not None]
+
+        return cls.from_columns(
+            [e.get(fields["x"]) for e in valid_events],
+            [e.get(fields["y"]) for e in valid_events],
+            [e.get(fields["timestamp"]) for e in valid_events],
+            n_events=len(events),
+        )
+
+    @classmethod
+    def from_columns(
+        cls,
+        x: Iterable[Any],
+        y: Iterable[Any],
+        timestamps: Iterable[Any],
+        n_events: Optional[int] = None,
+    ) -> "EventTrace":
+        """Build a trace from unsorted coordinate and timestamp columns.
+
+        Args:
+            x: X coordinates.
+            y: Y coordinates.
+            timestamps: Timestamps in any format `decode_timestamps` accepts.
+                Events with an unparsable timestamp are logged and left out,
+                but still counted in `n_events`.
+            n_events: Number of source events. Defaults to the column length.
+
+        Returns:
+            Time-sorted trace of the events.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if n_events is None:
+            n_events = len(x)
+
+        t, is_parsed = decode_parseable_timestamps(timestamps)
+        if not is_parsed.all():
+            x, y = x[is_parsed], y[is_parsed]
+
+        order = np.argsort(t, kind="stable")
+        return cls(x[order], y[order], t[order], n_events=n_events)
+
+    @classmethod
+    def empty(cls) -> "EventTrace":
+        """Return a trace without any events."""
+        return cls(np.empty(0), np.empty(0), np.empty(0))
+
+
+__all__ = ["EventTrace", "PathStatistics", "TraceStatistics"]
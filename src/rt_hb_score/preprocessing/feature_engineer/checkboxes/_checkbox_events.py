@@ -2,10 +2,11 @@
 
 import logging
 from math import pi
-from typing_extensions import Dict, List, Any, Optional, IntVar
+from typing_extensions import Dict, List, Any, Optional
 import numpy as np
-from dateutil.parser import parse
+from ...targets import ClickAlignment, TargetIndex
 from .._base import BaseFeatureEngineer
+from .._trace import EventTrace, PathStatistics
 from .config import CheckboxFeatureConfig
 
 logger = logging.getLogger(__name__)
@@ -17,76 +18,92 @@ class CheckboxEventProcessor(BaseFeatureEngineer):
     def __init__(self, config: Optional[CheckboxFeatureConfig] = None):
         """Initialize the processor."""
         self.config = config or CheckboxFeatureConfig()
+        self.targets = TargetIndex.from_config(self.config)
 
-    def __call__(self, data: Dict[str, List[Dict]]) -> Dict[str, Any]:
+    def __call__(
+        self,
+        data: Dict[str, List[Dict]],
+        trace: Optional[EventTrace] = None,
+        alignment: Optional[ClickAlignment] = None,
+    ) -> Dict[str, Any]:
         """Process checkbox events and extract features.
 
         Args:
             data: Dictionary containing checkbox and mouse movement data
+            trace: Prebuilt mouse movement trace. Built from `data` if not given.
+            alignment: Prebuilt alignment of the clicks to `self.targets`.
+                Computed from `data` if not given.
 
         Returns:
             Dictionary containing extracted features
         """
         try:
             clicks = data.get(self.config.input_field, [])
-            mouse_movements = data.get("mouse_movements", [])
             if not clicks:
                 logger.warning("No click events found")
                 return {}
 
-            return self._process_checkbox_sequence(clicks, mouse_movements)
+            if trace is None:
+                trace = EventTrace.from_events(data.get("mouse_movements", []))
+
+            if alignment is None:
+                alignment = self.targets.align(clicks)
+
+            return self._process_checkbox_sequence(alignment, trace)
 
         except Exception as e:
             logger.warning(f"Error processing click events: {str(e)}")
             return {}
 
     def _calculate_path_linearity(
-        self, path: List[Dict[str, Any]]
-    ) -> tuple[float, float]:
-        # Need at least 5 points for the new calculation method
-        if len(path) < 5:
-            return 1.0, 1.0, 1.0
+        self, x: np.ndarray, y: np.ndarray
+    ) -> tuple[float, float, float]:
+        """Compute angle std, straightness and angular consistency of a path.
 
-        points = np.array([[p["x"], p["y"]] for p in path])
-        _x_points = points[:, 0]
-        _y_points = points[:, 1]
-
-        angles = np.arctan2(_y_points, _x_points) * 180 / np.pi
+        Args:
+            x: X coordinates of the path, ordered by time
+            y: Y coordinates of the path, ordered by time
 
-        angles_1 = []
-        for i in range(len(points) - 2):
-            p1, p2, p3 = points[i : i + 3]
+        Returns:
+            Tuple of angle std (degrees), straightness and angular consistency
 
-            # Vectors between points
-            v1 = p2 - p1
-            v2 = p3 - p2
+        Raises:
+            ValueError: If no pair of consecutive segments has non-zero length.
+        """
+        # Need at least 5 points for the new calculation method
+        if len(x) < 5:
+            return 1.0, 1.0, 1.0
 
-            # Calculate angle between vectors
-            dot_product = np.dot(v1, v2)
-            norms = np.linalg.norm(v1) * np.linalg.norm(v2)
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
 
-            if norms > 0:
-                cos_angle = dot_product / norms
-                # Ensure cos_ancgle is within [-1, 1] to avoid numerical errors
-                cos_angle = min(1, max(-1, cos_angle))
-                angle = np.arccos(cos_angle)
-                angles_1.append(abs(angle))
+        angles = np.arctan2(y, x) * 180 / np.pi
 
-        if angles_1:
-            angle_consistency = 1 - (np.mean(angles_1) / np.pi)
+        # Turning angle between each pair of consecutive segments
+        dx = np.diff(x)
+        dy = np.diff(y)
+        segment_lengths = np.sqrt(dx * dx + dy * dy)
+        dot_products = dx[:-1] * dx[1:] + dy[:-1] * dy[1:]
+        norms = segment_lengths[:-1] * segment_lengths[1:]
 
-        start_point = points[0]
-        end_point = points[-1]
-        path_vector = end_point - start_point
-        path_length = np.linalg.norm(path_vector)
+        path_dx = x[-1] - x[0]
+        path_dy = y[-1] - y[0]
+        path_length = np.sqrt(path_dx * path_dx + path_dy * path_dy)
         if path_length < 1e-10:
             return 1, 1, 1
 
+        # Pairs with a zero-length segment have no defined turning angle
+        has_norm = norms > 0
+        if not has_norm.any():
+            raise ValueError("Path has no consecutive non-zero segments")
+
+        # Ensure cos_angle is within [-1, 1] to avoid numerical errors
+        cos_angles = np.clip(dot_products[has_norm] / norms[has_norm], -1, 1)
+        angle_consistency = 1 - (np.mean(np.arccos(cos_angles)) / np.pi)
+
         angle_std = np.nanstd(angles)
         # Calculate straightness with safety check
-        total_segment_length = sum(
-            np.linalg.norm(points[i + 1] - points[i]) for i in range(len(points) - 1)
-        )
+        total_segment_length = np.sum(segment_lengths)
 
         if total_segment_length > 1e-10:
             straightness = path_length / total_segment_length
@@ -95,42 +112,80 @@ class CheckboxEventProcessor(BaseFeatureEngineer):
 
         return angle_std, straightness, angle_consistency
 
+    def _summarize_path_linearity(
+        self, path: PathStatistics
+    ) -> tuple[float, float, float]:
+        """Compute `_calculate_path_linearity` of a path from its statistics.
+
+        Args:
+            path: Statistics of every point of the path
+
+        Returns:
+            Tuple of angle std (degrees), straightness and angular consistency
+
+        Raises:
+            ValueError: If no pair of consecutive segments has non-zero length.
+        """
+        if path.size < 5:
+            return 1.0, 1.0, 1.0
+
+        path_dx = path.last[0] - path.first[0]
+        path_dy = path.last[1] - path.first[1]
+        path_length = np.sqrt(path_dx * path_dx + path_dy * path_dy)
+        if path_length < 1e-10:
+            return 1, 1, 1
+
+        if not path.turning_count:
+            raise ValueError("Path has no consecutive non-zero segments")
+
+        angle_consistency = 1 - (path.turning_sum / path.turning_count) / np.pi
+        if path.length > 1e-10:
+            straightness = path_length / path.length
+        else:
+            straightness = 1.0
+
+        return path.angle_std, straightness, angle_consistency
+
     def _process_checkbox_sequence(
-        self, clicks: List[Dict], mouse_movements: List[Dict]
+        self, alignment: ClickAlignment, trace: EventTrace
     ) -> Dict[str, Any]:
         """Process sequence of checkbox interactions.
         Args:
-            checkboxes: List of checkbox interactions
-            mouse_movements: List of mouse movements
+            alignment: Alignment of the checkbox clicks to the targets
+            trace: Time-sorted mouse movement trace
 
         Returns:
             Dictionary of extracted features
         """
         features = {self.config.output_validation: False, self.config.output_main: []}
-        _timestamps = self._get_timestamps(clicks)
-        if _timestamps == 0:
+        if not alignment.is_complete:
             return features
 
-        sorted_timestamps = sorted(_timestamps)
-        if len(sorted_timestamps) < len(self.config.actions):
+        if len(alignment) < len(self.config.actions):
             return features
 
-        for i in range(len(sorted_timestamps) - 1):
+        click_times = np.sort(alignment.times)
+        window_starts, window_ends = trace.window_bounds(
+            click_times[:-1], click_times[1:]
+        )
+        # Downsampled traces carry the statistics of every point per window
+        statistics = trace.statistics
+        paths = (
+            statistics.paths
+            if statistics is not None
+            and statistics.windows is not None
+            and np.array_equal(statistics.windows, click_times)
+            else None
+        )
+        for index, (start, end) in enumerate(zip(window_starts, window_ends)):
             clicks_data = {}
-            current = sorted_timestamps[i]
-            next_cb = sorted_timestamps[i + 1]
-            t1 = parse(current)
-            t2 = parse(next_cb)
-
-            movements_between = [
-                m for m in mouse_movements if t1 <= parse(m["timestamp"]) <= t2
-            ]
-            if movements_between:
-                sorted_movements = sorted(
-                    movements_between, key=lambda x: parse(x["timestamp"])
+            if paths is not None:
+                angle_std, straightness, angular_consistency = (
+                    self._summarize_path_linearity(paths[index])
                 )
+            elif end > start:
                 angle_std, straightness,angular_consistency = self._calculate_path_linearity(
-                    sorted_movements
+                    trace.x[start:end], trace.y[start:end]
                 )
             else:
                 angle_std, straightness,angular_consistency = (
@@ -149,36 +204,3 @@ class CheckboxEventProcessor(BaseFeatureEngineer):
             features[self.config.output_main].append(clicks_data)
             features[self.config.output_validation] = True
         return features
-
-    def _get_timestamps(self, clicks: List[Dict]) -> List[str]:
-        """Extract timestamps from list of checkbox interactions."""
-        sorted_user_clicks = sorted(clicks, key=lambda x: x["timestamp"])
-        given_clicks = [
-            location["args"]["location"]
-            for location in self.config.actions
-            if location.get("type") == self.config.type
-        ]
-        within_clicks = []
-        for click in given_clicks:
-            matched_click = next(
-                (
-                    user_click
-                    for user_click in sorted_user_clicks
-                    if self._is_within(user_click, click, self.config.tolerance)
-                ),
-                None,
-            )
-            if matched_click:
-                within_clicks.append(matched_click)
-        if len(within_clicks) != len(given_clicks):
-            return 0
-        return [click["timestamp"] for click in within_clicks]
-
-    def _is_within(
-        self, user_click: Dict[str, Any], click: Dict[str, Any], tolerance: IntVar = 2
-    ) -> bool:
-        truth_value = (
-            abs(user_click["x"] - click["x"]) <= tolerance
-            and abs(user_click["y"] - click["y"]) <= tolerance
-        )
-        return truth_value
@@ -13,6 +13,10 @@ class CheckboxFeatureConfig(BaseModel):
     output_straightness: str = Field(default="straightness")
     output_angular_consistency:str = Field(default="angular_consistency")
     output_main: str = Field(default="between_path")
+    output_click_alignment: str = Field(
+        default="click_alignment",
+        description="Feature holding the `ClickAlignment` of the clicks to the targets",
+    )
 
     type: str = Field(default="click", description="Type of event")
     argument_key: str = Field(default="args", description="Key for arguments")
@@ -2,10 +2,10 @@
 
 import logging
 from typing import Dict, List, Optional
-from dateutil.parser import parse
 
 
 from .._base import BaseFeatureEngineer
+from .._trace import EventTrace
 from .config import SessionConfig
 
 logger = logging.getLogger(__name__)
@@ -18,30 +18,29 @@ class SessionProcessor(BaseFeatureEngineer):
         """Initialize the processor."""
         self.config = config or SessionConfig()
 
-    def __call__(self, data: Dict[str, List[Dict]]) -> Dict[str, float]:
+    def __call__(
+        self, data: Dict[str, List[Dict]], trace: Optional[EventTrace] = None
+    ) -> Dict[str, float]:
         """Process session events and extract features.
 
         Args:
             data: Dictionary containing mouse movement data
+            trace: Prebuilt mouse movement trace. Built from `data` if not given.
 
         Returns:
             Dictionary containing extracted features
         """
         try:
-            mouse_events = data.get(self.config.input_field, [])
+            if trace is None:
+                trace = EventTrace.from_events(data.get(self.config.input_field, []))
 
-            if not mouse_events:
+            if not trace.n_events:
                 return {
                     self.config.output_filed: 0
                 }  # Return 0 if no session events are found
 
-            sorted_mouse_events = sorted(
-                mouse_events, key=lambda x: parse(x["timestamp"])
-            )
-            session_time = (
-                parse(sorted_mouse_events[-1]["timestamp"])
-                - parse(sorted_mouse_events[0]["timestamp"])
-            ).total_seconds()
+            # Browser timestamps carry at most microsecond resolution
+            session_time = round(float(trace.t[-1] - trace.t[0]), 6)
             return {self.config.output_filed: session_time}
         except Exception as e:
             logger.warning(
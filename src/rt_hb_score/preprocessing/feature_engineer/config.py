@@ -1,5 +1,7 @@
 """Configuration for feature engineering module."""
 
+from typing import Literal, Optional
+
 from pydantic import BaseModel, Field
 
 from .keyboard_events import KeyboardConfig
@@ -7,6 +9,61 @@ from .mouse_events import MouseDownUpConfig, MouseMovementProcessingConfig
 from .checkboxes import CheckboxFeatureConfig,SessionConfig
 
 
+class EventFrameConfig(BaseModel):
+    """Column names of the long-format event table used in batch mode."""
+
+    session_field: str = Field(default="session_id", description="Session column")
+    kind_field: str = Field(
+        default="kind",
+        description="Event kind column, holding the payload field names of the events",
+    )
+    x_field: str = Field(default="x", description="X coordinate column")
+    y_field: str = Field(default="y", description="Y coordinate column")
+    t_field: str = Field(
+        default="t", description="Timestamp column, epoch or ISO-8601 timestamps"
+    )
+
+    class Config:
+        """Pydantic configuration."""
+
+        frozen = True
+
+
+class DownsamplingConfig(BaseModel):
+    """Size cap of mouse movement traces, see `TraceDownsampler`."""
+
+    max_events: Optional[int] = Field(
+        default=50_000,
+        ge=16,
+        description=(
+            "Largest number of mouse movements processed point by point. Longer "
+            "traces are decimated to at most this many points; `None` disables "
+            "downsampling"
+        ),
+    )
+    method: Literal["time", "distance"] = Field(
+        default="time",
+        description=(
+            "`time` keeps the first movement of every equal time bucket, "
+            "`distance` the first of every equal stretch of traveled distance"
+        ),
+    )
+    chunk_size: int = Field(
+        default=65_536,
+        gt=0,
+        description="Movements decoded at once while downsampling",
+    )
+    output_field: str = Field(
+        default="is_downsampled",
+        description="Feature flagging sessions whose trace was downsampled",
+    )
+
+    class Config:
+        """Pydantic configuration."""
+
+        frozen = True
+
+
 class FeatureEngineerConfig(BaseModel):
     """Main configuration for feature engineering."""
 
@@ -30,6 +87,18 @@ class FeatureEngineerConfig(BaseModel):
         default_factory=SessionConfig,
         description="Session events processing configuration",
     )
+    frame: EventFrameConfig = Field(
+        default_factory=EventFrameConfig,
+        description="Long-format event table configuration for batch mode",
+    )
+    downsampling: DownsamplingConfig = Field(
+        default_factory=DownsamplingConfig,
+        description="Size cap of mouse movement traces",
+    )
+    gate_reason_field: str = Field(
+        default="gate_reason",
+        description="Reason a gated session was decided, set on its gate features",
+    )
 
     class Config:
         """ Pydantic configuration."""
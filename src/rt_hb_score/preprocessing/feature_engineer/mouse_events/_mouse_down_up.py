@@ -3,9 +3,10 @@
 import logging
 from typing import Dict, List, Any, Optional
 
-from dateutil.parser import parse
-import bisect
+import numpy as np
+
 from .._base import BaseFeatureEngineer
+from .._trace import EventTrace
 from .config import MouseDownUpConfig
 
 logger = logging.getLogger(__name__)
@@ -16,64 +17,75 @@ class MouseDownUpProcessor(BaseFeatureEngineer):
 
         self.config = config or MouseDownUpConfig()
 
-    def __call__(self, mouse_data: Dict[str, List[Dict]]) -> Dict[str, Any]:
+    def __call__(
+        self, mouse_data: Dict[str, List[Dict]], trace: Optional[EventTrace] = None
+    ) -> Dict[str, Any]:
         try:
-            mouse_downs = mouse_data.get(self.config.down_field, [])
-            mouse_movement_ = mouse_data.get(self.config.mouse_movements, [])
-            sorted_mouse_downs = sorted(
-                mouse_downs,
-                key=lambda x: parse(x["timestamp"]),
-            )
-            sorted_mouse_movements = sorted(
-                mouse_movement_,
-                key=lambda x: parse(x["timestamp"]),
-            )
-            mouse_down_timestamps = [
-                parse(x["timestamp"])
-                for x in sorted_mouse_downs
-            ]
-            mouse_movement_timestamps = [
-                parse(x["timestamp"])
-                for x in sorted_mouse_movements
-            ]
-            results = self.find_first_gte_multiple(
-                sorted_mouse_downs,
-                mouse_down_timestamps,
-                sorted_mouse_movements,
-                mouse_movement_timestamps,
+            down_trace = EventTrace.from_events(
+                mouse_data.get(self.config.down_field, [])
             )
+            if trace is None:
+                trace = EventTrace.from_events(
+                    mouse_data.get(self.config.mouse_movements, [])
+                )
+
+            if not len(down_trace):
+                logger.warning("No mouse down events found")
+                return {
+                    self.config.output_field: 1,
+                    self.config.mismatch_field: [],
+                }
+
+            mismatches = self.find_mismatches(down_trace, trace)
+            results = float(np.mean(mismatches))
             if results > 0:
                 results = 1
-            return {self.config.output_field: results}
+            return {
+                self.config.output_field: results,
+                self.config.mismatch_field: mismatches.tolist(),
+            }
 
         except Exception as e:
             logger.error(
                 f"Error processing pixel per movement events \n{self.config.output_field.upper()} NaN: {str(e)}"
             )
-            return {self.config.output_field: 1}
+            return {
+                self.config.output_field: 1,
+                self.config.mismatch_field: [],
+            }
 
-    def is_within_range(self, mouse_down, mouse_event, tolerance=2):
+    def is_within_range(self, down_x, down_y, event_x, event_y, tolerance=2):
         return (
-            mouse_down["x"] - tolerance
-            <= mouse_event["x"]
-            <= mouse_down["x"] + tolerance
-            and mouse_down["y"] - tolerance
-            <= mouse_event["y"]
-            <= mouse_down["y"] + tolerance
+            (down_x - tolerance <= event_x)
+            & (event_x <= down_x + tolerance)
+            & (down_y - tolerance <= event_y)
+            & (event_y <= down_y + tolerance)
         )
 
-    def find_first_gte_multiple(self, query_data, query_timestamps, data, timestamps):
-        results = 0
+    def find_mismatches(self, down_trace: EventTrace, trace: EventTrace) -> np.ndarray:
+        """Check every mouse down against the last movement before it.
+
+        Args:
+            down_trace: Time-sorted mouse down events
+            trace: Time-sorted mouse movement events
 
-        for index, query in enumerate(query_timestamps):
-            target_time = query
-            idx = bisect.bisect_left(timestamps, target_time)
+        Returns:
+            Boolean array, `True` where a mouse down is not within tolerance of
+            the latest movement strictly before it. A mouse down without any
+            earlier movement is always a mismatch.
+        """
+        if not len(trace):
+            return np.ones(len(down_trace), dtype=bool)
 
-            mouse_event = data[idx - 1]
-            mouse_down = query_data[index]
-            if not self.is_within_range(
-                mouse_down, mouse_event, self.config.within_tolerance
-            ):
-                results += 1
+        preceding = np.searchsorted(trace.t, down_trace.t, side="left") - 1
+        has_preceding = preceding >= 0
+        preceding = np.maximum(preceding, 0)
 
-        return results / len(query_data)
+        is_within = self.is_within_range(
+            down_trace.x,
+            down_trace.y,
+            trace.x[preceding],
+            trace.y[preceding],
+            self.config.within_tolerance,
+        )
+        return ~(has_preceding & is_within)
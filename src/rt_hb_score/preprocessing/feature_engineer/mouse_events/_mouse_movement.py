@@ -1,12 +1,12 @@
 """Mouse movement processor for extracting velocity features."""
 
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
-from dateutil.parser import parse
 
 from .._base import BaseFeatureEngineer
+from .._trace import EventTrace
 from .config import MouseMovementProcessingConfig
 
 logger = logging.getLogger(__name__)
@@ -20,17 +20,29 @@ class MouseMovementProcessor(BaseFeatureEngineer):
         self.config = config or MouseMovementProcessingConfig()
 
     def __call__(
-        self, mouse_movement_data: List[Dict], click_data: List[Dict]
+        self,
+        mouse_movement_data: Union[List[Dict], EventTrace],
+        click_data: List[Dict],
     ) -> Dict[str, float]:
-        """Process mouse movement data and compute velocity features."""
+        """Process mouse movement data and compute velocity features.
+
+        Args:
+            mouse_movement_data: Mouse movements as raw dicts or a prebuilt trace
+            click_data: List of mouse clicks
+
+        Returns:
+            Dictionary containing computed movement features
+        """
         try:
+            if isinstance(mouse_movement_data, EventTrace):
+                trace = mouse_movement_data
+            else:
+                trace = EventTrace.from_events(mouse_movement_data, self.config.fields)
 
-            velocities = self._compute_velocity(mouse_movement_data)
-            velocity_std = np.std(velocities) if velocities else 0
-            velocity_avg = np.average(velocities) if velocities else 0
-            px_ms = self.detect_bot_movements(mouse_movement_data, click_data)
-            mouse_angle_std = self._get_angle_std(mouse_movement_data)
-            mouse_movement_count = len(mouse_movement_data)
+            velocity_std, velocity_avg = self._get_velocity_moments(trace)
+            px_ms = self.detect_bot_movements(trace, click_data)
+            mouse_angle_std = self._get_angle_std(trace)
+            mouse_movement_count = trace.n_events
 
             return {
                 self.config.velocity_std: velocity_std,
@@ -50,85 +62,65 @@ class MouseMovementProcessor(BaseFeatureEngineer):
                 self.config.movement_cont: 0,
             }
 
-    def _parse_timestamp(self, timestamp_str: str) -> float:
-        """Parse timestamp string to float."""
-        try:
-            if isinstance(timestamp_str, (int, float)):
-                return float(timestamp_str)
-            return parse(timestamp_str).timestamp()
-        except (ValueError, TypeError) as e:
-            logger.error(f"Error parsing timestamp : {str(e)}")
-            return np.nan
-
-    def _get_angle_std(self, mouse_movements: List[Dict]) -> float:
+    def _get_velocity_moments(self, trace: EventTrace) -> Tuple[float, float]:
+        """Return the standard deviation and mean of the velocities, or zeros."""
+        statistics = trace.statistics
+        if statistics is None:
+            velocities = self._compute_velocity(trace)
+            if velocities is None or not velocities.size:
+                return 0, 0
+            return np.std(velocities), np.average(velocities)
+
+        # Downsampled traces carry the moments of every movement
+        if statistics.size < self.config.min_movements_required:
+            return 0, 0
+        if statistics.has_nan:
+            logger.warning("Invalid values found in movement data")
+            return 0, 0
+        return statistics.velocity_std, statistics.velocity_mean
+
+    def _get_angle_std(self, trace: EventTrace) -> float:
         """Calculate the standard deviation of the angles between consecutive points."""
-        if not mouse_movements:
+        if not trace.n_events:
             logger.warning(
                 "Empty mouse movement data to compute angle standard deviation"
             )
             return 0
         try:
-            valid_movements = [m for m in mouse_movements if m is not None]
-            if len(valid_movements) < self.config.min_movements_required:
+            if trace.size < self.config.min_movements_required:
                 return 0
-            valid_movements = sorted(
-                valid_movements, key=lambda x: parse(x["timestamp"])
-            )
 
-            x_coords = np.array(
-                [m.get(self.config.fields["x"]) for m in valid_movements]
-            )
-            y_coords = np.array(
-                [m.get(self.config.fields["y"]) for m in valid_movements]
-            )
+            if trace.statistics is not None:
+                return trace.statistics.angle_std
 
-            angles = np.arctan2(y_coords, x_coords) * 180 / np.pi
+            angles = np.arctan2(trace.y, trace.x) * 180 / np.pi
 
             return np.nanstd(angles)
         except Exception as e:
             logger.error(f"Error in angle standard deviation computation: {str(e)}")
             return 0
 
-    def _compute_velocity(self, mouse_movements: List[Dict]) -> List[float]:
-        """Compute velocities from mouse movement data."""
-        # self.x_vel(mouse_movements)
-        if not mouse_movements:
+    def _compute_velocity(self, trace: EventTrace) -> Optional[np.ndarray]:
+        """Compute velocities from mouse movement trace."""
+        if not trace.n_events:
             logger.warning("Empty mouse movement data to compute velocity")
             return None
 
         try:
-            valid_movements = [m for m in mouse_movements if m is not None]
-
-            if len(valid_movements) < self.config.min_movements_required:
+            if len(trace) < self.config.min_movements_required:
                 return None
-            valid_movements = sorted(
-                valid_movements, key=lambda x: parse(x["timestamp"])
-            )
-
-            x_coords = np.array(
-                [m.get(self.config.fields["x"]) for m in valid_movements]
-            )
-            y_coords = np.array(
-                [m.get(self.config.fields["y"]) for m in valid_movements]
-            )
-            timestamps = np.array(
-                [
-                    self._parse_timestamp(m.get(self.config.fields["timestamp"]))
-                    for m in valid_movements
-                ]
-            )
 
             if (
-                np.isnan(x_coords).any()
-                or np.isnan(y_coords).any()
-                or np.isnan(timestamps).any()
+                np.isnan(trace.x).any()
+                or np.isnan(trace.y).any()
+                or np.isnan(trace.t).any()
             ):
                 logger.warning("Invalid values found in movement data")
                 return None
 
-            dx = np.diff(x_coords)
-            dy = np.diff(y_coords)
-            dt = np.diff(timestamps)
+            dx = np.diff(trace.x)
+            dy = np.diff(trace.y)
+            dt = np.diff(trace.t)
 
             distances = np.sqrt(dx**2 + dy**2)
 
@@ -137,30 +129,21 @@ class MouseMovementProcessor(BaseFeatureEngineer):
                 distances, dt, out=np.zeros_like(distances), where=dt != 0
             )
 
-            return velocities.tolist()
+            return velocities
 
         except Exception as e:
             logger.error(f"Error in velocity computation: {str(e)}")
-            return []
-
-    def load_mouse_data(self, mouse_movements: List[Dict]) -> List[Dict]:
-
-        mouse_movements.sort(
-            key=lambda point: parse(point.get(self.config.fields["timestamp"]))
-        )
-        return mouse_movements
+            return None
 
-    def calculate_traveled_distance(
-        self, mouse_movements: List[Dict]
-    ) -> Tuple[float, bool]:
-        valid_movements = [m for m in mouse_movements if m is not None]
-        x_coords = np.array([m.get(self.config.fields["x"]) for m in valid_movements])
-        y_coords = np.array([m.get(self.config.fields["y"]) for m in valid_movements])
+    def calculate_traveled_distance(self, trace: EventTrace) -> Tuple[float, bool]:
+        if trace.statistics is not None:
+            total_distance = trace.statistics.distance
+            return total_distance, total_distance == 0
 
-        distances = np.sqrt(np.diff(x_coords) ** 2 + np.diff(y_coords) ** 2)
+        distances = np.sqrt(np.diff(trace.x) ** 2 + np.diff(trace.y) ** 2)
 
         total_distance = np.sum(distances)
-        is_static = all(d == 0 for d in distances)
+        is_static = not distances.any()
         return total_distance, is_static
 
     # def calculate_sampling_rate(
@@ -186,25 +169,20 @@ class MouseMovementProcessor(BaseFeatureEngineer):
     #     return avg_sampling_rate
 
     def detect_bot_movements(
-        self, mouse_movements: List[Dict], click_data: List[Dict]
+        self, trace: EventTrace, click_data: List[Dict]
     ) -> float:
         """Identify bot-like behavior based on movement density"""
-        if (
-            mouse_movements is None
-            or len(mouse_movements) == 0
-            or len(click_data) >= len(mouse_movements)
-        ):
+        if trace is None or trace.n_events == 0 or len(click_data) >= trace.n_events:
             logger.warning(
                 "No mouse movements or exactly bot-like behavior. Not enough movements or ..."
             )
             return 0
-        mouse_movements = self.load_mouse_data(mouse_movements)
 
-        total_distance, is_static = self.calculate_traveled_distance(mouse_movements)
+        total_distance, is_static = self.calculate_traveled_distance(trace)
         # avg_sampling_rate = self.calculate_sampling_rate(
         #     mouse_movements, len(click_data)
         # )
-        movement_count = len(mouse_movements)
+        movement_count = trace.n_events
         distance_per_count = (
             total_distance / movement_count
             if movement_count or is_static or total_distance == 0
@@ -56,6 +56,10 @@ class MouseDownUpConfig(BaseModel):
         default="mouse_down_up_features",
         description="Field name for the extracted features",
     )
+    mismatch_field: str = Field(
+        default="mouse_down_mismatches",
+        description="Field name for the per mouse down mismatch flags",
+    )
 
     class Config:
         """Pydantic configuration."""
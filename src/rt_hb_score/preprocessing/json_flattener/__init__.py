@@ -1,2 +1,4 @@
 from ._main import JsonDataFlattener
+from ._extractor import FieldExtractor
+from ._binary import decode_columnar, encode_columnar, is_columnar
 from .config import JsonDataFlattenerConfigPM
@@ -0,0 +1,206 @@
+"""Versioned binary container of columnar mouse events.
+
+Layout (little-endian, every block starts at a multiple of 8 bytes):
+
+    header     "<4sHHI"   magic b"RTHB", version, section count, metadata size
+    metadata   UTF-8 JSON object, the payload without the packed event lists
+    sections   "<BBHIdd"  per section: kind, item size (4 or 8), reserved,
+                          event count, time origin, time scale
+    columns    x, y and t of each section in order, float32 or float64
+
+Event times are `origin + t * scale` epoch seconds, so a front end can send
+float32 milliseconds since the session start with `origin` set to the start
+and `scale` to 0.001. Columns are read with `np.frombuffer`; float64 columns
+of time-sorted events with origin 0 and scale 1 are used without a copy.
+"""
+
+import json
+import struct
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from ..feature_engineer import EventTrace
+
+MAGIC = b"RTHB"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHI")
+_SECTION = struct.Struct("<BBHIdd")
+_ALIGNMENT = 8
+
+# Section kind -> key under `metrics.mouse`
+_SECTION_KINDS = {1: "movements", 2: "clicks", 3: "mouseDowns"}
+_SECTION_CODES = {name: kind for kind, name in _SECTION_KINDS.items()}
+_DTYPES = {4: np.dtype("<f4"), 8: np.dtype("<f8")}
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def _padded(size: int) -> int:
+    return -(-size // _ALIGNMENT) * _ALIGNMENT
+
+
+def is_columnar(data: Any) -> bool:
+    """Whether `data` is a binary columnar payload rather than JSON."""
+    return (
+        isinstance(data, (bytes, bytearray, memoryview))
+        and bytes(data[: len(MAGIC)]) == MAGIC
+    )
+
+
+def _read_times(
+    buffer: memoryview, offset: int, count: int, dtype: np.dtype, origin: float, scale: float
+) -> np.ndarray:
+    t = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+    if dtype.itemsize != 8:
+        t = t.astype(np.float64)
+    if scale != 1.0:
+        t = t * scale
+    if origin != 0.0:
+        t = t + origin
+    return t
+
+
+def decode_columnar(data: Buffer) -> Dict[str, Any]:
+    """Decode a binary columnar payload into a payload dictionary.
+
+    Args:
+        data: Binary payload. Its columns are viewed, not copied, where
+            possible, so it must not be modified while the payload is scored.
+
+    Returns:
+        The metadata object with one time-sorted `EventTrace` per section at
+        `metrics.mouse.<kind>`, like the `typed` decoder output
+
+    Raises:
+        ValueError: If the container is malformed, truncated or of an
+            unsupported version.
+    """
+    buffer = memoryview(data).cast("B")
+    if len(buffer) < _HEADER.size:
+        raise ValueError("Columnar payload is shorter than its header")
+
+    magic, version, n_sections, metadata_size = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a columnar payload")
+    if version != VERSION:
+        raise ValueError(f"Unsupported columnar payload version: {version}")
+
+    offset = _HEADER.size
+    if offset + metadata_size > len(buffer):
+        raise ValueError("Columnar payload metadata is truncated")
+    payload = (
+        json.loads(bytes(buffer[offset : offset + metadata_size]))
+        if metadata_size
+        else {}
+    )
+    if not isinstance(payload, dict):
+        raise ValueError("Columnar payload metadata must be a JSON object")
+    offset = _padded(offset + metadata_size)
+
+    if offset + n_sections * _SECTION.size > len(buffer):
+        raise ValueError("Columnar payload section table is truncated")
+    sections = [
+        _SECTION.unpack_from(buffer, offset + index * _SECTION.size)
+        for index in range(n_sections)
+    ]
+    offset += n_sections * _SECTION.size
+
+    traces = {}
+    for kind, itemsize, _, count, origin, scale in sections:
+        name = _SECTION_KINDS.get(kind)
+        if name is None:
+            raise ValueError(f"Unknown columnar payload section kind: {kind}")
+        if name in traces:
+            raise ValueError(f"Duplicate columnar payload section: {name}")
+        dtype = _DTYPES.get(itemsize)
+        if dtype is None:
+            raise ValueError(f"Unsupported column item size: {itemsize}")
+        if not (np.isfinite(origin) and np.isfinite(scale) and scale > 0):
+            raise ValueError(f"Invalid time origin or scale of section: {name}")
+
+        column_size = _padded(count * itemsize)
+        if offset + 3 * column_size > len(buffer):
+            raise ValueError(f"Columnar payload section is truncated: {name}")
+        x = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+        y = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset + column_size)
+        t = _read_times(
+            buffer, offset + 2 * column_size, count, dtype, origin, scale
+        )
+        offset += 3 * column_size
+
+        # NaN times compare false, so they take the sorting path like in
+        # `EventTrace.from_columns`
+        if not np.all(t[1:] >= t[:-1]):
+            order = np.argsort(t, kind="stable")
+            x, y, t = x[order], y[order], t[order]
+        traces[name] = EventTrace(x, y, t, n_events=count)
+
+    metrics = payload.get("metrics")
+    metrics = dict(metrics) if isinstance(metrics, dict) else {}
+    mouse = metrics.get("mouse")
+    metrics["mouse"] = {**(mouse if isinstance(mouse, dict) else {}), **traces}
+    return {**payload, "metrics": metrics}
+
+
+def encode_columnar(
+    payload: Dict[str, Any],
+    dtype: Union[str, np.dtype] = "float64",
+    fields: Optional[Dict[str, str]] = None,
+) -> bytes:
+    """Pack the mouse events of a JSON-like payload into a binary payload.
+
+    The movements, clicks and mouse downs under `metrics.mouse` become
+    time-sorted columns, `None` events are dropped, and the rest of the payload
+    is kept as the metadata.
+
+    Args:
+        payload: Payload dictionary, as posted by the browser
+        dtype: `float64`, or `float32` for half the size. float32 times are
+            stored relative to the first event of each section.
+        fields: Mapping of `x`, `y` and `timestamp` to the event keys
+
+    Returns:
+        Binary payload `decode_columnar` reads
+
+    Raises:
+        ValueError: If `dtype` is not float32 or float64.
+    """
+    dtype = np.dtype(dtype).newbyteorder("<")
+    if dtype.itemsize not in _DTYPES or dtype.kind != "f":
+        raise ValueError(f"Columns must be float32 or float64, got: {dtype}")
+
+    metrics = payload.get("metrics")
+    metrics = dict(metrics) if isinstance(metrics, dict) else {}
+    mouse = metrics.get("mouse")
+    mouse = dict(mouse) if isinstance(mouse, dict) else {}
+
+    sections, columns = [], []
+    for name, kind in _SECTION_CODES.items():
+        if name not in mouse:
+            continue
+        trace = EventTrace.from_events(mouse.pop(name), fields)
+        finite = trace.t[np.isfinite(trace.t)]
+        origin = float(finite[0]) if dtype.itemsize == 4 and len(finite) else 0.0
+        sections.append(_SECTION.pack(kind, dtype.itemsize, 0, len(trace), origin, 1.0))
+        columns.extend(
+            column.astype(dtype) for column in (trace.x, trace.y, trace.t - origin)
+        )
+
+    metrics["mouse"] = mouse
+    metadata = json.dumps({**payload, "metrics": metrics}).encode("utf-8")
+    parts = [
+        _HEADER.pack(MAGIC, VERSION, len(sections), len(metadata)),
+        metadata,
+    ]
+    size = _HEADER.size + len(metadata)
+    parts.append(bytes(_padded(size) - size))
+    parts.extend(sections)
+    for column in columns:
+        parts.append(column.tobytes())
+        parts.append(bytes(_padded(column.nbytes) - column.nbytes))
+    return b"".join(parts)
+
+
+__all__ = ["MAGIC", "VERSION", "decode_columnar", "encode_columnar", "is_columnar"]
@@ -0,0 +1,124 @@
+"""Fast JSON parsing and typed decoding of mouse movement arrays."""
+
+import json
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Union
+
+import numpy as np
+
+from ..feature_engineer import EventTrace
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _orjson():
+    """Import `orjson` on first use, so importing the package stays cheap.
+
+    Returns:
+        The `orjson` module, or None if it is not installed
+    """
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return orjson
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview], backend: str = "auto") -> Any:
+    """Parse a JSON document.
+
+    Args:
+        data: JSON document
+        backend: `orjson`, `json` (stdlib) or `auto`, which uses `orjson` when it
+            is installed. Documents `orjson` rejects but the stdlib accepts, such
+            as ones with `NaN` literals, are re-parsed with the stdlib.
+
+    Returns:
+        Parsed document
+
+    Raises:
+        ValueError: If the document is not valid JSON.
+        ImportError: If `orjson` is requested but not installed.
+    """
+    orjson = None if backend == "json" else _orjson()
+    if backend == "orjson" and orjson is None:
+        raise ImportError("`orjson` backend requested but `orjson` is not installed")
+
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            logger.debug("Re-parsing JSON rejected by `orjson` with the stdlib")
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _column(
+    movements: List[Dict[str, Any]], key: str, is_strict: bool
+) -> np.ndarray:
+    values = np.fromiter(
+        (
+            movement[key] if is_strict else movement.get(key)
+            for movement in movements
+        ),
+        dtype=np.float64,
+        count=len(movements),
+    )
+    if is_strict:
+        # `np.fromiter` turns `None` into NaN, the `MouseMovement` model rejects it
+        for index in np.flatnonzero(np.isnan(values)):
+            if movements[index][key] is None:
+                raise TypeError(f"movements[{index}].{key} must be a number, not None")
+    return values
+
+
+def decode_movements(
+    movements: List[Dict[str, Any]], is_strict: bool = True
+) -> EventTrace:
+    """Validate mouse movements straight into a time-sorted `EventTrace`.
+
+    Checks the same constraints as the `MouseMovement` model (numeric `x` and
+    `y`, string `timestamp`) without building one model and one dict per point.
+
+    Args:
+        movements: Raw `{x, y, timestamp}` movement dicts
+        is_strict: Require string timestamps and reject `None` coordinates, like
+            the `MouseMovement` model. Otherwise the movements are read like
+            `EventTrace.from_events` reads them: a `None` list is empty, `None`
+            entries are skipped (but counted in `n_events`), missing values
+            are `None` and any timestamp `decode_timestamps` accepts is allowed.
+
+    Returns:
+        Trace of the movements, without those whose timestamp is unparsable
+
+    Raises:
+        TypeError: If a movement or one of its values has the wrong type.
+        KeyError: If a movement lacks `x`, `y` or `timestamp` in strict mode.
+        ValueError: If a coordinate cannot be parsed.
+    """
+    if movements is None and not is_strict:
+        movements = []
+    if not isinstance(movements, list):
+        raise TypeError(
+            f"movements must be a list, not {type(movements).__name__}"
+        )
+
+    n_events = len(movements)
+    if not is_strict:
+        movements = [movement for movement in movements if movement is not None]
+    x = _column(movements, "x", is_strict)
+    y = _column(movements, "y", is_strict)
+    timestamps = [
+        movement["timestamp"] if is_strict else movement.get("timestamp")
+        for movement in movements
+    ]
+    if is_strict and not all(type(timestamp) is str for timestamp in timestamps):
+        raise TypeError("movement timestamps must be strings")
+
+    return EventTrace.from_columns(x, y, timestamps, n_events=n_events)
+
+
+__all__ = ["loads", "decode_movements"]
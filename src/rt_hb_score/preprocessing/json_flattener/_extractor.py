@@ -0,0 +1,178 @@
+"""Field mappings compiled into specialized extractor closures."""
+
+import logging
+from functools import reduce
+from operator import getitem
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+# Raised by a lookup on a missing key, a non-container or a short list
+_LOOKUP_ERRORS = (KeyError, TypeError, IndexError)
+
+# Default of fields whose path is not in the defaults template
+_FALLBACK_DEFAULT: List[Any] = []
+
+
+def _compile_getter(path: Sequence[Any]) -> Callable[[Any], Any]:
+    """Build a getter of one field specialized to the length of `path`."""
+    if len(path) == 0:
+        return lambda data: data
+    if len(path) == 1:
+        (_k0,) = path
+        return lambda data: data[_k0]
+    if len(path) == 2:
+        _k0, _k1 = path
+        return lambda data: data[_k0][_k1]
+    if len(path) == 3:
+        _k0, _k1, _k2 = path
+        return lambda data: data[_k0][_k1][_k2]
+
+    path = tuple(path)
+    return lambda data: reduce(getitem, path, data)
+
+
+def _compile_mapping(
+    field_mapping: Mapping[str, Sequence[Any]]
+) -> Callable[[Any], Dict[str, Any]]:
+    """Build one function extracting every field of a payload.
+
+    The key paths are merged into a list of lookups, one per distinct path
+    prefix, such as `metrics.mouse`, so each prefix is looked up once. The
+    function raises on the first missing key.
+    """
+    positions: Dict[Tuple[Any, ...], int] = {(): 0}
+    steps: List[Tuple[int, Any]] = []
+    for path in field_mapping.values():
+        for depth in range(1, len(path) + 1):
+            prefix = tuple(path[:depth])
+            if prefix not in positions:
+                positions[prefix] = len(positions)
+                steps.append((positions[prefix[:-1]], prefix[-1]))
+
+    items = [
+        (field_name, positions[tuple(path)])
+        for field_name, path in field_mapping.items()
+    ]
+
+    def _extract(data: Any) -> Dict[str, Any]:
+        values = [data]
+        append = values.append
+        for parent, key in steps:
+            append(values[parent][key])
+        return {field_name: values[position] for field_name, position in items}
+
+    return _extract
+
+
+def _resolve_default(
+    template: Optional[Mapping[str, Any]], path: Sequence[Any]
+) -> Any:
+    try:
+        return reduce(getitem, path, template)
+    except _LOOKUP_ERRORS:
+        return _FALLBACK_DEFAULT
+
+
+class FieldExtractor:
+    """Flattens nested payloads along a field mapping compiled once.
+
+    The mapping is compiled into one closure that looks up every shared path
+    prefix once and builds the flat dictionary in a single pass. Payloads
+    missing a field fall back to per-field getters, where every missing field
+    is logged and gets its typed default: an explicit one from `defaults`, else
+    the value at the same path of `template` (e.g. `None` for `project_id` and
+    `[]` for event lists in a dump of the default `InputData`), else `[]`.
+    Mutable defaults are copied for every payload.
+    """
+
+    def __init__(
+        self,
+        field_mapping: Mapping[str, Sequence[Any]],
+        defaults: Optional[Mapping[str, Any]] = None,
+        template: Optional[Mapping[str, Any]] = None,
+    ):
+        """Compile a field mapping.
+
+        Args:
+            field_mapping: Output field name to the key path of its value
+            defaults: Output field name to the value used if it is missing
+            template: Nested payload holding per-path default values
+        """
+        defaults = defaults or {}
+        self.field_mapping = {
+            field_name: tuple(path) for field_name, path in field_mapping.items()
+        }
+        self.defaults = {
+            field_name: (
+                defaults[field_name]
+                if field_name in defaults
+                else _resolve_default(template, path)
+            )
+            for field_name, path in self.field_mapping.items()
+        }
+        self._extract_all = _compile_mapping(self.field_mapping)
+        self._fields = [
+            (
+                field_name,
+                _compile_getter(path),
+                self.defaults[field_name],
+                isinstance(self.defaults[field_name], (list, dict, set)),
+            )
+            for field_name, path in self.field_mapping.items()
+        ]
+
+    def __call__(self, data: Any) -> Dict[str, Any]:
+        """Extract every mapped field of one payload."""
+        try:
+            return self._extract_all(data)
+        except _LOOKUP_ERRORS:
+            pass
+
+        flattened = {}
+        for field_name, getter, default, is_mutable in self._fields:
+            try:
+                flattened[field_name] = getter(data)
+            except _LOOKUP_ERRORS as e:
+                logger.error("Failed to get value for %s: %s", field_name, e)
+                flattened[field_name] = default.copy() if is_mutable else default
+        return flattened
+
+    def extract_many(self, data_list: Iterable[Any]) -> List[Dict[str, Any]]:
+        """Extract every mapped field of many payloads, one dictionary each.
+
+        Args:
+            data_list: Parsed payloads
+
+        Returns:
+            Flattened payloads, like `__call__` output, in payload order
+        """
+        return [self(data) for data in data_list]
+
+    def columns(self, data_list: Iterable[Any]) -> Dict[str, List[Any]]:
+        """Extract every mapped field of many payloads, one list per field.
+
+        Args:
+            data_list: Parsed payloads
+
+        Returns:
+            Field name to its values, in payload order
+        """
+        flattened_list = self.extract_many(data_list)
+        return {
+            field_name: [flattened[field_name] for flattened in flattened_list]
+            for field_name in self.field_mapping
+        }
+
+
+__all__ = ["FieldExtractor"]
@@ -1,14 +1,15 @@
 """Module for flattening nested JSON data structures."""
 
-import json
 import logging
-from typing import Dict, List, Optional, Union, Any
-from functools import reduce
-from operator import getitem
+from typing import Dict, Iterable, List, Optional, Union, Any
 
 from pydantic import ValidationError
 from .._base import BasePreprocessor
 from .config import JsonDataFlattenerConfigPM
+from ._binary import decode_columnar, is_columnar
+from ._decoder import loads, decode_movements
+from ..feature_engineer import EventTrace
+from ._extractor import FieldExtractor
 
 logger = logging.getLogger(__name__)
 
@@ -20,49 +21,115 @@ class JsonDataFlattener(BasePreprocessor):
         super().__init__()
         self._flattened_data: Optional[Dict[str, Any]] = None
         self.config = config or JsonDataFlattenerConfigPM()
+        self.extractor = FieldExtractor(
+            self.config.field_mapping,
+            defaults=self.config.field_defaults,
+            template=self.config.input_data.model_dump(),
+        )
 
-    def __call__(self, data: Union[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Process input data and return flattened structure."""
-        try:
-            if isinstance(data, str):
-                data = json.loads(data)
+    def __call__(
+        self, data: Union[str, bytes, memoryview, Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Process input data and return flattened structure.
 
-            if self.config.is_validate:
-                parsed_data = self.config.input_data.model_validate(data).model_dump()
-            else:
-                parsed_data = data
-            self._flattened_data = self._extract_metrics(parsed_data)
+        Binary columnar payloads (see `encode_columnar`) are decoded into
+        traces whatever the `decoder`.
+        """
+        try:
+            self._flattened_data = self.extractor(self._parse(data))
             return self._flattened_data
 
         except Exception as e:
             logger.error(f"Error during flattening: {str(e)}")
             return None
 
-    def _get_nested_value(
-        self, data: Dict[str, Any], path: List[str], field_name: str
-    ) -> Any:
-        """Get value from nested dictionary using path."""
-        try:
-            current = data
-            for key in path:
-                current = current[key]
-            return current
-        except (KeyError, TypeError) as e:
-            logger.error(f"Failed to get value for {field_name}: {str(e)}")
-            return []
+    def flatten_batch(
+        self, data_list: Iterable[Union[str, bytes, memoryview, Dict[str, Any]]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Flatten many payloads with the same field mapping.
+
+        Args:
+            data_list: Raw payloads as JSON documents, binary columnar payloads
+                or dictionaries
+
+        Returns:
+            Flattened payloads in the same order, `None` for payloads that
+            failed to parse or validate, like `__call__` output
+        """
+        parsed_list = []
+        for data in data_list:
+            try:
+                parsed_list.append(self._parse(data))
+            except Exception as e:
+                logger.error(f"Error during flattening: {str(e)}")
+                parsed_list.append(None)
+
+        flattened_iter = iter(
+            self.extractor.extract_many(
+                parsed for parsed in parsed_list if parsed is not None
+            )
+        )
+        return [
+            None if parsed is None else next(flattened_iter) for parsed in parsed_list
+        ]
+
+    def _parse(self, data: Union[str, bytes, memoryview, Dict[str, Any]]) -> Any:
+        """Parse and, depending on the config, validate or decode one payload."""
+        if is_columnar(data):
+            return self._decode_columnar(data)
+        if isinstance(data, (str, bytes, bytearray, memoryview)):
+            data = loads(data, backend=self.config.json_backend)
+
+        if self.config.decoder == "typed":
+            return self._decode_typed(data)
+        if self.config.is_validate:
+            return self.config.input_data.model_validate(data).model_dump()
+        return data
+
+    def _decode_typed(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate data with the mouse movements decoded into a trace.
+
+        Movements skip the per-point pydantic round trip; the rest of the
+        payload is validated by the `InputData` model if `is_validate` is set.
+        The input dictionary is not modified.
+        """
+        metrics = data.get("metrics")
+        mouse = metrics.get("mouse") if isinstance(metrics, dict) else None
+        if not isinstance(mouse, dict) or "movements" not in mouse:
+            if self.config.is_validate:
+                return self.config.input_data.model_validate(data).model_dump()
+            return data
+
+        trace = decode_movements(
+            mouse["movements"], is_strict=self.config.is_validate
+        )
+        return self._validate_around(data, {"movements": trace})
+
+    def _decode_columnar(self, data: Union[bytes, memoryview]) -> Dict[str, Any]:
+        """Decode a binary columnar payload, validating its metadata if set."""
+        data = decode_columnar(data)
+        mouse = data["metrics"]["mouse"]
+        return self._validate_around(
+            data,
+            {key: value for key, value in mouse.items() if isinstance(value, EventTrace)},
+        )
+
+    def _validate_around(
+        self, data: Dict[str, Any], traces: Dict[str, EventTrace]
+    ) -> Dict[str, Any]:
+        """Put decoded traces under `metrics.mouse`, validating the rest if set.
+
+        The `InputData` model sees empty lists in place of the traces. The input
+        dictionary is not modified.
+        """
+        metrics = data["metrics"]
+        empty = {key: [] for key in traces}
+        data = {**data, "metrics": {**metrics, "mouse": {**metrics["mouse"], **empty}}}
+        if self.config.is_validate:
+            data = self.config.input_data.model_validate(data).model_dump()
+        data["metrics"]["mouse"].update(traces)
+        return data
 
     def _extract_metrics(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract and flatten metrics from the data dictionary."""
-        try:
-            flattened = {}
-            for field_name, path in self.config.field_mapping.items():
-                try:
-                    value = self._get_nested_value(data, path, field_name)
-                    flattened[field_name] = value
-                except Exception as e:
-                    logger.error(f"Error extracting {field_name}: {str(e)}")
-                    raise
-            return flattened
-        except Exception as e:
-            logger.error(f"Error in _extract_metrics: {str(e)}")
-            raise
+        return self.extractor(data)
@@ -1,6 +1,6 @@
 """Configuration for JSON data flattening."""
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Literal, Optional, Any
 from pydantic import BaseModel, Field
 
 
@@ -78,5 +78,23 @@ _FIELD_MAPPING = {
 class JsonDataFlattenerConfigPM(ExtraBaseModel):
     """ Configuration for JSON data flattening."""
     field_mapping: Dict[str, List[str]] = Field(default_factory=lambda: _FIELD_MAPPING)
+    field_defaults: Dict[str, Any] = Field(
+        default_factory=dict,
+        description=(
+            "Values of missing fields. Fields not listed default to the value at "
+            "the same path of `input_data`, or `[]` if the path is not there"
+        ),
+    )
     input_data: InputData = Field(default_factory=InputData)
     is_validate: bool = Field(default=False)
+    decoder: Literal["pydantic", "typed"] = Field(
+        default="pydantic",
+        description=(
+            "`typed` decodes `metrics.mouse.movements` straight into a time-sorted "
+            "trace instead of one pydantic model and dict per point"
+        ),
+    )
+    json_backend: Literal["auto", "orjson", "json"] = Field(
+        default="auto",
+        description="JSON parser, `auto` uses `orjson` when it is installed",
+    )
@@ -0,0 +1,3 @@
+from ._main import ClickAlignment, TargetIndex
+
+__all__ = ["ClickAlignment", "TargetIndex"]
@@ -0,0 +1,198 @@
+"""Challenge target locations compiled for vectorized click matching."""
+
+import logging
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..feature_engineer._trace import EventTrace
+from ..timestamps import decode_timestamps
+
+logger = logging.getLogger(__name__)
+
+
+class TargetIndex:
+    """Target locations of the challenge actions of one event type.
+
+    Built once from the actions, it matches every click against every target
+    in vectorized tolerance queries. A click matches a target if both of its
+    coordinates are within `tolerance` of the target's.
+    """
+
+    # Clicks scanned per step of `first_matches`, which stops once every
+    # target has matched, so long click streams are rarely scanned in full
+    CHUNK_SIZE = 1024
+
+    def __init__(
+        self, actions: Sequence[Dict[str, Any]], event_type: str, tolerance: float
+    ):
+        """Compile the target locations.
+
+        Args:
+            actions: Challenge actions with `args.location.x` and `.y`
+            event_type: Only actions of this `type` are targets
+            tolerance: Maximum distance along each axis of a matching click
+        """
+        locations = [
+            action["args"]["location"]
+            for action in actions
+            if action.get("type") == event_type
+        ]
+        self.x = np.array([location["x"] for location in locations], dtype=np.float64)
+        self.y = np.array([location["y"] for location in locations], dtype=np.float64)
+        self.tolerance = tolerance
+
+    @classmethod
+    def from_config(cls, config: Any) -> "TargetIndex":
+        """Build the index of a config with `actions`, `type` and `tolerance`."""
+        return cls(config.actions, config.type, config.tolerance)
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TargetIndex):
+            return NotImplemented
+        return (
+            self.tolerance == other.tolerance
+            and np.array_equal(self.x, other.x)
+            and np.array_equal(self.y, other.y)
+        )
+
+    __hash__ = None
+
+    @staticmethod
+    def coordinates(clicks: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the `x` and `y` columns of click events."""
+        return (
+            np.fromiter((click["x"] for click in clicks), np.float64, len(clicks)),
+            np.fromiter((click["y"] for click in clicks), np.float64, len(clicks)),
+        )
+
+    def within(self, click_x: np.ndarray, click_y: np.ndarray) -> np.ndarray:
+        """Return a clicks x targets matrix of which clicks match which targets."""
+        click_x = np.asarray(click_x, dtype=np.float64)
+        click_y = np.asarray(click_y, dtype=np.float64)
+        return (np.abs(click_x[:, None] - self.x) <= self.tolerance) & (
+            np.abs(click_y[:, None] - self.y) <= self.tolerance
+        )
+
+    def first_matches(self, click_x: np.ndarray, click_y: np.ndarray) -> np.ndarray:
+        """Return the index of the first click matching each target.
+
+        Args:
+            click_x: X coordinates of the clicks, in time order
+            click_y: Y coordinates of the clicks, in time order
+
+        Returns:
+            Click index per target, -1 for targets no click matches
+        """
+        click_x = np.asarray(click_x, dtype=np.float64)
+        click_y = np.asarray(click_y, dtype=np.float64)
+        matches = np.full(len(self), -1, dtype=np.intp)
+        for start in range(0, len(click_x), self.CHUNK_SIZE):
+            unmatched = np.flatnonzero(matches < 0)
+            if not len(unmatched):
+                break
+
+            chunk = slice(start, start + self.CHUNK_SIZE)
+            is_within = (
+                np.abs(click_x[chunk, None] - self.x[unmatched]) <= self.tolerance
+            ) & (np.abs(click_y[chunk, None] - self.y[unmatched]) <= self.tolerance)
+            has_match = is_within.any(axis=0)
+            matches[unmatched[has_match]] = start + is_within.argmax(axis=0)[has_match]
+        return matches
+
+    def align(self, clicks: Union[List[Dict[str, Any]], EventTrace]) -> "ClickAlignment":
+        """Match click events to the targets, first click in time order wins.
+
+        Clicks are ordered by decoded timestamp (stable, so equal times keep
+        their input order).
+
+        Args:
+            clicks: Click events with `x`, `y` and `timestamp`, or a trace of
+                them, whose epoch seconds then serve as raw timestamps
+
+        Returns:
+            Alignment of the clicks to the targets
+
+        Raises:
+            TypeError: If a timestamp has an unsupported type.
+            ValueError: If a timestamp cannot be parsed.
+        """
+        if isinstance(clicks, EventTrace):
+            raw_timestamps = times = clicks.t
+            click_x, click_y = clicks.x, clicks.y
+        else:
+            raw_timestamps = [click["timestamp"] for click in clicks]
+            times = decode_timestamps(raw_timestamps)
+            click_x, click_y = self.coordinates(clicks)
+        order = np.argsort(times, kind="stable")
+        first = self.first_matches(click_x[order], click_y[order])
+        is_matched = first >= 0
+        # Map positions in time order back to positions in `clicks`
+        matches = np.full(len(self), -1, dtype=np.intp)
+        matches[is_matched] = order[first[is_matched]]
+        match_times = np.full(len(self), np.nan)
+        match_times[is_matched] = times[matches[is_matched]]
+        return ClickAlignment(
+            targets=self,
+            matches=matches,
+            times=match_times,
+            timestamps=[
+                raw_timestamps[index] if index >= 0 else None for index in matches
+            ],
+        )
+
+
+class ClickAlignment:
+    """First click on each challenge target, computed once per session.
+
+    Produced during feature engineering and shared by the checkbox features and
+    the click comparison heuristic.
+
+    Attributes:
+        targets: Index the clicks were matched against.
+        matches: Index into the click list of the first click on each target,
+            in action order, -1 for targets without a click.
+        times: Epoch seconds of those clicks, NaN for targets without a click.
+        timestamps: Raw timestamps of those clicks, None for targets without one.
+    """
+
+    __slots__ = ("targets", "matches", "times", "timestamps")
+
+    def __init__(
+        self,
+        targets: TargetIndex,
+        matches: np.ndarray,
+        times: np.ndarray,
+        timestamps: List[Any],
+    ):
+        self.targets = targets
+        self.matches = matches
+        self.times = times
+        self.timestamps = timestamps
+
+    def __len__(self) -> int:
+        return len(self.matches)
+
+    def __repr__(self) -> str:
+        return (
+            f"ClickAlignment(targets={len(self)}, matched={self.matched_count}, "
+            f"is_ordered={self.is_ordered})"
+        )
+
+    @property
+    def matched_count(self) -> int:
+        """Number of targets with a matching click."""
+        return int(np.count_nonzero(self.matches >= 0))
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether every target has a matching click."""
+        return self.matched_count == len(self)
+
+    @property
+    def is_ordered(self) -> bool:
+        """Whether every target was clicked, in action order."""
+        return self.is_complete and bool(np.all(np.diff(self.times) >= 0))
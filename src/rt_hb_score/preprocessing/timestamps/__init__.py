@@ -0,0 +1,3 @@
+from ._main import decode_parseable_timestamps, decode_timestamps, decode_timestamp
+
+__all__ = ["decode_parseable_timestamps", "decode_timestamps", "decode_timestamp"]
@@ -0,0 +1,244 @@
+"""Vectorized decoding of browser timestamps into epoch seconds."""
+
+import logging
+import re
+from datetime import datetime, timezone
+from numbers import Number
+from typing import Any, Iterable, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Numeric timestamps at or above this magnitude are epoch milliseconds
+# (1e11 seconds is year 5138, 1e11 milliseconds is 1973).
+_EPOCH_MS_THRESHOLD = 1e11
+
+# "YYYY-MM-DDTHH:MM:SS"
+_ISO_MIN_LENGTH = 19
+_ISO_DIGIT_POSITIONS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18]
+_ISO_OFFSET_LENGTH = 6  # "+HH:MM"
+
+# What `datetime.fromisoformat` may parse. It is more lenient than `dateutil`
+# in places (e.g. "00:00:00.Z"), so other strings are left to `dateutil`.
+_ISO_PATTERN = re.compile(
+    r"\d{4}-\d{2}-\d{2}"
+    r"(?:[T ]\d{2}:\d{2}(?::\d{2}(?:[.,]\d+)?)?)?"
+    r"(?:Z|[+-]\d{2}(?::?\d{2})?)?"
+)
+
+
+def _from_epoch(values: np.ndarray) -> np.ndarray:
+    """Convert numeric epoch seconds or milliseconds into epoch seconds."""
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(np.abs(values) >= _EPOCH_MS_THRESHOLD, values / 1000.0, values)
+
+
+def decode_timestamp(value: Any) -> float:
+    """Decode a single timestamp into epoch seconds.
+
+    Used for single events and for values `decode_timestamps` cannot decode in
+    bulk. Well-formed ISO-8601 strings are parsed by `datetime.fromisoformat`,
+    anything else by `dateutil`, so only values `dateutil` accepts are decoded.
+    Naive datetimes are treated as UTC, whereas `dateutil` reads them as local
+    time: browsers send UTC, and the score must not depend on the server zone.
+
+    Args:
+        value: ISO-8601 string, numeric string or epoch seconds/milliseconds.
+
+    Returns:
+        Epoch seconds.
+
+    Raises:
+        ValueError: If the value cannot be parsed.
+        TypeError: If the value type is not supported.
+    """
+    if isinstance(value, Number) and not isinstance(value, bool):
+        return float(_from_epoch(value))
+
+    if isinstance(value, str):
+        try:
+            return float(_from_epoch(float(value)))
+        except ValueError:
+            pass
+
+        try:
+            if not _ISO_PATTERN.fullmatch(value):
+                raise ValueError(f"Not a well-formed ISO-8601 timestamp: {value!r}")
+            _parsed = datetime.fromisoformat(
+                value[:-1] + "+00:00" if value.endswith("Z") else value
+            )
+        except ValueError:
+            # Only formats `fromisoformat` rejects need `dateutil`
+            from dateutil.parser import parse
+
+            _parsed = parse(value)
+
+        if _parsed.tzinfo is None:
+            _parsed = _parsed.replace(tzinfo=timezone.utc)
+        return _parsed.timestamp()
+
+    raise TypeError(f"Unsupported timestamp type: {type(value).__name__}")
+
+
+def _decode_iso(text: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Decode fixed-layout ISO-8601 strings without per-item Python work.
+
+    Handles `YYYY-MM-DD[T ]HH:MM:SS[.f+]` followed by `Z`, `+HH:MM`/`-HH:MM` or
+    nothing (treated as UTC). The unicode array is viewed as code points so the
+    layout checks and the offset are computed with array operations, and the
+    date-time body is parsed by NumPy's `datetime64` converter.
+
+    Args:
+        text: 1-D unicode array.
+
+    Returns:
+        Tuple of epoch seconds and a mask of the rows decoded successfully.
+    """
+    _count = len(text)
+    _epoch = np.full(_count, np.nan)
+    _width = text.dtype.itemsize // 4
+    if _count == 0 or _width < _ISO_MIN_LENGTH:
+        return _epoch, np.zeros(_count, dtype=bool)
+
+    _codes = np.ascontiguousarray(text).view(np.uint32).reshape(_count, _width)
+    _lengths = np.count_nonzero(_codes, axis=1)
+    _rows = np.arange(_count)
+
+    _digits = _codes[:, _ISO_DIGIT_POSITIONS] - ord("0")
+    _is_ok = (
+        (_lengths >= _ISO_MIN_LENGTH)
+        & (_digits <= 9).all(axis=1)
+        & (_codes[:, 4] == ord("-"))
+        & (_codes[:, 7] == ord("-"))
+        & ((_codes[:, 10] == ord("T")) | (_codes[:, 10] == ord(" ")))
+        & (_codes[:, 13] == ord(":"))
+        & (_codes[:, 16] == ord(":"))
+    )
+
+    _last = _codes[_rows, np.maximum(_lengths - 1, 0)]
+    _is_utc = _last == ord("Z")
+
+    _sign_pos = np.maximum(_lengths - _ISO_OFFSET_LENGTH, 0)
+    _sign = _codes[_rows, _sign_pos]
+    _has_offset = (
+        ~_is_utc
+        & (_lengths >= _ISO_MIN_LENGTH + _ISO_OFFSET_LENGTH)
+        & ((_sign == ord("+")) | (_sign == ord("-")))
+        & (_codes[_rows, _sign_pos + 3] == ord(":"))
+    )
+
+    _offset_digits = (
+        _codes[_rows[:, None], _sign_pos[:, None] + np.array([1, 2, 4, 5])].astype(
+            np.int64
+        )
+        - ord("0")
+    )
+    _offset_ok = ((_offset_digits >= 0) & (_offset_digits <= 9)).all(axis=1)
+    _is_ok &= ~_has_offset | _offset_ok
+    _offset_seconds = np.where(
+        _has_offset & _offset_ok,
+        (_offset_digits[:, 0] * 10 + _offset_digits[:, 1]) * 3600
+        + (_offset_digits[:, 2] * 10 + _offset_digits[:, 3]) * 60,
+        0,
+    ) * np.where(_sign == ord("-"), -1, 1)
+
+    # Anything after the seconds must be a `.` followed by fraction digits
+    _body_lengths = _lengths - _is_utc - _has_offset * _ISO_OFFSET_LENGTH
+    _positions = np.arange(_width)
+    _in_body = _positions < _body_lengths[:, None]
+    _in_fraction = _in_body & (_positions > _ISO_MIN_LENGTH)
+    _separator = (
+        _codes[:, _ISO_MIN_LENGTH] if _width > _ISO_MIN_LENGTH else _lengths * 0
+    )
+    _is_ok &= (_body_lengths == _ISO_MIN_LENGTH) | (
+        (_body_lengths > _ISO_MIN_LENGTH + 1)
+        & (_separator == ord("."))
+        & ~(_in_fraction & ((_codes - ord("0")) > 9)).any(axis=1)
+    )
+    _body = np.where(_in_body, _codes, 0)
+    _body = _body.astype(np.uint32).view(f"<U{_width}").reshape(_count)
+
+    try:
+        _local_us = _body[_is_ok].astype("datetime64[us]").astype(np.int64)
+    except ValueError:
+        logger.debug("Falling back to per-item parsing for malformed ISO timestamps")
+        return _epoch, np.zeros(_count, dtype=bool)
+
+    _utc_us = _local_us - _offset_seconds[_is_ok] * 1_000_000
+    _epoch[_is_ok] = _utc_us / 1e6
+    return _epoch, _is_ok
+
+
+def decode_timestamps(values: Iterable[Any]) -> np.ndarray:
+    """Decode many browser timestamps into float64 epoch seconds in one call.
+
+    ISO-8601 strings with a `Z` suffix, a `+HH:MM`/`-HH:MM` offset or no zone
+    are decoded in bulk, numeric values are read as epoch seconds or
+    milliseconds (by magnitude), and anything else falls back to
+    `decode_timestamp` one item at a time. Results equal
+    `dateutil.parser.isoparse`, fractions truncated to microseconds, except
+    that naive values are read as UTC rather than local time.
+
+    Args:
+        values: Timestamps as strings and/or numbers.
+
+    Returns:
+        Array of epoch seconds, one per input value.
+
+    Raises:
+        ValueError: If a value cannot be parsed.
+        TypeError: If a value type is not supported.
+    """
+    if not isinstance(values, np.ndarray):
+        values = list(values)
+    if len(values) == 0:
+        return np.empty(0, dtype=np.float64)
+
+    _array = np.asarray(values)
+    if _array.dtype.kind in "iuf":
+        return _from_epoch(_array)
+
+    if _array.dtype.kind == "U":
+        _epoch, _is_ok = _decode_iso(_array)
+    else:
+        _epoch = np.full(len(_array), np.nan)
+        _is_ok = np.zeros(len(_array), dtype=bool)
+
+    for _index in np.flatnonzero(~_is_ok):
+        _epoch[_index] = decode_timestamp(values[_index])
+    return _epoch
+
+
+def decode_parseable_timestamps(values: Iterable[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Decode timestamps like `decode_timestamps`, skipping unparsable values.
+
+    The bulk decoder is tried first, so well-formed input costs nothing extra.
+    If it fails, each value is tried on its own, the unparsable ones are
+    logged and only the others are decoded in bulk.
+
+    Args:
+        values: Timestamps as strings and/or numbers.
+
+    Returns:
+        Tuple of the epoch seconds of the parsable values and a mask of those
+        values within the input.
+    """
+    if not isinstance(values, np.ndarray):
+        values = list(values)
+    try:
+        return decode_timestamps(values), np.ones(len(values), dtype=bool)
+    except (ValueError, TypeError, OverflowError):
+        pass
+
+    _is_parsed = np.ones(len(values), dtype=bool)
+    for _index, _value in enumerate(values):
+        try:
+            decode_timestamp(_value)
+        except (ValueError, TypeError, OverflowError) as e:
+            logger.warning(f"Skipping unparsable timestamp {_value!r}: {e}")
+            _is_parsed[_index] = False
+
+    _parsed = [_value for _value, _ok in zip(values, _is_parsed) if _ok]
+    return decode_timestamps(_parsed), _is_parsed
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import json
+import logging
+
+import pytest
+
+from rt_hb_score import AsyncMetricsProcessor, MetricsProcessor
+
+
+logger = logging.getLogger(__name__)
+
+
+MAX_INFLIGHT = 2
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _payload(index: int) -> str:
+    _clicks = [
+        {"x": 1867, "y": 19, "timestamp": _iso(7.0)},
+        {"x": 25, "y": 869, "timestamp": _iso(8.0)},
+    ]
+    return json.dumps(
+        {
+            "project_id": "p",
+            "user_id": f"u{index}",
+            "metrics": {
+                "mouse": {
+                    "movements": [
+                        {"x": 900 + i, "y": 400 - i % 7, "timestamp": _iso(i * 0.02)}
+                        for i in range(60 + index)
+                    ],
+                    "clicks": _clicks,
+                    "mouseDowns": [{**_click} for _click in _clicks],
+                    "mouseUps": [],
+                }
+            },
+        }
+    )
+
+
+async def _collect(scorer, payloads, limit=None):
+    _results = []
+    async for _index, _result in scorer.ascore_as_completed(payloads):
+        _results.append((_index, _result))
+        if limit is not None and len(_results) >= limit:
+            break
+    return _results
+
+
+def test_ascore_as_completed_scores_like_score_batch():
+    _payloads = [_payload(_index) for _index in range(10)]
+
+    _scorer = AsyncMetricsProcessor(max_inflight=MAX_INFLIGHT)
+    try:
+        _results = asyncio.run(_collect(_scorer, _payloads))
+    finally:
+        _scorer.close()
+
+    assert sorted(_index for _index, _ in _results) == list(range(10))
+    assert [_result for _, _result in sorted(_results, key=lambda item: item[0])] == (
+        MetricsProcessor().score_batch(_payloads)
+    )
+
+
+def test_ascore_as_completed_pulls_payloads_lazily():
+    _pulled = []
+
+    def _payloads():
+        for _index in range(1000):
+            _pulled.append(_index)
+            yield _payload(_index)
+
+    _scorer = AsyncMetricsProcessor(max_inflight=MAX_INFLIGHT)
+    try:
+        _results = asyncio.run(_collect(_scorer, _payloads(), limit=5))
+    finally:
+        _scorer.close()
+
+    assert len(_results) == 5
+    # Every completed payload is replaced by exactly one pulled payload, and
+    # up to `MAX_INFLIGHT - 1` payloads completed with the last one yielded
+    assert len(_pulled) <= len(_results) + 2 * MAX_INFLIGHT - 1
+
+
+@pytest.mark.parametrize("max_inflight", [1, 3])
+def test_ascore_as_completed_bounds_scheduled_payloads(max_inflight):
+    _scheduled = []
+
+    class _CountingScorer(AsyncMetricsProcessor):
+        async def ascore(self, raw_data):
+            _scheduled.append(len(asyncio.all_tasks()) - 1)
+            return await super().ascore(raw_data)
+
+    _scorer = _CountingScorer(max_inflight=max_inflight)
+    try:
+        asyncio.run(_collect(_scorer, (_payload(_index) for _index in range(8))))
+    finally:
+        _scorer.close()
+
+    assert max(_scheduled) <= max_inflight
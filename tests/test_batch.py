@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+
+import pytest
+
+from rt_hb_score import (
+    Instrumentation,
+    MemoryResultCache,
+    MetricsProcessor,
+    SessionCorpus,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _payload(index: int) -> str:
+    _clicks = [
+        {"x": 1867, "y": 19, "timestamp": _iso(7.0)},
+        {"x": 25, "y": 869, "timestamp": _iso(8.0)},
+    ]
+    return json.dumps(
+        {
+            "project_id": "p",
+            "user_id": f"u{index}",
+            "metrics": {
+                "mouse": {
+                    "movements": [
+                        {
+                            "x": 900 + i * (1 + index % 3),
+                            "y": 400 - i % (7 + index),
+                            "timestamp": _iso(i * 0.02),
+                        }
+                        for i in range(40 + 7 * index)
+                    ],
+                    "clicks": _clicks,
+                    "mouseDowns": [{**_click} for _click in _clicks],
+                    "mouseUps": [],
+                }
+            },
+        }
+    )
+
+
+# Distinct sessions, a payload that fails to flatten and a repeated one
+PAYLOADS = [_payload(_index) for _index in range(9)] + ["not json", _payload(0)]
+
+
+def _expected():
+    _processor = MetricsProcessor()
+    return [_processor(_raw_data) for _raw_data in PAYLOADS]
+
+
+def _pipeline_calls(instrumentation: Instrumentation) -> float:
+    return sum(
+        _counter["value"]
+        for _counter in instrumentation.registry.snapshot()["counters"]
+        if _counter["name"] == "rt_hb_score_stage_calls_total"
+        and _counter["labels"]["stage"] == "pipeline"
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_score_batch_matches_per_payload_scoring(workers):
+    _results = MetricsProcessor().score_batch(PAYLOADS, workers=workers, chunksize=3)
+
+    assert _results == _expected()
+    assert [_result.get("user_id") for _result in _results] == [
+        f"u{_index}" for _index in range(9)
+    ] + [None, "u0"]
+    assert not _results[9]["success"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_score_stream_matches_per_payload_scoring(workers):
+    _results = MetricsProcessor().score_stream(
+        iter(PAYLOADS), workers=workers, chunk_size=2, max_inflight=2
+    )
+
+    assert list(_results) == _expected()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_score_corpus_matches_per_payload_scoring(workers, tmp_path):
+    _corpus = SessionCorpus.build(tmp_path / "corpus", PAYLOADS)
+
+    _results = MetricsProcessor().score_corpus(_corpus, workers=workers, chunk_size=4)
+
+    assert list(_results) == _expected()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_score_batch_uses_the_result_cache(workers):
+    _cache = MemoryResultCache()
+    _processor = MetricsProcessor(cache=_cache)
+
+    _first = _processor.score_batch(PAYLOADS, workers=workers, chunksize=3)
+    _stats = _cache.stats()
+    # The repeated payload only hits if the first one was cached by the time
+    # it was looked up, which depends on the pool
+    assert _stats["size"] == 10
+    assert _stats["hits"] + _stats["misses"] == len(PAYLOADS)
+
+    _second = _processor.score_batch(PAYLOADS, workers=workers, chunksize=3)
+
+    assert _first == _second == _expected()
+    assert _cache.stats()["hits"] == _stats["hits"] + len(PAYLOADS)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_score_batch_records_worker_stages(workers):
+    _events = []
+    _instrumentation = Instrumentation(hooks=[_events.append])
+    _processor = MetricsProcessor(instrumentation=_instrumentation)
+
+    _processor.score_batch(PAYLOADS, workers=workers, chunksize=3)
+
+    assert _pipeline_calls(_instrumentation) == len(PAYLOADS)
+    _timed = [_event for _event in _events if _event.early_exit is None]
+    assert sum(_event.stage == "pipeline" for _event in _timed) == len(PAYLOADS)
+    assert sum(_event.early_exit == "preprocessing_failed" for _event in _events) == 1
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_cache_hits_are_recorded_as_early_exits(workers):
+    _instrumentation = Instrumentation()
+    _processor = MetricsProcessor(
+        instrumentation=_instrumentation, cache=MemoryResultCache()
+    )
+    _processor.score_batch(PAYLOADS[:9], workers=workers)
+
+    _processor.score_batch(PAYLOADS[:9], workers=workers)
+
+    _exits = [
+        _counter["value"]
+        for _counter in _instrumentation.registry.snapshot()["counters"]
+        if _counter["name"] == "rt_hb_score_early_exits_total"
+        and _counter["labels"] == {"stage": "pipeline", "reason": "cache_hit"}
+    ]
+    assert _exits == [9]
+    # Only the first batch was scored
+    assert _pipeline_calls(_instrumentation) == 9
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_score_corpus_records_worker_stages(workers, tmp_path):
+    _corpus = SessionCorpus.build(tmp_path / "corpus", PAYLOADS)
+    _instrumentation = Instrumentation()
+    _processor = MetricsProcessor(instrumentation=_instrumentation)
+
+    list(_processor.score_corpus(_corpus, workers=workers, chunk_size=4))
+
+    _calls = {
+        _counter["labels"]["stage"]: _counter["value"]
+        for _counter in _instrumentation.registry.snapshot()["counters"]
+        if _counter["name"] == "rt_hb_score_stage_calls_total"
+    }
+    assert _calls["heuristics"] == len(PAYLOADS) - 1
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import math
+
+import numpy as np
+import pytest
+
+from rt_hb_score import MetricsProcessor, decode_columnar, encode_columnar
+from rt_hb_score.preprocessing.feature_engineer import EventTrace
+from rt_hb_score.preprocessing.json_flattener._binary import (
+    MAGIC,
+    VERSION,
+    _HEADER,
+    _SECTION,
+    _padded,
+    is_columnar,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _payload(count: int = 300):
+    _rng = np.random.default_rng(0)
+    _x = np.linspace(900, 1867, count) + _rng.normal(0, 3, count)
+    _y = np.linspace(400, 19, count) + _rng.normal(0, 3, count)
+    _clicks = [
+        {"x": 1867, "y": 19, "timestamp": _iso(7.0)},
+        {"x": 25, "y": 869, "timestamp": _iso(8.0)},
+    ]
+    return {
+        "project_id": "p",
+        "user_id": "u",
+        "metrics": {
+            "mouse": {
+                "movements": [
+                    {"x": float(_x[i]), "y": float(_y[i]), "timestamp": _iso(i * 0.02)}
+                    for i in range(count)
+                ],
+                "clicks": _clicks,
+                "mouseDowns": [{**_click} for _click in _clicks],
+                "mouseUps": [],
+            }
+        },
+    }
+
+
+def _container(sections, metadata: bytes = b"{}") -> bytes:
+    """Pack `(kind, itemsize, count, origin, scale, (x, y, t))` sections."""
+    _parts = [_HEADER.pack(MAGIC, VERSION, len(sections), len(metadata)), metadata]
+    _size = _HEADER.size + len(metadata)
+    _parts.append(bytes(_padded(_size) - _size))
+    _parts.extend(
+        _SECTION.pack(_kind, _itemsize, 0, _count, _origin, _scale)
+        for _kind, _itemsize, _count, _origin, _scale, _ in sections
+    )
+    _dtypes = {2: "<f2", 4: "<f4", 8: "<f8"}
+    for _kind, _itemsize, _count, _origin, _scale, _columns in sections:
+        for _column in _columns:
+            _bytes = np.asarray(_column, dtype=_dtypes[_itemsize]).tobytes()
+            _parts.append(_bytes + bytes(_padded(len(_bytes)) - len(_bytes)))
+    return b"".join(_parts)
+
+
+def _section(kind: int = 1, itemsize: int = 8, origin: float = 0.0, scale: float = 1.0):
+    _columns = ([1.0, 2.0, 3.0], [4.0, 5.0, 6.0], [10.0, 11.0, 12.0])
+    return kind, itemsize, 3, origin, scale, _columns
+
+
+@pytest.mark.parametrize("dtype", ["float64", "float32"])
+def test_round_trip(dtype):
+    _source = _payload()
+    _data = encode_columnar(_source, dtype=dtype)
+
+    assert is_columnar(_data)
+    assert not is_columnar(json.dumps(_source).encode("utf-8"))
+
+    _decoded = decode_columnar(_data)
+    assert _decoded["user_id"] == "u"
+    assert _decoded["metrics"]["mouse"]["mouseUps"] == []
+    for _name in ("movements", "clicks", "mouseDowns"):
+        _expected = EventTrace.from_events(_source["metrics"]["mouse"][_name])
+        _trace = _decoded["metrics"]["mouse"][_name]
+        assert _trace.n_events == _expected.n_events
+        for _column in ("x", "y"):
+            np.testing.assert_allclose(
+                getattr(_trace, _column), getattr(_expected, _column), rtol=1e-6
+            )
+        # float32 times are relative to the first event, so stay exact to 1 ms
+        np.testing.assert_allclose(_trace.t, _expected.t, rtol=0, atol=1e-3)
+
+
+def test_round_trip_of_memoryview():
+    _data = encode_columnar(_payload())
+
+    _decoded = decode_columnar(memoryview(_data))
+
+    assert len(_decoded["metrics"]["mouse"]["movements"]) == 300
+
+
+def test_time_origin_and_scale():
+    _data = _container([_section(origin=1000.0, scale=0.001)])
+
+    _trace = decode_columnar(_data)["metrics"]["mouse"]["movements"]
+
+    np.testing.assert_allclose(_trace.t, [1000.010, 1000.011, 1000.012])
+
+
+def test_unsorted_times_are_sorted():
+    _columns = ([1.0, 2.0, 3.0, 4.0], [5.0, 6.0, 7.0, 8.0], [12.0, 10.0, np.nan, 11.0])
+    _data = _container([(1, 8, 4, 0.0, 1.0, _columns)])
+
+    _trace = decode_columnar(_data)["metrics"]["mouse"]["movements"]
+    _expected = EventTrace.from_columns(*_columns)
+
+    np.testing.assert_array_equal(_trace.x, _expected.x)
+    np.testing.assert_array_equal(_trace.y, _expected.y)
+    np.testing.assert_array_equal(_trace.t, _expected.t)
+    np.testing.assert_array_equal(_trace.x, [2.0, 4.0, 1.0, 3.0])
+
+
+def _truncated_header():
+    return _container([_section()])[: _HEADER.size - 1]
+
+
+def _truncated_metadata():
+    return _container([], metadata=json.dumps({"user_id": "u"}).encode())[
+        : _HEADER.size + 4
+    ]
+
+
+def _truncated_section_table():
+    _data = _container([_section()])
+    return _data[: _padded(_HEADER.size + 2) + _SECTION.size - 1]
+
+
+def _truncated_columns():
+    return _container([_section()])[:-1]
+
+
+MALFORMED = {
+    "truncated_header": (_truncated_header, "shorter than its header"),
+    "truncated_metadata": (_truncated_metadata, "metadata is truncated"),
+    "truncated_section_table": (_truncated_section_table, "section table is truncated"),
+    "truncated_columns": (_truncated_columns, "section is truncated"),
+    "bad_magic": (lambda: b"XXXX" + _container([_section()])[4:], "Not a columnar"),
+    "bad_version": (
+        lambda: _HEADER.pack(MAGIC, VERSION + 1, 0, 0),
+        "Unsupported columnar payload version",
+    ),
+    "metadata_not_object": (
+        lambda: _container([], metadata=b"[1, 2]"),
+        "must be a JSON object",
+    ),
+    "unknown_kind": (lambda: _container([_section(kind=9)]), "Unknown"),
+    "duplicate_section": (
+        lambda: _container([_section(), _section()]),
+        "Duplicate columnar payload section: movements",
+    ),
+    "itemsize_2": (lambda: _container([_section(itemsize=2)]), "item size: 2"),
+    "nan_origin": (lambda: _container([_section(origin=math.nan)]), "origin or scale"),
+    "inf_origin": (lambda: _container([_section(origin=math.inf)]), "origin or scale"),
+    "nan_scale": (lambda: _container([_section(scale=math.nan)]), "origin or scale"),
+    "inf_scale": (lambda: _container([_section(scale=math.inf)]), "origin or scale"),
+    "zero_scale": (lambda: _container([_section(scale=0.0)]), "origin or scale"),
+}
+
+
+@pytest.mark.parametrize("name", sorted(MALFORMED))
+def test_malformed_payload_raises(name):
+    _build, _message = MALFORMED[name]
+
+    with pytest.raises(ValueError, match=_message):
+        decode_columnar(_build())
+
+
+def test_malformed_payload_fails_to_score():
+    _result = MetricsProcessor()(_container([_section(), _section()]))
+
+    assert not _result["success"]
+
+
+def test_encode_rejects_non_float_dtype():
+    with pytest.raises(ValueError, match="float32 or float64"):
+        encode_columnar(_payload(), dtype="int32")
+
+
+@pytest.mark.parametrize("dtype", ["float64", "float32"])
+@pytest.mark.parametrize("decoder", ["pydantic", "typed"])
+def test_binary_scores_like_json(decoder, dtype):
+    _source = _payload()
+    _processor = MetricsProcessor({"preprocessor": {"flattener": {"decoder": decoder}}})
+
+    _expected = _processor(json.dumps(_source))
+    _result = _processor(encode_columnar(_source, dtype=dtype))
+
+    assert _expected["success"]
+    assert _result == _expected
+
+
+@pytest.mark.parametrize("decoder", ["pydantic", "typed"])
+def test_binary_features_equal_json(decoder):
+    _source = _payload()
+    _preprocessor = MetricsProcessor(
+        {"preprocessor": {"flattener": {"decoder": decoder}}}
+    ).preprocessor
+
+    _features = [
+        _preprocessor(_data)
+        for _data in (json.dumps(_source), encode_columnar(_source))
+    ]
+    # Clicks are passed through as decoded, events or a trace
+    for _feature in _features:
+        _feature.pop("mouse_clicks")
+    np.testing.assert_equal(_features[0], _features[1])
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from rt_hb_score import DiskResultCache, MemoryResultCache, MetricsProcessor
+from rt_hb_score import _cache
+
+
+logger = logging.getLogger(__name__)
+
+
+class _Clock:
+    """Stands in for the `time` module of the cache, advanced by hand."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    _clock = _Clock()
+    monkeypatch.setattr(_cache, "time", _clock)
+    return _clock
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _payload() -> str:
+    _clicks = [
+        {"x": 1867, "y": 19, "timestamp": _iso(7.0)},
+        {"x": 25, "y": 869, "timestamp": _iso(8.0)},
+    ]
+    return json.dumps(
+        {
+            "project_id": "p",
+            "user_id": "u",
+            "metrics": {
+                "mouse": {
+                    "movements": [
+                        {"x": 900 + i, "y": 400 - i % 7, "timestamp": _iso(i * 0.02)}
+                        for i in range(120)
+                    ],
+                    "clicks": _clicks,
+                    "mouseDowns": [{**_click} for _click in _clicks],
+                    "mouseUps": [],
+                }
+            },
+        }
+    )
+
+
+def _result(index: int):
+    return {"success": True, "analysis": {"score": index / 10}}
+
+
+def _caches(tmp_path, maxsize: int, ttl=None):
+    return {
+        "memory": MemoryResultCache(maxsize=maxsize, ttl=ttl),
+        "disk": DiskResultCache(tmp_path / "cache", maxsize=maxsize, ttl=ttl),
+    }
+
+
+@pytest.mark.parametrize("kind", ["memory", "disk"])
+def test_entries_expire_after_ttl(kind, tmp_path, clock):
+    _store = _caches(tmp_path, maxsize=8, ttl=10)[kind]
+    _store.set("a", _result(1))
+
+    clock.now += 9.9
+    assert _store.get("a") == _result(1)
+
+    clock.now += 0.2
+    assert _store.get("a") is None
+    assert _store.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "expirations": 1,
+        "size": 0,
+        "maxsize": 8,
+    }
+
+
+@pytest.mark.parametrize("kind", ["memory", "disk"])
+def test_entries_never_expire_without_ttl(kind, tmp_path, clock):
+    _store = _caches(tmp_path, maxsize=8)[kind]
+    _store.set("a", _result(1))
+
+    clock.now += 1e9
+
+    assert _store.get("a") == _result(1)
+
+
+@pytest.mark.parametrize("kind", ["memory", "disk"])
+def test_cached_results_are_copies(kind, tmp_path):
+    _store = _caches(tmp_path, maxsize=8)[kind]
+    _stored = _result(1)
+    _store.set("a", _stored)
+
+    _stored["analysis"]["score"] = 0.9
+    _store.get("a")["analysis"]["score"] = 0.8
+
+    assert _store.get("a") == _result(1)
+
+
+def test_memory_cache_evicts_least_recently_used():
+    _store = MemoryResultCache(maxsize=3)
+    for _key in "abc":
+        _store.set(_key, _result(ord(_key)))
+
+    assert _store.get("a") is not None
+    _store.set("d", _result(4))
+    _store.set("e", _result(5))
+
+    assert [_key for _key in "abcde" if _store.get(_key) is not None] == [
+        "a",
+        "d",
+        "e",
+    ]
+    assert _store.stats() == {
+        "hits": 4,
+        "misses": 2,
+        "evictions": 2,
+        "expirations": 0,
+        "size": 3,
+        "maxsize": 3,
+    }
+
+
+def test_disk_cache_evicts_least_recently_used_to_low_water_mark(tmp_path):
+    _store = DiskResultCache(tmp_path, maxsize=10)
+    _keys = [f"{_index:02d}key" for _index in range(10)]
+    for _index, _key in enumerate(_keys):
+        _store.set(_key, _result(_index))
+        # Distinct, increasing recency regardless of the file system resolution
+        os.utime(_store._path(_key), (1000 + _index, 1000 + _index))
+
+    # A hit makes the oldest entry the most recent one
+    assert _store.get(_keys[0]) is not None
+    _store.set("10key", _result(10))
+
+    # 11 entries are evicted down to 90% of 10
+    _kept = [_key for _key in _keys + ["10key"] if _store._path(_key).exists()]
+    assert _kept == [_keys[0]] + _keys[3:] + ["10key"]
+    assert len(_store) == 9
+    assert _store.stats()["evictions"] == 2
+    assert not list(tmp_path.glob("*/*.tmp"))
+
+
+def test_cache_clear_keeps_stats(tmp_path):
+    for _store in _caches(tmp_path, maxsize=8).values():
+        _store.set("a", _result(1))
+        _store.get("a")
+        _store.clear()
+
+        assert len(_store) == 0
+        assert _store.get("a") is None
+        assert _store.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("maxsize, ttl", [(0, None), (8, 0), (8, -1)])
+def test_cache_rejects_invalid_limits(maxsize, ttl):
+    with pytest.raises(ValueError):
+        MemoryResultCache(maxsize=maxsize, ttl=ttl)
+
+
+def _score_with_disk_cache(directory: str, payload: str):
+    _store = DiskResultCache(directory)
+    _scored = MetricsProcessor(cache=_store)(payload)
+    return _scored, _store.stats()
+
+
+def test_disk_cache_is_shared_across_processes(tmp_path):
+    _document = _payload()
+
+    with ProcessPoolExecutor(max_workers=1) as _executor:
+        _scored, _stats = _executor.submit(
+            _score_with_disk_cache, str(tmp_path), _document
+        ).result()
+    assert _stats["misses"] == 1 and _stats["size"] == 1
+
+    _store = DiskResultCache(tmp_path)
+    assert len(_store) == 1
+    assert MetricsProcessor(cache=_store)(_document) == _scored
+    assert _store.stats()["hits"] == 1
+    assert _store.stats()["misses"] == 0
+
+    with ProcessPoolExecutor(max_workers=1) as _executor:
+        _, _stats = _executor.submit(
+            _score_with_disk_cache, str(tmp_path), _document
+        ).result()
+    assert _stats["hits"] == 1 and _stats["misses"] == 0
+
+
+def test_config_fingerprint_follows_config():
+    _base = MetricsProcessor()
+    _same = MetricsProcessor({"heuristics": {"mouse_events": {}}})
+    _threshold = MetricsProcessor(
+        {"heuristics": {"mouse_events": {"mouse_movements_very_low": 10}}}
+    )
+    _actions = MetricsProcessor(
+        {
+            "actions": [
+                {"id": "1", "type": "click", "args": {"location": {"x": 1, "y": 2}}}
+            ]
+        }
+    )
+    _downsampling = MetricsProcessor(
+        {"preprocessor": {"feature_engineer": {"downsampling": {"max_events": 100}}}}
+    )
+
+    assert _same.config_fingerprint == _base.config_fingerprint
+    _fingerprints = {
+        _processor.config_fingerprint
+        for _processor in (_base, _threshold, _actions, _downsampling)
+    }
+    assert len(_fingerprints) == 4
+
+    _document = _payload()
+    assert _base.cache_key(_document) == _same.cache_key(_document)
+    assert _base.cache_key(_document) != _threshold.cache_key(_document)
+
+
+def test_processors_of_other_configs_do_not_share_entries():
+    _store = MemoryResultCache()
+    _document = _payload()
+
+    MetricsProcessor(cache=_store)(_document)
+    MetricsProcessor(
+        {"heuristics": {"mouse_events": {"mouse_movements_very_low": 10}}},
+        cache=_store,
+    )(_document)
+
+    assert _store.stats()["misses"] == 2
+    assert len(_store) == 2
+
+
+def test_documents_are_keyed_byte_for_byte():
+    _document = _payload()
+    _reordered = json.dumps(json.loads(_document), sort_keys=True, indent=1)
+    _processor = MetricsProcessor()
+
+    assert _processor.cache_key(_document) == _processor.cache_key(
+        _document.encode("utf-8")
+    )
+    assert _processor.cache_key(_document) == _processor.cache_key(
+        memoryview(_document.encode("utf-8"))
+    )
+    assert _processor.cache_key(_document) != _processor.cache_key(_reordered)
+    assert _cache.raw_payload_digest(_document) != _cache.raw_payload_digest(
+        _reordered
+    )
+
+
+def test_dictionaries_are_keyed_in_canonical_form():
+    _document = json.loads(_payload())
+    _reordered = json.loads(json.dumps(_document, sort_keys=True))
+
+    assert list(_reordered) != list(_document)
+    assert _cache.raw_payload_digest(_document) == _cache.raw_payload_digest(
+        _reordered
+    )
+    assert _cache.raw_payload_digest(_document) == _cache.canonical_digest(_document)
+
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import logging
+
+import pytest
+
+from rt_hb_score import MetricsProcessor
+from rt_hb_score.__main__ import main
+
+
+logger = logging.getLogger(__name__)
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _payload(index: int) -> str:
+    _clicks = [
+        {"x": 1867, "y": 19, "timestamp": _iso(7.0)},
+        {"x": 25, "y": 869, "timestamp": _iso(8.0)},
+    ]
+    return json.dumps(
+        {
+            "project_id": "p",
+            "user_id": f"u{index}",
+            "metrics": {
+                "mouse": {
+                    "movements": [
+                        {
+                            "x": 900 + i,
+                            "y": 400 - i % (3 + index),
+                            "timestamp": _iso(i * 0.02),
+                        }
+                        for i in range(60 + 10 * index)
+                    ],
+                    "clicks": _clicks,
+                    "mouseDowns": [{**_click} for _click in _clicks],
+                    "mouseUps": [],
+                }
+            },
+        }
+    )
+
+
+PAYLOADS = [_payload(_index) for _index in range(5)] + ["not json"]
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    _path = tmp_path / "sessions.jsonl"
+    # Blank lines are skipped
+    _lines = PAYLOADS[:3] + [""] + PAYLOADS[3:]
+    _path.write_text("\n".join(_lines) + "\n")
+    return _path
+
+
+def _expected(config=None):
+    _processor = MetricsProcessor(config)
+    return [_processor(_raw_data) for _raw_data in PAYLOADS]
+
+
+def _read_jsonl(path):
+    return [json.loads(_line) for _line in path.read_text().splitlines()]
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_scores_jsonl_file_in_input_order(workers, inputs, tmp_path):
+    _output = tmp_path / "scores.jsonl"
+
+    _code = main(
+        [
+            str(inputs),
+            "-o",
+            str(_output),
+            "--workers",
+            workers,
+            "--chunk-size",
+            "2",
+            "--max-inflight",
+            "1",
+        ]
+    )
+
+    assert _code == 0
+    assert _read_jsonl(_output) == _expected()
+
+
+def test_scores_stdin_to_stdout(monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO("\n".join(PAYLOADS) + "\n"))
+
+    assert main(["-", "--workers", "1"]) == 0
+
+    _lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(_line) for _line in _lines] == _expected()
+
+
+def test_reads_config_file(inputs, tmp_path):
+    # Results of downsampled sessions are marked
+    _config = {
+        "preprocessor": {"feature_engineer": {"downsampling": {"max_events": 50}}}
+    }
+    _config_path = tmp_path / "config.json"
+    _config_path.write_text(json.dumps(_config))
+    _output = tmp_path / "scores.jsonl"
+
+    main([str(inputs), "-o", str(_output), "-w", "1", "-c", str(_config_path)])
+
+    _results = _read_jsonl(_output)
+    assert _results == _expected(_config)
+    assert [_result.get("downsampled") for _result in _results] == (
+        [True] * 5 + [None]
+    )
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_corpus_scores_like_inputs(workers, inputs, tmp_path):
+    _corpus = tmp_path / "corpus"
+    _output = tmp_path / "scores.jsonl"
+
+    assert main([str(inputs), "--to-corpus", str(_corpus)]) == 0
+    assert not (tmp_path / "scores.jsonl").exists()
+    assert (
+        main(
+            [
+                "--corpus",
+                str(_corpus),
+                "-o",
+                str(_output),
+                "-w",
+                workers,
+                "--chunk-size",
+                "4",
+            ]
+        )
+        == 0
+    )
+
+    assert _read_jsonl(_output) == _expected()
+
+
+def test_rejects_chunk_size_below_one(inputs, tmp_path):
+    _output = tmp_path / "scores.jsonl"
+
+    assert main([str(inputs), "-o", str(_output), "--chunk-size", "0"]) == 2
+    assert not _output.exists()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+
+import numpy as np
+import pytest
+
+from rt_hb_score import MetricsProcessor, SessionCorpus
+from rt_hb_score.preprocessing.feature_engineer import EventTrace
+
+
+logger = logging.getLogger(__name__)
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _document(index: int = 0, user_id="u", project_id="p"):
+    _clicks = [
+        {"x": 1867, "y": 19, "timestamp": _iso(7.0)},
+        {"x": 25, "y": 869, "timestamp": _iso(8.0)},
+    ]
+    return {
+        "project_id": project_id,
+        "user_id": user_id,
+        "metrics": {
+            "mouse": {
+                # Out of time order, so the corpus must sort each session
+                "movements": [
+                    {"x": 900 + i, "y": 400 - i % 7, "timestamp": _iso(i * 0.02)}
+                    for i in reversed(range(60 + index))
+                ],
+                "clicks": _clicks,
+                "mouseDowns": [{**_click} for _click in _clicks],
+                "mouseUps": [],
+            }
+        },
+    }
+
+
+def _bad_coordinates():
+    _payload = _document(1)
+    _payload["metrics"]["mouse"]["clicks"][0]["x"] = "left"
+    return json.dumps(_payload)
+
+
+PAYLOADS = [
+    json.dumps(_document(0)),
+    json.dumps(_document(1, user_id="", project_id="")),
+    "not json",
+    _bad_coordinates(),
+    _document(2, user_id=None),
+]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    return SessionCorpus.build(tmp_path / "corpus", PAYLOADS)
+
+
+def test_build_keeps_positions_of_invalid_sessions(corpus):
+    assert len(corpus) == len(PAYLOADS)
+    assert corpus.manifest["sessions"] == 5
+    assert corpus.manifest["invalid"] == 2
+    assert [_session is not None for _session in corpus] == [
+        True,
+        True,
+        False,
+        False,
+        True,
+    ]
+
+
+def test_build_keeps_ids_as_given(corpus):
+    _ids = [
+        (corpus[_index]["user_id"], corpus[_index]["project_id"])
+        for _index in (0, 1, 4)
+    ]
+
+    assert _ids == [("u", "p"), ("", ""), (None, "p")]
+
+
+def test_sessions_round_trip(corpus, tmp_path):
+    for _index, _count in ((0, 60), (1, 61), (4, 62)):
+        _source = PAYLOADS[_index]
+        if isinstance(_source, str):
+            _source = json.loads(_source)
+        _session = corpus[_index]
+        _movements = _session["mouse_movements"]
+        _expected = EventTrace.from_events(_source["metrics"]["mouse"]["movements"])
+
+        assert _movements.n_events == _count
+        np.testing.assert_array_equal(_movements.x, _expected.x)
+        np.testing.assert_array_equal(_movements.t, _expected.t)
+        assert np.all(np.diff(_movements.t) >= 0)
+        assert len(_session["mouse_clicks"]) == 2
+
+    # A reopened corpus reads the same sessions
+    _reopened = SessionCorpus(tmp_path / "corpus")
+    np.testing.assert_array_equal(
+        _reopened[4]["mouse_mouseDowns"].t, corpus[4]["mouse_mouseDowns"].t
+    )
+
+
+def test_corpus_scores_like_payloads(corpus):
+    _processor = MetricsProcessor()
+
+    _results = list(_processor.score_corpus(corpus))
+
+    assert [_result["success"] for _result in _results] == [
+        True,
+        True,
+        False,
+        False,
+        True,
+    ]
+    for _index in (0, 1, 4):
+        assert _results[_index]["analysis"] == (
+            _processor(PAYLOADS[_index])["analysis"]
+        )
+
+
+def test_unsupported_version_is_rejected(corpus):
+    _manifest = corpus.path / "manifest.json"
+    _manifest.write_text(json.dumps({**corpus.manifest, "version": 1}))
+
+    with pytest.raises(ValueError, match="Unsupported corpus version"):
+        SessionCorpus(corpus.path)
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+
+import numpy as np
+import pytest
+
+from rt_hb_score import MetricsProcessor
+
+
+logger = logging.getLogger(__name__)
+
+
+MAX_EVENTS = 400
+# Smaller than the trace, so it is decimated across chunk bounds
+CHUNK_SIZE = 512
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _movements(count: int = 3000):
+    _rng = np.random.default_rng(0)
+    _x = np.concatenate(
+        (np.linspace(900, 1867, count // 2), np.linspace(1867, 25, count - count // 2))
+    ) + _rng.normal(0, 3, count)
+    _y = np.concatenate(
+        (np.linspace(400, 19, count // 2), np.linspace(19, 869, count - count // 2))
+    ) + _rng.normal(0, 3, count)
+    _t = np.cumsum(_rng.uniform(0.002, 0.012, count))
+    return [
+        {"x": float(_x[i]), "y": float(_y[i]), "timestamp": _iso(_t[i])}
+        for i in range(count)
+    ]
+
+
+def _payload(movements):
+    # Clicks on the targets, right after the movement that reached them
+    _events = _movements()
+    _clicks = [
+        {
+            "x": _events[_index - 1]["x"],
+            "y": _events[_index - 1]["y"],
+            "timestamp": _events[_index]["timestamp"],
+        }
+        for _index in (len(_events) // 2, len(_events) - 1)
+    ]
+    return json.dumps(
+        {
+            "project_id": "p",
+            "user_id": "u",
+            "metrics": {
+                "mouse": {
+                    "movements": movements,
+                    "clicks": _clicks,
+                    "mouseDowns": [{**_click} for _click in _clicks],
+                    "mouseUps": [],
+                }
+            },
+        }
+    )
+
+
+def _in_order():
+    return _movements()
+
+
+def _out_of_order():
+    _events = _movements()
+    # Swap chunks, so the disorder is only seen after the first chunk is kept
+    return _events[:CHUNK_SIZE] + _events[2 * CHUNK_SIZE :] + _events[
+        CHUNK_SIZE : 2 * CHUNK_SIZE
+    ]
+
+
+def _none_padded():
+    _events = _movements()
+    for _index in (0, 7, CHUNK_SIZE, CHUNK_SIZE + 1, 2000):
+        _events.insert(_index, None)
+    return _events + [None]
+
+
+def _nan_bearing():
+    _events = _movements()
+    for _index in (5, CHUNK_SIZE - 1, 1500):
+        _events[_index] = {**_events[_index], "x": float("nan")}
+    return _events
+
+
+MOVEMENTS = {
+    "in_order": _in_order,
+    "out_of_order": _out_of_order,
+    "none_padded": _none_padded,
+    "nan_bearing": _nan_bearing,
+}
+
+
+def _features(document: str, method: str, decoder: str, max_events):
+    _processor = MetricsProcessor(
+        {
+            "preprocessor": {
+                "flattener": {"decoder": decoder},
+                "feature_engineer": {
+                    "downsampling": {
+                        "max_events": max_events,
+                        "method": method,
+                        "chunk_size": CHUNK_SIZE,
+                    }
+                },
+            }
+        }
+    )
+    _features = _processor.preprocessor(document, keep_alignment=True)
+    _analysis = _processor.heuristic_analyzer(_features)
+    for _key in ("click_alignment", "mouse_clicks"):
+        _features.pop(_key)
+    return _features, _analysis
+
+
+def _assert_close(actual, desired, path="features"):
+    if isinstance(desired, dict):
+        assert sorted(actual) == sorted(desired), path
+        for _key in desired:
+            _assert_close(actual[_key], desired[_key], f"{path}.{_key}")
+    elif isinstance(desired, (list, tuple)):
+        assert len(actual) == len(desired), path
+        for _index, (_actual, _desired) in enumerate(zip(actual, desired)):
+            _assert_close(_actual, _desired, f"{path}[{_index}]")
+    elif isinstance(desired, (bool, str)) or desired is None:
+        assert actual == desired, path
+    else:
+        np.testing.assert_allclose(actual, desired, rtol=1e-9, atol=1e-9, err_msg=path)
+
+
+@pytest.mark.parametrize("decoder", ["pydantic", "typed"])
+@pytest.mark.parametrize("name", sorted(MOVEMENTS))
+@pytest.mark.parametrize("method", ["time", "distance"])
+def test_downsampled_features_match_full_trace(method, name, decoder):
+    _document = _payload(MOVEMENTS[name]())
+
+    _full, _full_score = _features(_document, method, decoder, max_events=None)
+    _downsampled, _score = _features(_document, method, decoder, MAX_EVENTS)
+
+    assert _full.pop("is_downsampled") is False
+    assert _downsampled.pop("is_downsampled") is True
+    _assert_close(_downsampled, _full)
+    assert _score == _full_score
+
+
+@pytest.mark.parametrize("method", ["time", "distance"])
+def test_short_trace_is_not_downsampled(method):
+    _document = _payload(_movements(MAX_EVENTS))
+
+    _full, _ = _features(_document, method, "pydantic", max_events=None)
+    _kept, _ = _features(_document, method, "pydantic", MAX_EVENTS)
+
+    assert _kept.pop("is_downsampled") is False
+    _full.pop("is_downsampled")
+    _assert_close(_kept, _full)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+
+import pytest
+
+from rt_hb_score import Instrumentation, MetricsProcessor
+
+
+logger = logging.getLogger(__name__)
+
+
+EARLY_EXIT = {"heuristics": {"mouse_events": {"early_exit": True}}}
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _payload(count: int, target=(1867, 19)):
+    _clicks = [
+        {"x": target[0], "y": target[1], "timestamp": _iso(7.0)},
+        {"x": 25, "y": 869, "timestamp": _iso(8.0)},
+    ]
+    return json.dumps(
+        {
+            "project_id": "p",
+            "user_id": "u",
+            "metrics": {
+                "mouse": {
+                    "movements": [
+                        {"x": 900 + i, "y": 400 - i, "timestamp": _iso(i * 0.02)}
+                        for i in range(count)
+                    ],
+                    "clicks": _clicks,
+                    "mouseDowns": [{**_click} for _click in _clicks],
+                    "mouseUps": [],
+                }
+            },
+        }
+    )
+
+
+def _counters(instrumentation: Instrumentation, name: str):
+    return {
+        tuple(sorted(_counter["labels"].items())): _counter["value"]
+        for _counter in instrumentation.registry.snapshot()["counters"]
+        if _counter["name"] == name
+    }
+
+
+GATED_SESSIONS = {
+    "missed_click_targets": _payload(300, target=(5000, 5000)),
+    "too_few_movements": _payload(10),
+}
+
+
+@pytest.mark.parametrize("reason", sorted(GATED_SESSIONS))
+def test_gated_session_is_gated_and_counted_once(reason):
+    _instrumentation = Instrumentation()
+    _processor = MetricsProcessor(EARLY_EXIT, instrumentation=_instrumentation)
+
+    _result = _processor(GATED_SESSIONS[reason])
+
+    assert _result["success"]
+    assert _result["analysis"]["score"] == 0.0
+    assert _counters(_instrumentation, "rt_hb_score_early_exits_total") == {
+        (("reason", reason), ("stage", "preprocessing")): 1
+    }
+    _calls = _counters(_instrumentation, "rt_hb_score_stage_calls_total")
+    assert _calls[(("stage", "heuristics.mouse_events.args_compare"),)] == 1
+    assert (("stage", "preprocessing.feature_engineer"),) not in _calls
+
+
+@pytest.mark.parametrize("reason", sorted(GATED_SESSIONS))
+def test_gated_session_features_hold_gate_reason(reason):
+    _features = MetricsProcessor(EARLY_EXIT).preprocessor(GATED_SESSIONS[reason])
+
+    assert _features["gate_reason"] == reason
+    assert "mouse_movement_stddev_velocity" not in _features
+
+
+@pytest.mark.parametrize("reason", sorted(GATED_SESSIONS))
+def test_gated_session_scores_like_without_early_exit(reason):
+    _results = [
+        MetricsProcessor({"heuristics": {"mouse_events": {"early_exit": _is_on}}})(
+            GATED_SESSIONS[reason]
+        )
+        for _is_on in (True, False)
+    ]
+
+    assert _results[0]["analysis"] == _results[1]["analysis"]
+
+
+def test_early_exit_is_opt_in():
+    _processor = MetricsProcessor()
+    _features = _processor.preprocessor(GATED_SESSIONS["too_few_movements"])
+
+    assert _processor.preprocessor.gate is None
+    assert "gate_reason" not in _features
+    assert "mouse_movement_stddev_velocity" in _features
+
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+
+import pytest
+
+from rt_hb_score.preprocessing.json_flattener import (
+    JsonDataFlattener,
+    JsonDataFlattenerConfigPM,
+)
+from rt_hb_score.preprocessing.json_flattener._extractor import FieldExtractor
+
+
+logger = logging.getLogger(__name__)
+
+
+FIELD_MAPPING = JsonDataFlattenerConfigPM().field_mapping
+
+
+def _baseline_flatten(data, field_mapping=FIELD_MAPPING):
+    """The key path walk of the original `JsonDataFlattener._extract_metrics`."""
+    _flattened = {}
+    for _field_name, _path in field_mapping.items():
+        try:
+            _current = data
+            for _key in _path:
+                _current = _current[_key]
+            _flattened[_field_name] = _current
+        except (KeyError, TypeError):
+            _flattened[_field_name] = []
+    return _flattened
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _payload():
+    _clicks = [
+        {"x": 1867, "y": 19, "timestamp": _iso(7.0)},
+        {"x": 25, "y": 869, "timestamp": _iso(8.0)},
+    ]
+    return {
+        "project_id": "p",
+        "user_id": "u",
+        "metrics": {
+            "mouse": {
+                "movements": [
+                    {"x": 900 + i, "y": 400 - i % 7, "timestamp": _iso(i * 0.02)}
+                    for i in range(60)
+                ],
+                "clicks": _clicks,
+                "mouseDowns": [{**_click} for _click in _clicks],
+                "mouseUps": [],
+            },
+            "keyboard": {
+                "keypresses": [{"key": "a", "timestamp": _iso(1.0)}],
+                "keydowns": [],
+                "keyups": [],
+                "specificKeyEvents": [],
+            },
+            "signInButton": {"hoverToClickTime": 120, "mouseLeaveCount": 2},
+        },
+    }
+
+
+def _without(*path):
+    _data = _payload()
+    _parent = _data
+    for _key in path[:-1]:
+        _parent = _parent[_key]
+    del _parent[path[-1]]
+    return _data
+
+
+PAYLOADS = {
+    "complete": _payload,
+    "without_keyboard": lambda: _without("metrics", "keyboard"),
+    "without_sign_in_button": lambda: _without("metrics", "signInButton"),
+    "without_project_id": lambda: _without("project_id"),
+    "without_movements": lambda: _without("metrics", "mouse", "movements"),
+    "without_metrics": lambda: _without("metrics"),
+}
+
+
+def _is_missing(data, path) -> bool:
+    try:
+        for _key in path:
+            data = data[_key]
+    except (KeyError, TypeError, IndexError):
+        return True
+    return False
+
+
+@pytest.mark.parametrize("name", sorted(PAYLOADS))
+def test_extractor_matches_baseline_flattener(name):
+    _data = PAYLOADS[name]()
+    _flattener = JsonDataFlattener()
+
+    _expected = _baseline_flatten(_data)
+    _flattened = _flattener.extractor(_data)
+
+    assert list(_flattened) == list(_expected)
+    for _field_name, _path in FIELD_MAPPING.items():
+        if _is_missing(_data, _path):
+            # Missing fields get their `InputData` default instead of `[]`
+            assert _expected[_field_name] == []
+            assert _flattened[_field_name] == (
+                _flattener.extractor.defaults[_field_name]
+            )
+        else:
+            assert _flattened[_field_name] is _expected[_field_name]
+    assert _flattener(json.dumps(_data)) == _flattened
+
+
+def test_extractor_reads_any_key_type():
+    _field_mapping = {
+        "first_x": ["events", 0, "x"],
+        "last_y": ["events", -1, "y"],
+        "pair": ["by_pair", ("a", 1)],
+        "events": ["events"],
+        "data": [],
+    }
+    _data = {"events": [{"x": 1, "y": 2}, {"x": 3, "y": 4}], "by_pair": {("a", 1): 5}}
+
+    _flattened = FieldExtractor(_field_mapping)(_data)
+
+    assert _flattened == _baseline_flatten(_data, _field_mapping)
+    assert _flattened == {
+        "first_x": 1,
+        "last_y": 4,
+        "pair": 5,
+        "events": _data["events"],
+        "data": _data,
+    }
+
+
+def test_missing_fields_get_fresh_defaults():
+    _extractor = FieldExtractor(
+        {"events": ["metrics", "events"], "count": ["metrics", "count"]},
+        defaults={"count": 0},
+    )
+
+    _first = _extractor({"metrics": {}})
+    _first["events"].append("event")
+
+    assert _extractor({"metrics": {}}) == {"events": [], "count": 0}
+    assert _extractor({"metrics": {"events": [1], "count": 2}}) == {
+        "events": [1],
+        "count": 2,
+    }
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+
+import pandas as pd
+import pytest
+
+from rt_hb_score.config import MetricsProcessorConfig
+from rt_hb_score.preprocessing.feature_engineer import FeatureEngineer
+from rt_hb_score.preprocessing.json_flattener import JsonDataFlattener
+
+
+logger = logging.getLogger(__name__)
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _document(movements, clicks=((1867, 19, 0.5), (25, 869, 1.0)), downs=None):
+    _clicks = [{"x": x, "y": y, "timestamp": _iso(t)} for x, y, t in clicks]
+    return {
+        "project_id": "p",
+        "user_id": "u",
+        "metrics": {
+            "mouse": {
+                "movements": [
+                    {"x": x, "y": y, "timestamp": _iso(t)} for x, y, t in movements
+                ],
+                "clicks": _clicks,
+                "mouseDowns": (
+                    [{**_click} for _click in _clicks]
+                    if downs is None
+                    else [{"x": x, "y": y, "timestamp": _iso(t)} for x, y, t in downs]
+                ),
+                "mouseUps": [],
+            }
+        },
+    }
+
+
+def _zigzag(count: int, step: int = 1):
+    return [(900 + i * (i % 3), 400 - i % 7, i * 0.02 * step) for i in range(count)]
+
+
+SESSIONS = {
+    "complete": _document(_zigzag(80)),
+    "out_of_order": _document(list(reversed(_zigzag(80)))),
+    "missed_target": _document(_zigzag(80), clicks=((1000, 500, 0.5), (25, 869, 1.0))),
+    "without_clicks": _document(_zigzag(80), clicks=()),
+    "too_few_movements": _document(_zigzag(3)),
+    "without_movements": _document([]),
+    "shared_timestamps": _document(
+        [(900 + i % 11, 400 + i % 5, (i // 4) * 0.04) for i in range(120)]
+    ),
+    # Every pair of steps between the clicks has a zero-length step
+    "without_turns": _document(
+        [(900, 400, 0.5), (900, 400, 0.6), (900, 400, 0.7), (950, 400, 0.8)]
+        + [(950, 400, 0.9), (950, 400, 1.0)]
+    ),
+    "aligned_mouse_downs": _document(
+        [(1867, 19, 0.49), (25, 869, 0.99)] + _zigzag(60, step=2),
+        downs=((1867, 19, 0.5), (25, 869, 1.0)),
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def engineer():
+    return FeatureEngineer(MetricsProcessorConfig().preprocessor.feature_engineer)
+
+
+@pytest.fixture(scope="module")
+def flattened():
+    _flattener = JsonDataFlattener()
+    return {_name: _flattener(json.dumps(_data)) for _name, _data in SESSIONS.items()}
+
+
+def _assert_features_match(row, expected, config):
+    _checkbox = config.checkbox
+    if _checkbox.output_validation not in expected:
+        # The per-session engineer drops the checkbox features of a failing path
+        assert not row.pop(_checkbox.output_validation)
+        assert row.pop(_checkbox.output_main) == []
+
+    for _key, _value in row.items():
+        _expected = expected[_key]
+        if _key == _checkbox.output_main:
+            assert len(_value) == len(_expected)
+            for _path, _expected_path in zip(_value, _expected):
+                assert _path == pytest.approx(_expected_path, rel=1e-9)
+        elif isinstance(_expected, list):
+            assert _value == _expected, _key
+        else:
+            assert _value == pytest.approx(_expected, rel=1e-9), _key
+
+
+def test_frame_features_match_per_session_features(engineer, flattened):
+    _names = sorted(flattened)
+    _events = engineer.frame_engineer.frame_from_payloads(
+        [flattened[_name] for _name in _names], session_ids=_names
+    )
+
+    _features = engineer.process_frame(_events)
+
+    assert _features.index.tolist() == _names
+    for _name in _names:
+        _assert_features_match(
+            _features.loc[_name].to_dict(),
+            engineer(flattened[_name]),
+            engineer.config,
+        )
+
+
+def test_datetime_timestamps_match_string_timestamps(engineer, flattened):
+    _events = engineer.frame_engineer.frame_from_payloads(flattened.values())
+    _t_field = engineer.config.frame.t_field
+    _datetimes = _events.assign(**{_t_field: pd.to_datetime(_events[_t_field])})
+
+    _features = engineer.process_frame(_events)
+    _from_datetimes = engineer.process_frame(_datetimes)
+
+    _click_field = engineer.config.mouse_movement.click_field
+    pd.testing.assert_frame_equal(
+        _from_datetimes.drop(columns=_click_field),
+        _features.drop(columns=_click_field),
+    )
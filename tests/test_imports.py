@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+import subprocess
+import sys
+
+import pytest
+
+import rt_hb_score
+
+
+logger = logging.getLogger(__name__)
+
+
+HEAVY_MODULES = [
+    "numpy",
+    "pandas",
+    "pydantic",
+    "orjson",
+    "dateutil",
+    "rt_hb_score._main",
+    "rt_hb_score.config",
+    "rt_hb_score.heuristics",
+    "rt_hb_score.preprocessing",
+    "rt_hb_score.preprocessing.feature_engineer._frame",
+]
+
+
+def _loaded_after(script: str):
+    """Return which of `HEAVY_MODULES` a fresh interpreter loaded running `script`."""
+    _script = (
+        f"{script}\n"
+        "import json, sys\n"
+        f"print(json.dumps([_name for _name in {HEAVY_MODULES!r} "
+        "if _name in sys.modules]))\n"
+    )
+    # The child finds the package wherever this process found it
+    _env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    _process = subprocess.run(
+        [sys.executable, "-c", _script],
+        check=True,
+        env=_env,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(_process.stdout.splitlines()[-1])
+
+
+def test_import_loads_no_heavy_module():
+    assert _loaded_after("import rt_hb_score") == []
+
+
+def test_public_names_load_their_modules_on_first_access():
+    _loaded = _loaded_after("import rt_hb_score\nrt_hb_score.MetricsProcessor")
+
+    assert {"numpy", "pydantic", "rt_hb_score._main"} <= set(_loaded)
+    assert not {"pandas", "orjson", "dateutil"} & set(_loaded)
+
+
+def test_scoring_loads_neither_pandas_nor_dateutil():
+    _loaded = _loaded_after(
+        "import json\n"
+        "from rt_hb_score import MetricsProcessor\n"
+        "MetricsProcessor()(json.dumps({'metrics': {'mouse': {'movements': [\n"
+        "    {'x': i, 'y': i, 'timestamp': f'2025-02-10T00:00:{i:02d}.000Z'}\n"
+        "    for i in range(60)\n"
+        "]}}}))\n"
+    )
+
+    assert "pandas" not in _loaded
+    assert "dateutil" not in _loaded
+
+
+def test_frame_engineer_loads_pandas():
+    _loaded = _loaded_after(
+        "from rt_hb_score.preprocessing.feature_engineer import "
+        "EventFrameFeatureEngineer\n"
+    )
+
+    assert {"pandas", "rt_hb_score.preprocessing.feature_engineer._frame"} <= set(
+        _loaded
+    )
+
+
+def test_lazy_names_are_listed_and_resolved():
+    assert set(rt_hb_score.__all__) <= set(dir(rt_hb_score))
+    for _name in rt_hb_score.__all__:
+        assert getattr(rt_hb_score, _name) is not None
+
+    with pytest.raises(AttributeError, match="has no attribute 'Unknown'"):
+        rt_hb_score.Unknown
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import math
+
+import pytest
+
+from rt_hb_score import IncrementalSessionScorer, MetricsProcessor
+
+
+logger = logging.getLogger(__name__)
+
+
+TARGETS = [(1867, 19), (25, 869)]
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _document(per_timestamp: int):
+    """A curved path to each target, `per_timestamp` movements sharing a time."""
+    _movements = []
+    _clicks = []
+    _start, _step = (900.0, 400.0), 0
+    for _target in TARGETS:
+        for _index in range(1, 41):
+            _progress = _index / 40
+            _bend = 60 * math.sin(math.pi * _progress)
+            _x = _start[0] + (_target[0] - _start[0]) * _progress + _bend
+            _y = _start[1] + (_target[1] - _start[1]) * _progress + _bend * (_index % 3)
+            if _index == 40:
+                _x, _y = _target
+            _movements.append(
+                {
+                    "x": round(_x, 1),
+                    "y": round(_y, 1),
+                    "timestamp": _iso(0.02 * (_step // per_timestamp)),
+                }
+            )
+            _step += 1
+        # Clicked at the time of the movements that reached the target
+        _clicks.append({**_movements[-1]})
+        _start = _target
+    return {
+        "project_id": "p",
+        "user_id": "u",
+        "metrics": {
+            "mouse": {
+                "movements": _movements,
+                "clicks": _clicks,
+                "mouseDowns": [{**_click} for _click in _clicks],
+                "mouseUps": [],
+            }
+        },
+    }
+
+
+def _events(document):
+    """Mouse events in arrival order, movements first on equal timestamps."""
+    _mouse = document["metrics"]["mouse"]
+    _events = [
+        (_event["timestamp"], _order, _kind, _event)
+        for _order, _kind, _key in (
+            (0, "movement", "movements"),
+            (1, "mouseDown", "mouseDowns"),
+            (2, "click", "clicks"),
+        )
+        for _event in _mouse[_key]
+    ]
+    _events.sort(key=lambda _item: _item[:2])
+    return [(_kind, _event) for *_, _kind, _event in _events]
+
+
+@pytest.mark.parametrize("per_timestamp", [1, 4, 40])
+def test_incremental_features_match_batch_features(per_timestamp):
+    _document_ = _document(per_timestamp)
+    _scorer = IncrementalSessionScorer()
+    for _kind, _event in _events(_document_):
+        _scorer.add_event(_kind, _event)
+
+    _features = _scorer.features()
+    _processor = MetricsProcessor()
+    _expected = _processor.preprocessor(json.dumps(_document_))
+
+    assert _scorer.is_complete
+    assert set(_features) <= set(_expected)
+    # Clicks keep their raw timestamps in batch mode
+    _clicks = _features.pop("mouse_clicks")
+    assert [(_click["x"], _click["y"]) for _click in _clicks] == TARGETS
+    _paths = _features.pop("between_path")
+    assert len(_paths) == len(_expected["between_path"]) == 1
+    for _path, _expected_path in zip(_paths, _expected["between_path"]):
+        assert _path == pytest.approx(_expected_path, rel=1e-9)
+    for _name, _value in _features.items():
+        assert _value == pytest.approx(_expected[_name], rel=1e-9), _name
+    assert _scorer.score()["score"] == pytest.approx(
+        _processor.heuristic_analyzer(_expected)["score"]
+    )
+
+
+def test_movements_sharing_a_timestamp_keep_constant_state():
+    _scorer = IncrementalSessionScorer()
+    for _index in range(1000):
+        _scorer.add_movement(900 + _index % 5, 400 + _index % 3, _iso(1.0))
+
+    assert _scorer._last_time_path.count == 1000
+    assert not hasattr(_scorer, "_last_time_points")
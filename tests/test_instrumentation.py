@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+
+from rt_hb_score import Instrumentation, MetricsProcessor, MetricsRegistry
+
+
+logger = logging.getLogger(__name__)
+
+
+EARLY_EXIT = {"heuristics": {"mouse_events": {"early_exit": True}}}
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _payload(count: int = 300):
+    _clicks = [
+        {"x": 1867, "y": 19, "timestamp": _iso(7.0)},
+        {"x": 25, "y": 869, "timestamp": _iso(8.0)},
+    ]
+    return json.dumps(
+        {
+            "project_id": "p",
+            "user_id": "u",
+            "metrics": {
+                "mouse": {
+                    "movements": [
+                        {"x": 900 + i, "y": 400 - i % 7, "timestamp": _iso(i * 0.02)}
+                        for i in range(count)
+                    ],
+                    "clicks": _clicks,
+                    "mouseDowns": [{**_click} for _click in _clicks],
+                    "mouseUps": [],
+                }
+            },
+        }
+    )
+
+
+def _by_stage(snapshot, kind: str, name: str, field: str = "value"):
+    return {
+        _metric["labels"]["stage"]: _metric[field]
+        for _metric in snapshot[kind]
+        if _metric["name"] == name
+    }
+
+
+def _stage_calls(instrumentation: Instrumentation):
+    return _by_stage(
+        instrumentation.registry.snapshot(),
+        "counters",
+        "rt_hb_score_stage_calls_total",
+    )
+
+
+def test_every_stage_is_timed_and_counted():
+    _instrumentation = Instrumentation()
+    _processor = MetricsProcessor(EARLY_EXIT, instrumentation=_instrumentation)
+
+    for _ in range(3):
+        assert _processor(_payload())["success"]
+
+    _snapshot = _instrumentation.registry.snapshot()
+    _calls = _by_stage(_snapshot, "counters", "rt_hb_score_stage_calls_total")
+    _timed = _by_stage(_snapshot, "histograms", "rt_hb_score_stage_seconds", "count")
+    _stages = {_stage for _, _stage in Instrumentation.STAGES}
+
+    # The gate is bound into the preprocessor before the stages are wrapped,
+    # and compares the click targets once more
+    assert _calls == {
+        **{_stage: 3 for _stage in _stages},
+        "heuristics.mouse_events.args_compare": 6,
+    }
+    assert _timed == _calls
+
+    _sizes = _by_stage(_snapshot, "counters", "rt_hb_score_stage_input_size_total")
+    assert _sizes["pipeline"] == 3 * len(_payload())
+    assert _sizes["preprocessing.feature_engineer.mouse_movement"] == 3 * 300
+    assert not _by_stage(_snapshot, "counters", "rt_hb_score_stage_errors_total")
+
+
+def test_gate_is_not_timed_without_early_exit():
+    _instrumentation = Instrumentation()
+    _processor = MetricsProcessor(
+        {"heuristics": {"mouse_events": {"early_exit": False}}},
+        instrumentation=_instrumentation,
+    )
+
+    assert _processor(_payload())["success"]
+
+    _calls = _stage_calls(_instrumentation)
+
+    assert "preprocessing.gate" not in _calls
+    assert "preprocessing.gate_features" not in _calls
+    assert _calls["preprocessing.feature_engineer"] == 1
+
+
+def test_errors_and_hooks():
+    _events = []
+
+    def _failing_hook(event):
+        raise RuntimeError("hook failure is ignored")
+
+    _instrumentation = Instrumentation(hooks=[_events.append, _failing_hook])
+    _processor = MetricsProcessor(EARLY_EXIT, instrumentation=_instrumentation)
+
+    def _raise(*args, **kwargs):
+        raise ValueError("broken analyzer")
+
+    object.__setattr__(
+        _processor.heuristic_analyzer.mouse_analyzer.velocity_analyzer,
+        "_target",
+        _raise,
+    )
+    _processor(_payload())
+
+    _errors = _by_stage(
+        _instrumentation.registry.snapshot(),
+        "counters",
+        "rt_hb_score_stage_errors_total",
+    )
+    assert _errors["heuristics.mouse_events.velocity"] == 1
+    assert [
+        _event.error
+        for _event in _events
+        if _event.stage == "heuristics.mouse_events.velocity"
+    ] == ["broken analyzer"]
+    assert {_event.stage for _event in _events} >= {"pipeline", "preprocessing.gate"}
+
+
+def test_prometheus_text_output():
+    _registry = MetricsRegistry(latency_buckets=(0.1, 0.01))
+    _registry.increment("calls_total", stage="a")
+    _registry.increment("calls_total", 2, stage="b")
+    _registry.observe("seconds", 0.005, stage="a")
+    _registry.observe("seconds", 0.05, stage="a")
+    _registry.observe("seconds", 5.0, stage="a")
+
+    assert _registry.to_prometheus() == (
+        "# TYPE calls_total counter\n"
+        'calls_total{stage="a"} 1\n'
+        'calls_total{stage="b"} 2\n'
+        "# TYPE seconds histogram\n"
+        'seconds_bucket{stage="a",le="0.01"} 1\n'
+        'seconds_bucket{stage="a",le="0.1"} 2\n'
+        'seconds_bucket{stage="a",le="+Inf"} 3\n'
+        'seconds_sum{stage="a"} 5.055\n'
+        'seconds_count{stage="a"} 3\n'
+    )
+
+
+def test_pipeline_prometheus_output_lists_every_stage():
+    _instrumentation = Instrumentation()
+    MetricsProcessor(EARLY_EXIT, instrumentation=_instrumentation)(_payload())
+
+    _text = _instrumentation.registry.to_prometheus()
+
+    assert "# TYPE rt_hb_score_stage_calls_total counter" in _text
+    assert "# TYPE rt_hb_score_stage_seconds histogram" in _text
+    for _, _stage in Instrumentation.STAGES:
+        assert f'rt_hb_score_stage_calls_total{{stage="{_stage}"}} ' in _text
+        assert f'rt_hb_score_stage_seconds_count{{stage="{_stage}"}} ' in _text
+        assert (
+            f'rt_hb_score_stage_seconds_bucket{{stage="{_stage}",le="+Inf"}} ' in _text
+        )
+
+
+def _calls_of_one_session(is_attached_twice: bool):
+    _instrumentation = Instrumentation()
+    _processor = MetricsProcessor(EARLY_EXIT, instrumentation=_instrumentation)
+    if is_attached_twice:
+        _instrumentation.attach(_processor)
+
+    _processor(_payload())
+
+    return _stage_calls(_instrumentation)
+
+
+def test_reattaching_does_not_double_count():
+    assert _calls_of_one_session(True) == _calls_of_one_session(False)
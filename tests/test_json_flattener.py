@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from rt_hb_score import MetricsProcessor
+from rt_hb_score.preprocessing.feature_engineer import EventTrace
+from rt_hb_score.preprocessing.json_flattener import (
+    JsonDataFlattener,
+    JsonDataFlattenerConfigPM,
+)
+from rt_hb_score.preprocessing.json_flattener._decoder import decode_movements
+
+
+logger = logging.getLogger(__name__)
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _movements(count: int = 300):
+    _rng = np.random.default_rng(0)
+    _x = np.linspace(900, 1867, count) + _rng.normal(0, 3, count)
+    _y = np.linspace(400, 19, count) + _rng.normal(0, 3, count)
+    return [
+        {"x": float(_x[i]), "y": float(_y[i]), "timestamp": _iso(i * 0.02)}
+        for i in range(count)
+    ]
+
+
+def _payload(movements):
+    _clicks = [
+        {"x": 1867, "y": 19, "timestamp": _iso(7.0)},
+        {"x": 25, "y": 869, "timestamp": _iso(8.0)},
+    ]
+    return {
+        "project_id": "p",
+        "user_id": "u",
+        "metrics": {
+            "mouse": {
+                "movements": movements,
+                "clicks": _clicks,
+                "mouseDowns": [{**_click} for _click in _clicks],
+                "mouseUps": [],
+            }
+        },
+    }
+
+
+def _with_none_entry():
+    _events = _movements()
+    return _events[:10] + [None] + _events[10:]
+
+
+def _with_missing_y():
+    _events = _movements()
+    _events[20] = {"x": 1000.0, "timestamp": _iso(0.41)}
+    return _events
+
+
+LENIENT_MOVEMENTS = {
+    "none_entry": _with_none_entry,
+    "null_list": lambda: None,
+    "missing_y": _with_missing_y,
+}
+
+
+@pytest.mark.parametrize("name", sorted(LENIENT_MOVEMENTS))
+def test_typed_decoder_reads_movements_like_from_events(name):
+    _events = LENIENT_MOVEMENTS[name]()
+
+    _expected = EventTrace.from_events(_events)
+    _trace = decode_movements(_events, is_strict=False)
+
+    assert _trace.n_events == _expected.n_events
+    for _column in ("x", "y", "t"):
+        np.testing.assert_array_equal(
+            getattr(_trace, _column), getattr(_expected, _column)
+        )
+
+
+@pytest.mark.parametrize("name", sorted(LENIENT_MOVEMENTS))
+def test_typed_and_pydantic_decoders_score_alike(name):
+    _document = json.dumps(_payload(LENIENT_MOVEMENTS[name]()))
+
+    _results = [
+        MetricsProcessor({"preprocessor": {"flattener": {"decoder": _decoder}}})(
+            _document
+        )
+        for _decoder in ("pydantic", "typed")
+    ]
+
+    assert _results[0]["success"]
+    assert _results[0] == _results[1]
+
+    _features = [
+        MetricsProcessor(
+            {"preprocessor": {"flattener": {"decoder": _decoder}}}
+        ).preprocessor(_document)
+        for _decoder in ("pydantic", "typed")
+    ]
+    np.testing.assert_equal(_features[0], _features[1])
+
+
+def test_typed_decoder_is_strict_when_validating():
+    _flattener = JsonDataFlattener(
+        JsonDataFlattenerConfigPM(decoder="typed", is_validate=True)
+    )
+
+    assert _flattener(_payload(_with_none_entry())) is None
+    assert _flattener(_payload(_with_missing_y())) is None
+
+
+def test_orjson_is_imported_on_first_parse():
+    _script = (
+        "import sys\n"
+        "from rt_hb_score.preprocessing.json_flattener import _decoder\n"
+        "assert 'orjson' not in sys.modules\n"
+        "assert _decoder.loads('{\"a\": 1}', backend='json') == {'a': 1}\n"
+        "assert 'orjson' not in sys.modules\n"
+        "assert _decoder.loads('{\"a\": 1}') == {'a': 1}\n"
+    )
+    # The child finds the package wherever this process found it
+    _env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+
+    subprocess.run([sys.executable, "-c", _script], check=True, env=_env)
+
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from rt_hb_score.preprocessing.feature_engineer import EventTrace
+from rt_hb_score.preprocessing.feature_engineer.mouse_events import (
+    MouseDownUpProcessor,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+DOWNS = {
+    "mouse_mouseDowns": [
+        {"x": 10, "y": 20, "timestamp": "2025-02-10T00:00:01.000Z"},
+        {"x": 50, "y": 60, "timestamp": "2025-02-10T00:00:02.000Z"},
+    ]
+}
+
+
+def test_mouse_downs_on_preceding_movements_match():
+    _trace = EventTrace.from_columns(
+        [10.0, 51.0], [21.0, 60.0], [1739145600.5, 1739145601.5]
+    )
+
+    assert MouseDownUpProcessor()(DOWNS, trace=_trace) == {
+        "mouse_down_up_features": 0.0,
+        "mouse_down_mismatches": [False, False],
+    }
+
+
+def test_missing_mouse_downs_fail_with_every_field():
+    assert MouseDownUpProcessor()({"mouse_mouseDowns": []}, trace=EventTrace.empty()) == {
+        "mouse_down_up_features": 1,
+        "mouse_down_mismatches": [],
+    }
+
+
+def test_errors_fail_with_every_field():
+    # Not a trace, so the mismatch check raises
+    assert MouseDownUpProcessor()(DOWNS, trace=object()) == {
+        "mouse_down_up_features": 1,
+        "mouse_down_mismatches": [],
+    }
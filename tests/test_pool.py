@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import threading
+
+import pytest
+
+from rt_hb_score import Instrumentation, MetricsProcessor, ProcessorPool
+from rt_hb_score.config import MetricsProcessorConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+def _actions(index: int):
+    return [
+        {"id": "1", "type": "click", "args": {"location": {"x": 100 + index, "y": 19}}},
+        {"id": "3", "type": "click", "args": {"location": {"x": 25, "y": 869}}},
+    ]
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _payload(index: int) -> str:
+    _clicks = [
+        {"x": 100 + index, "y": 19, "timestamp": _iso(7.0)},
+        {"x": 25, "y": 869, "timestamp": _iso(8.0)},
+    ]
+    return json.dumps(
+        {
+            "project_id": "p",
+            "user_id": "u",
+            "metrics": {
+                "mouse": {
+                    "movements": [
+                        {"x": 900 + i, "y": 400 - i % 7, "timestamp": _iso(i * 0.02)}
+                        for i in range(60)
+                    ],
+                    "clicks": _clicks,
+                    "mouseDowns": [{**_click} for _click in _clicks],
+                    "mouseUps": [],
+                }
+            },
+        }
+    )
+
+
+def _pool_counters(instrumentation: Instrumentation):
+    return {
+        _counter["labels"]["result"]: _counter["value"]
+        for _counter in instrumentation.registry.snapshot()["counters"]
+        if _counter["name"] == "rt_hb_score_processor_pool_total"
+    }
+
+
+def test_least_recently_used_processor_is_evicted():
+    _pool = ProcessorPool(maxsize=2)
+    _first = _pool.get(_actions(0))
+    _second = _pool.get(_actions(1))
+
+    # Using the first action set makes the second the least recently used
+    assert _pool.get(_actions(0)) is _first
+    _third = _pool.get(_actions(2))
+
+    assert len(_pool) == 2
+    assert _pool.get(_actions(0)) is _first
+    assert _pool.get(_actions(2)) is _third
+    assert _pool.get(_actions(1)) is not _second
+    assert _pool.stats() == {
+        "hits": 3,
+        "misses": 4,
+        "evictions": 2,
+        "size": 2,
+        "maxsize": 2,
+    }
+
+
+def test_processors_are_built_with_their_actions():
+    _config = MetricsProcessorConfig(
+        heuristics={"mouse_events": {"early_exit": True}}
+    )
+    _pool = ProcessorPool(_config)
+
+    _processor = _pool.get(_actions(3))
+
+    _expected = _config.with_actions(_actions(3))
+    assert _processor.config == _expected
+    assert _processor.config.heuristics.mouse_events.early_exit
+    assert _pool(_payload(3), _actions(3)) == MetricsProcessor(_expected)(_payload(3))
+
+
+def test_actions_key_ignores_dictionary_key_order():
+    _pool = ProcessorPool()
+    _reordered = [
+        {"args": {"location": {"y": 19, "x": 100}}, "type": "click", "id": "1"},
+        {"args": {"location": {"y": 869, "x": 25}}, "type": "click", "id": "3"},
+    ]
+
+    assert _pool.get(_reordered) is _pool.get(_actions(0))
+    assert _pool.stats()["misses"] == 1
+
+
+def test_pool_counts_are_recorded():
+    _instrumentation = Instrumentation()
+    _pool = ProcessorPool(maxsize=1, instrumentation=_instrumentation)
+
+    for _index in (0, 0, 1, 0):
+        _pool.get(_actions(_index))
+
+    assert _pool_counters(_instrumentation) == {"hit": 1, "miss": 3, "eviction": 2}
+    assert _pool.get(_actions(0)).instrumentation is _instrumentation
+
+
+def test_clear_keeps_statistics():
+    _pool = ProcessorPool()
+    _pool.get(_actions(0))
+
+    _pool.clear()
+
+    assert len(_pool) == 0
+    assert _pool.stats()["misses"] == 1
+
+
+def test_concurrent_lookups_share_one_processor():
+    _pool = ProcessorPool(maxsize=4)
+    _barrier = threading.Barrier(8)
+    _processors = []
+
+    def _get():
+        _barrier.wait()
+        _processors.append(_pool.get(_actions(0)))
+
+    _threads = [threading.Thread(target=_get) for _ in range(8)]
+    for _thread in _threads:
+        _thread.start()
+    for _thread in _threads:
+        _thread.join()
+
+    assert len({id(_processor) for _processor in _processors}) == 1
+    assert len(_pool) == 1
+    _stats = _pool.stats()
+    assert _stats["hits"] + _stats["misses"] == 8
+
+
+def test_rejects_maxsize_below_one():
+    with pytest.raises(ValueError, match="`maxsize` must be at least 1"):
+        ProcessorPool(maxsize=0)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+
+import pytest
+
+from rt_hb_score import MetricsProcessor
+from rt_hb_score.preprocessing import Preprocessor
+from rt_hb_score.preprocessing.targets import ClickAlignment
+
+
+logger = logging.getLogger(__name__)
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _payload(count: int = 300, target=(1867, 19)):
+    _clicks = [
+        {"x": target[0], "y": target[1], "timestamp": _iso(7.0)},
+        {"x": 25, "y": 869, "timestamp": _iso(8.0)},
+    ]
+    return json.dumps(
+        {
+            "project_id": "p",
+            "user_id": "u",
+            "metrics": {
+                "mouse": {
+                    "movements": [
+                        {"x": 900 + i, "y": 400 - i % 7, "timestamp": _iso(i * 0.02)}
+                        for i in range(count)
+                    ],
+                    "clicks": _clicks,
+                    "mouseDowns": [{**_click} for _click in _clicks],
+                    "mouseUps": [],
+                }
+            },
+        }
+    )
+
+
+SESSIONS = {
+    "scored": _payload(),
+    "missed_click_targets": _payload(target=(5000, 5000)),
+    "too_few_movements": _payload(10),
+}
+
+
+@pytest.mark.parametrize("early_exit", [True, False])
+@pytest.mark.parametrize("name", sorted(SESSIONS))
+def test_preprocessor_output_round_trips_through_json(name, early_exit):
+    _preprocessor = MetricsProcessor(
+        {"heuristics": {"mouse_events": {"early_exit": early_exit}}}
+    ).preprocessor
+
+    _features = _preprocessor(SESSIONS[name])
+
+    assert "click_alignment" not in _features
+    assert json.loads(json.dumps(_features)) == _features
+
+
+def test_preprocessor_without_gate_round_trips_through_json():
+    _features = Preprocessor()(SESSIONS["scored"])
+
+    assert json.loads(json.dumps(_features)) == _features
+
+
+def test_preprocessor_keeps_alignment_on_request():
+    _preprocessor = MetricsProcessor().preprocessor
+
+    _features = _preprocessor(SESSIONS["scored"], keep_alignment=True)
+
+    assert isinstance(_features["click_alignment"], ClickAlignment)
+    assert _features["click_alignment"].is_complete
+
+
+def test_pipeline_scores_like_preprocessor_output():
+    _processor = MetricsProcessor()
+
+    _features = _processor.preprocessor(SESSIONS["scored"])
+
+    assert _processor.heuristic_analyzer(_features) == (
+        _processor(SESSIONS["scored"])["analysis"]
+    )
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import math
+
+import numpy as np
+import pytest
+
+from rt_hb_score import MetricsProcessor, SessionCorpus, ThresholdSweep
+from rt_hb_score.config import MetricsProcessorConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+TARGETS = [(1867, 19), (25, 869)]
+
+GRID = {
+    "mouse_events.velocity.min_velocity_variation": [400, 500, 2000],
+    "mouse_events.movement_count.max_pixel_count": [17, 60],
+    "mouse_events.mouse_movements_very_low": [5, 50],
+    "mouse_events.args_comparer.tolerance": [2, 15],
+    "mouse_events.checkbox_path_weight": [3.0, 0.5],
+}
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _human_payload(seed: int, count: int = 40) -> str:
+    """Curved, jittered paths near each target, pressed where the cursor stopped."""
+    _rng = np.random.default_rng(seed)
+    _movements, _clicks = [], []
+    _time, _start = 0.0, (900.0, 400.0)
+    for _target in TARGETS:
+        _target = tuple(int(_value) for _value in _target + _rng.integers(-4, 5, 2))
+        _count = count + int(_rng.integers(0, count // 2 + 1))
+        _bend = _rng.normal(0, 80)
+        for _index in range(1, _count + 1):
+            _p = _index / _count
+            _p = 10 * _p**3 - 15 * _p**4 + 6 * _p**5
+            _offset = _bend * math.sin(math.pi * _p)
+            _x = _start[0] + (_target[0] - _start[0]) * _p + _offset
+            _y = _start[1] + (_target[1] - _start[1]) * _p - _offset
+            _jitter = _rng.normal(0, 2, size=2) * (1 - _p)
+            _time += float(_rng.uniform(0.008, 0.03))
+            if _index == _count:
+                _jitter, (_x, _y) = (0, 0), _target
+            _movements.append(
+                {
+                    "x": round(_x + _jitter[0], 1),
+                    "y": round(_y + _jitter[1], 1),
+                    "timestamp": _iso(_time),
+                }
+            )
+        _time += 0.08
+        _clicks.append({"x": _target[0], "y": _target[1], "timestamp": _iso(_time)})
+        _time += 0.05
+        _start = _target
+    return json.dumps(
+        {
+            "project_id": "p",
+            "user_id": f"u{seed}",
+            "metrics": {
+                "mouse": {
+                    "movements": _movements,
+                    "clicks": _clicks,
+                    "mouseDowns": [{**_click} for _click in _clicks],
+                    "mouseUps": [],
+                }
+            },
+        }
+    )
+
+
+def _bot_payload(count: int) -> str:
+    _clicks = [
+        {"x": 1867, "y": 19, "timestamp": _iso(7.0)},
+        {"x": 25, "y": 869, "timestamp": _iso(8.0)},
+    ]
+    return json.dumps(
+        {
+            "project_id": "p",
+            "user_id": "bot",
+            "metrics": {
+                "mouse": {
+                    "movements": [
+                        {"x": 900 + i, "y": 400 - i % 7, "timestamp": _iso(i * 0.02)}
+                        for i in range(count)
+                    ],
+                    "clicks": _clicks,
+                    "mouseDowns": [{**_click} for _click in _clicks],
+                    "mouseUps": [],
+                }
+            },
+        }
+    )
+
+
+PAYLOADS = [_human_payload(_seed) for _seed in range(6)] + [
+    # Too few movements for the base config, scored by variants lowering it
+    _human_payload(6, count=10),
+    _bot_payload(300),
+    "not json",
+]
+
+
+def _expected_scores(sweep: ThresholdSweep, overrides):
+    _config = sweep.config.model_copy(update={"heuristics": sweep.variant(overrides)})
+    _processor = MetricsProcessor(_config)
+    _scores = []
+    for _raw_data in PAYLOADS:
+        _result = _processor(_raw_data)
+        _scores.append(_result["analysis"]["score"] if _result["success"] else np.nan)
+    return np.array(_scores)
+
+
+@pytest.fixture(scope="module")
+def sweep():
+    return ThresholdSweep.from_payloads(PAYLOADS)
+
+
+def test_sweep_scores_match_per_session_scoring(sweep):
+    _variants = [{}] + sweep.grid(GRID)
+
+    _result = sweep.run(_variants)
+
+    assert _result.scores.shape == (len(_variants), len(PAYLOADS))
+    for _overrides, _scores in zip(_variants, _result.scores):
+        np.testing.assert_allclose(
+            _scores, _expected_scores(sweep, _overrides), rtol=0, atol=1e-9
+        )
+
+
+@pytest.mark.parametrize("path", sorted(GRID))
+def test_every_swept_value_changes_scores(sweep, path):
+    _result = sweep.run([{path: GRID[path][0]}, {path: GRID[path][-1]}])
+
+    assert not np.allclose(_result.scores[0], _result.scores[1], equal_nan=True)
+
+
+def test_corpus_sweep_matches_payload_sweep(sweep, tmp_path):
+    _corpus = SessionCorpus.build(tmp_path / "corpus", PAYLOADS)
+    _variants = sweep.grid({"mouse_events.velocity.max_velocity_avg": [700, 900]})
+
+    _from_corpus = ThresholdSweep.from_corpus(_corpus).run(_variants)
+
+    np.testing.assert_allclose(
+        _from_corpus.scores, sweep.run(_variants).scores, rtol=0, atol=1e-9
+    )
+
+
+def test_summary_describes_each_variant(sweep):
+    _result = sweep.run([{}, {"mouse_events.mouse_movements_very_low": 5}])
+
+    _summaries = _result.summary(bins=4, threshold=0.1)
+
+    assert [_summary["overrides"] for _summary in _summaries] == _result.variants
+    for _summary, _scores in zip(_summaries, _result.scores):
+        _scores = _scores[~np.isnan(_scores)]
+        assert _summary["count"] == len(PAYLOADS) - 1
+        assert sum(_summary["histogram"]) == len(_scores)
+        assert _summary["mean"] == pytest.approx(_scores.mean())
+        assert _summary["bot_rate"] == pytest.approx(np.mean(_scores < 0.1))
+        assert _summary["quantiles"][0.5] == pytest.approx(np.median(_scores))
+
+
+def test_unknown_override_path_is_rejected(sweep):
+    with pytest.raises(KeyError, match="mouse_events.velocity.unknown"):
+        sweep.run([{"mouse_events.velocity.unknown": 1}])
+
+
+def test_base_config_actions_are_swept():
+    _config = MetricsProcessorConfig().with_actions(
+        [{"id": "1", "type": "click", "args": {"location": {"x": 1867, "y": 19}}}]
+    )
+    _sweep = ThresholdSweep.from_payloads(PAYLOADS[:3], _config)
+
+    _result = _sweep.run([{}])
+
+    np.testing.assert_allclose(
+        _result.scores[0],
+        [MetricsProcessor(_config)(_raw)["analysis"]["score"] for _raw in PAYLOADS[:3]],
+        rtol=0,
+        atol=1e-9,
+    )
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+import numpy as np
+import pytest
+
+from rt_hb_score.preprocessing.feature_engineer import EventTrace
+from rt_hb_score.preprocessing.targets import ClickAlignment, TargetIndex
+
+
+logger = logging.getLogger(__name__)
+
+
+ACTIONS = [
+    {"id": "1", "type": "click", "args": {"location": {"x": 1867, "y": 19}}},
+    {"id": "2", "type": "hover", "args": {"location": {"x": 600, "y": 300}}},
+    {"id": "3", "type": "click", "args": {"location": {"x": 25, "y": 869}}},
+]
+
+CHUNK_SIZE = TargetIndex.CHUNK_SIZE
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _baseline_first_matches(targets: TargetIndex, click_x, click_y):
+    """First matching click of each target, scanning every click."""
+    _matches = []
+    for _x, _y in zip(targets.x, targets.y):
+        _hits = [
+            _index
+            for _index, (_click_x, _click_y) in enumerate(zip(click_x, click_y))
+            if abs(_click_x - _x) <= targets.tolerance
+            and abs(_click_y - _y) <= targets.tolerance
+        ]
+        _matches.append(_hits[0] if _hits else -1)
+    return np.array(_matches)
+
+
+def _clicks_with_hits(count: int, hits):
+    """Clicks far from every target, except the given (index, x, y) hits."""
+    _x = np.full(count, 900.0)
+    _y = np.full(count, 400.0)
+    for _index, _hit_x, _hit_y in hits:
+        _x[_index], _y[_index] = _hit_x, _hit_y
+    return _x, _y
+
+
+BOUNDARY_CASES = {
+    "last_of_each_chunk": [(CHUNK_SIZE - 1, 1867, 19), (2 * CHUNK_SIZE - 1, 25, 869)],
+    "first_of_second_chunk": [(CHUNK_SIZE, 1867, 19), (CHUNK_SIZE + 1, 25, 869)],
+    "across_chunks": [(CHUNK_SIZE - 1, 1867, 19), (CHUNK_SIZE, 25, 869)],
+    "repeated_in_later_chunk": [
+        (3, 1867, 19),
+        (2 * CHUNK_SIZE + 1, 1867, 19),
+        (2 * CHUNK_SIZE, 25, 869),
+    ],
+    "last_click": [(5, 25, 869), (3 * CHUNK_SIZE - 1, 1880, 30)],
+    "unmatched": [(CHUNK_SIZE, 1867, 19)],
+}
+
+
+@pytest.mark.parametrize("name", sorted(BOUNDARY_CASES))
+def test_first_matches_across_chunk_boundaries(name):
+    _targets = TargetIndex(ACTIONS, "click", 15)
+    _click_x, _click_y = _clicks_with_hits(3 * CHUNK_SIZE, BOUNDARY_CASES[name])
+
+    _matches = _targets.first_matches(_click_x, _click_y)
+
+    np.testing.assert_array_equal(
+        _matches, _baseline_first_matches(_targets, _click_x, _click_y)
+    )
+
+
+def test_first_matches_of_random_clicks():
+    _rng = np.random.default_rng(7)
+    _targets = TargetIndex(ACTIONS, "click", 15)
+    for _count in (0, 1, CHUNK_SIZE - 1, CHUNK_SIZE, CHUNK_SIZE + 1, 2500):
+        _click_x = _rng.uniform(0, 1900, _count).round()
+        _click_y = _rng.uniform(0, 900, _count).round()
+
+        np.testing.assert_array_equal(
+            _targets.first_matches(_click_x, _click_y),
+            _baseline_first_matches(_targets, _click_x, _click_y),
+        )
+
+
+def test_first_matches_without_targets():
+    _targets = TargetIndex(ACTIONS, "drag", 15)
+
+    assert len(_targets) == 0
+    assert _targets.first_matches([1.0, 2.0], [3.0, 4.0]).tolist() == []
+
+
+@pytest.mark.parametrize(
+    "other, is_equal",
+    [
+        (TargetIndex(ACTIONS, "click", 15), True),
+        (TargetIndex(list(reversed(ACTIONS)), "click", 15), False),
+        (TargetIndex(ACTIONS, "click", 15.0), True),
+        (TargetIndex(ACTIONS, "click", 16), False),
+        (TargetIndex(ACTIONS, "hover", 15), False),
+        (TargetIndex(ACTIONS[:1], "click", 15), False),
+    ],
+)
+def test_equality_includes_tolerance(other, is_equal):
+    _targets = TargetIndex(ACTIONS, "click", 15)
+
+    assert (_targets == other) is is_equal
+    assert (_targets != other) is not is_equal
+    assert _targets != "targets"
+    with pytest.raises(TypeError):
+        hash(_targets)
+
+
+def test_align_takes_first_click_in_time_order():
+    _targets = TargetIndex(ACTIONS, "click", 15)
+    _clicks = [
+        {"x": 25, "y": 869, "timestamp": _iso(9.0)},
+        {"x": 1870, "y": 20, "timestamp": _iso(8.0)},
+        {"x": 30, "y": 860, "timestamp": _iso(5.0)},
+        # Equal times keep their input order
+        {"x": 1867, "y": 19, "timestamp": _iso(8.0)},
+    ]
+
+    _alignment = _targets.align(_clicks)
+
+    assert isinstance(_alignment, ClickAlignment)
+    assert _alignment.targets == _targets
+    assert _alignment.matches.tolist() == [1, 2]
+    assert _alignment.timestamps == [_iso(8.0), _iso(5.0)]
+    assert _alignment.is_complete
+    assert not _alignment.is_ordered
+    assert repr(_alignment) == "ClickAlignment(targets=2, matched=2, is_ordered=False)"
+
+
+def test_align_trace_matches_align_events():
+    _targets = TargetIndex(ACTIONS, "click", 15)
+    _clicks = [
+        {"x": 1000, "y": 500, "timestamp": _iso(1.0)},
+        {"x": 1860, "y": 25, "timestamp": _iso(2.0)},
+    ]
+
+    _from_events = _targets.align(_clicks)
+    _from_trace = _targets.align(EventTrace.from_events(_clicks))
+
+    np.testing.assert_array_equal(_from_trace.matches, _from_events.matches)
+    np.testing.assert_array_equal(_from_trace.times, _from_events.times)
+    assert _from_trace.matched_count == 1
+    assert not _from_trace.is_complete
+    assert _from_trace.timestamps[1] is None
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import time
+from datetime import timezone
+
+import numpy as np
+import pytest
+from dateutil.parser import isoparse, parse
+
+from rt_hb_score.preprocessing.timestamps import decode_timestamp, decode_timestamps
+
+
+logger = logging.getLogger(__name__)
+
+
+ISO_TIMESTAMPS = {
+    "utc": ["2025-02-10T00:00:00Z", "2025-02-10T23:59:59Z"],
+    "offsets": [
+        "2025-02-10T00:00:00+05:30",
+        "2025-02-10T00:00:00-08:00",
+        "2025-02-10T00:00:00+0100",
+        "2025-02-10T00:00:00-03",
+        "2024-12-31T23:30:00-01:00",
+    ],
+    "fractions": [
+        "2025-02-10T00:00:00.1Z",
+        "2025-02-10T00:00:00.123Z",
+        "2025-02-10T00:00:00.123456Z",
+        "2025-02-10T00:00:00.1234567Z",
+        "2025-02-10T00:00:00.999999999Z",
+        "2025-02-10T00:00:00.250+02:00",
+    ],
+    "naive": [
+        "2025-02-10T00:00:00",
+        "2025-02-10 12:34:56",
+        "2025-02-10T12:34:56.789",
+        "2025-02-10T12:34",
+        "2025-02-10",
+    ],
+    "leap_day": ["2024-02-29T12:00:00Z"],
+}
+
+
+def _isoparse(value: str) -> float:
+    """Epoch seconds of `isoparse`, naive values read as UTC."""
+    _parsed = isoparse(value)
+    if _parsed.tzinfo is None:
+        _parsed = _parsed.replace(tzinfo=timezone.utc)
+    return _parsed.timestamp()
+
+
+@pytest.mark.parametrize("name", sorted(ISO_TIMESTAMPS))
+def test_iso_timestamps_match_isoparse(name):
+    _values = ISO_TIMESTAMPS[name]
+    _expected = [_isoparse(_value) for _value in _values]
+
+    # One by one, in bulk and in bulk among values of another layout
+    assert [decode_timestamp(_value) for _value in _values] == _expected
+    np.testing.assert_array_equal(decode_timestamps(_values), _expected)
+    np.testing.assert_array_equal(
+        decode_timestamps(_values + ["Feb 10 2025"])[:-1], _expected
+    )
+
+
+@pytest.mark.skipif(not hasattr(time, "tzset"), reason="time.tzset is not available")
+def test_naive_timestamps_are_utc_unlike_dateutil(monkeypatch):
+    _value = "2025-02-10T00:00:00"
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        assert decode_timestamp(_value) == 1739145600.0
+        assert decode_timestamps([_value])[0] == 1739145600.0
+        # `dateutil` reads the same value as local time
+        assert parse(_value).timestamp() == 1739145600.0 + 5 * 3600
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+EPOCH_TIMESTAMPS = {
+    "seconds": ([1739145600, 1739145600.5], [1739145600.0, 1739145600.5]),
+    "milliseconds": ([1739145600000, 1739145600500], [1739145600.0, 1739145600.5]),
+    "strings": (["1739145600000", "1739145600.5"], [1739145600.0, 1739145600.5]),
+    "mixed": ([1739145600000, "2025-02-10T00:00:00.5Z"], [1739145600.0, 1739145600.5]),
+}
+
+
+@pytest.mark.parametrize("name", sorted(EPOCH_TIMESTAMPS))
+def test_epoch_timestamps(name):
+    _values, _expected = EPOCH_TIMESTAMPS[name]
+
+    assert [decode_timestamp(_value) for _value in _values] == _expected
+    np.testing.assert_array_equal(decode_timestamps(_values), _expected)
+
+
+REJECTED = [
+    "2025-02-10T00:00:00.Z",
+    "2025-02-30T00:00:00Z",
+    "2025-02-10T00:00:60Z",
+    "2025-02-10T25:00:00Z",
+    "not a time",
+    "",
+]
+
+
+@pytest.mark.parametrize("value", REJECTED)
+def test_values_dateutil_rejects_are_rejected(value):
+    with pytest.raises(ValueError):
+        parse(value)
+
+    with pytest.raises(ValueError):
+        decode_timestamp(value)
+    with pytest.raises(ValueError):
+        decode_timestamps(["2025-02-10T00:00:00Z", value])
+
+
+@pytest.mark.parametrize("value", [None, True, object()])
+def test_unsupported_types_are_rejected(value):
+    with pytest.raises(TypeError):
+        decode_timestamp(value)
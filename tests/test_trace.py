@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+
+import numpy as np
+import pytest
+
+from rt_hb_score import MetricsProcessor
+from rt_hb_score.preprocessing.feature_engineer import EventTrace
+
+
+logger = logging.getLogger(__name__)
+
+
+MALFORMED_INDEX = 150
+
+
+def _iso(seconds: float) -> str:
+    return f"2025-02-10T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+
+
+def _movements(count: int = 300):
+    return [
+        {"x": 900 + i, "y": 400 - i % 7, "timestamp": _iso(i * 0.02)}
+        for i in range(count)
+    ]
+
+
+def _payload(movements):
+    _clicks = [
+        {"x": 1867, "y": 19, "timestamp": _iso(7.0)},
+        {"x": 25, "y": 869, "timestamp": _iso(8.0)},
+    ]
+    return json.dumps(
+        {
+            "project_id": "p",
+            "user_id": "u",
+            "metrics": {
+                "mouse": {
+                    "movements": movements,
+                    "clicks": _clicks,
+                    "mouseDowns": [{**_click} for _click in _clicks],
+                    "mouseUps": [],
+                }
+            },
+        }
+    )
+
+
+def _malformed():
+    _events = _movements()
+    _events[MALFORMED_INDEX] = {**_events[MALFORMED_INDEX], "timestamp": "not a time"}
+    return _events
+
+
+def _dropped():
+    _events = _movements()
+    del _events[MALFORMED_INDEX]
+    return _events
+
+
+def test_trace_skips_malformed_timestamp():
+    _trace = EventTrace.from_events(_malformed())
+    _expected = EventTrace.from_events(_dropped())
+
+    assert _trace.n_events == 300
+    np.testing.assert_array_equal(_trace.x, _expected.x)
+    np.testing.assert_array_equal(_trace.y, _expected.y)
+    np.testing.assert_array_equal(_trace.t, _expected.t)
+
+
+def test_trace_of_only_malformed_timestamps_is_empty():
+    _trace = EventTrace.from_columns([1.0, 2.0], [3.0, 4.0], ["x", None])
+
+    assert len(_trace) == 0
+    assert _trace.n_events == 2
+
+
+@pytest.mark.parametrize("max_events", [None, 100])
+@pytest.mark.parametrize("decoder", ["pydantic", "typed"])
+def test_session_with_malformed_timestamp_is_scored(decoder, max_events):
+    _processor = MetricsProcessor(
+        {
+            "preprocessor": {
+                "flattener": {"decoder": decoder},
+                "feature_engineer": {
+                    "downsampling": {"max_events": max_events, "chunk_size": 64}
+                },
+            }
+        }
+    )
+
+    _result = _processor(_payload(_malformed()))
+    _features = _processor.preprocessor(_payload(_malformed()))
+    _expected = _processor.preprocessor(_payload(_dropped()))
+
+    assert _result["success"]
+    # The movement is counted, but left out of the trace
+    assert _features.pop("mouse_movement_count") == 300
+    assert _expected.pop("mouse_movement_count") == 299
+    assert _features.pop("pixel_per_movement") == pytest.approx(
+        _expected.pop("pixel_per_movement") * 299 / 300
+    )
+    assert _features == pytest.approx(_expected, rel=1e-12)